@@ -0,0 +1,212 @@
+import asyncio
+import time
+from collections import deque
+from typing import Iterable, Optional
+from app.config import settings
+from app.metrics import registry
+
+admission_limit = registry.gauge(
+    "admission_limit",
+    "Текущий лимит одновременных запросов класса маршрутов.",
+    labels=("route_class",),
+)
+admission_in_flight = registry.gauge(
+    "admission_in_flight",
+    "Выполняющиеся запросы класса маршрутов.",
+    labels=("route_class",),
+)
+admission_queued = registry.gauge(
+    "admission_queued",
+    "Запросы класса маршрутов, ждущие допуска в очереди.",
+    labels=("route_class",),
+)
+admission_rejected_total = registry.counter(
+    "admission_rejected",
+    "Запросы, отклоненные с 503 из-за перегрузки.",
+    labels=("route_class", "reason"),
+)
+
+ROUTE_CLASSES = ("auth", "reads", "writes")
+# Доля отклонения задержки, на которую базовая задержка сдвигается вверх.
+BASELINE_DRIFT = 0.01
+
+
+class OverloadedError(Exception):
+    def __init__(self, route_class: str, reason: str):
+        self.route_class = route_class
+        self.reason = reason
+        super().__init__(f"Route class '{route_class}' is overloaded ({reason}).")
+
+
+class AIMDLimit:
+    """
+    Лимит одновременных запросов, подстраиваемый по задержке: пока ответы
+    укладываются в порог, лимит растет на единицу за «окно» (limit ответов),
+    при медленном ответе умножается на backoff. Уменьшение происходит
+    не чаще раза на поколение запросов: ответы на запросы, начатые
+    до предыдущего уменьшения, его не повторяют.
+
+    Порог — большее из target_latency и tolerance × baseline, где baseline —
+    наблюдаемая задержка без нагрузки (минимум, медленно дрейфующий вверх).
+    Маршрут, который всегда медленнее target_latency (например, хеширование
+    пароля), не считается перегруженным.
+    """
+
+    def __init__(
+        self,
+        initial: float,
+        min_limit: float,
+        max_limit: float,
+        target_latency: float,
+        backoff: float = 0.9,
+        tolerance: float = 2.0,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.baseline: Optional[float] = None
+        self._decreased_at = float("-inf")
+
+    def update(self, latency: float, started_at: float, in_flight: int) -> None:
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            self.baseline += (latency - self.baseline) * BASELINE_DRIFT
+        if latency > max(self.target_latency, self.baseline * self.tolerance):
+            if started_at >= self._decreased_at:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._decreased_at = time.monotonic()
+        elif in_flight * 2 >= self.limit:
+            # Растем только под нагрузкой, иначе лимит бесконечно
+            # раздувается на простаивающем сервере.
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+
+class AdmissionController:
+    """
+    Допуск запросов одного класса маршрутов: не больше limit одновременно,
+    остальные ждут в короткой очереди FIFO. При полной очереди или после
+    queue_timeout секунд ожидания запрос отклоняется с OverloadedError.
+    """
+
+    def __init__(
+        self, route_class: str, limit: AIMDLimit, queue_size: int, queue_timeout: float
+    ):
+        self.route_class = route_class
+        self.limit = limit
+        self.queue_size = queue_size
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self._queue: deque[asyncio.Future] = deque()
+        self._limit_gauge = admission_limit.labels(route_class=route_class)
+        self._in_flight_gauge = admission_in_flight.labels(route_class=route_class)
+        self._queued_gauge = admission_queued.labels(route_class=route_class)
+        self._limit_gauge.set(limit.limit)
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    async def acquire(self) -> None:
+        if self.in_flight < self.limit.limit and not self._queue:
+            self._set_in_flight(self.in_flight + 1)
+            return
+        if len(self._queue) >= self.queue_size:
+            self._reject("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append(future)
+        self._queued_gauge.set(len(self._queue))
+        admitted = False
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+            admitted = True
+        except TimeoutError:
+            self._reject("timeout")
+        finally:
+            if not admitted and future.done() and not future.cancelled():
+                # Место уже передано, но время вышло или запрос отменили.
+                self._set_in_flight(self.in_flight - 1)
+                self._wake()
+            elif not admitted and future in self._queue:
+                self._queue.remove(future)
+                self._queued_gauge.set(len(self._queue))
+
+    def release(self, latency: float, started_at: float) -> None:
+        self.limit.update(latency, started_at, self.in_flight)
+        self._limit_gauge.set(self.limit.limit)
+        self._set_in_flight(self.in_flight - 1)
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._queue and self.in_flight < self.limit.limit:
+            future = self._queue.popleft()
+            if not future.done():
+                self._set_in_flight(self.in_flight + 1)
+                future.set_result(None)
+        self._queued_gauge.set(len(self._queue))
+
+    def _set_in_flight(self, value: int) -> None:
+        self.in_flight = value
+        self._in_flight_gauge.set(value)
+
+    def _reject(self, reason: str):
+        admission_rejected_total.labels(
+            route_class=self.route_class, reason=reason
+        ).inc()
+        raise OverloadedError(self.route_class, reason)
+
+
+class AdmissionControl:
+    """
+    Контроллеры допуска по классам маршрутов: auth — /auth/*, reads — GET
+    и HEAD, writes — остальные методы. Пути из bypass_paths (и вложенные
+    в них) проходят без ограничений.
+    """
+
+    def __init__(
+        self, controllers: dict[str, AdmissionController], bypass_paths: Iterable[str]
+    ):
+        self.controllers = controllers
+        self.bypass_paths = tuple(bypass_paths)
+
+    def controller_for(self, method: str, path: str) -> Optional[AdmissionController]:
+        if any(
+            path == bypass or (bypass != "/" and path.startswith(bypass + "/"))
+            for bypass in self.bypass_paths
+        ):
+            return None
+        if path == "/auth" or path.startswith("/auth/"):
+            route_class = "auth"
+        elif method in ("GET", "HEAD"):
+            route_class = "reads"
+        else:
+            route_class = "writes"
+        return self.controllers.get(route_class)
+
+
+def build_admission_control() -> AdmissionControl:
+    controllers = {
+        route_class: AdmissionController(
+            route_class,
+            AIMDLimit(
+                settings.ADMISSION_INITIAL_LIMIT,
+                settings.ADMISSION_MIN_LIMIT,
+                settings.ADMISSION_MAX_LIMIT,
+                settings.ADMISSION_TARGET_LATENCY_MS[route_class] / 1000,
+                settings.ADMISSION_BACKOFF,
+                settings.ADMISSION_LATENCY_TOLERANCE,
+            ),
+            settings.ADMISSION_QUEUE_SIZE,
+            settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+        )
+        for route_class in ROUTE_CLASSES
+    }
+    return AdmissionControl(controllers, settings.ADMISSION_BYPASS_PATHS)
+
+
+admission = build_admission_control()
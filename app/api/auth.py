@@ -5,16 +5,25 @@ from app.auth.schemas import UserLogin
 from app.auth.schemas import UserCreate, User, Token
 from app.auth.service import UserAlreadyExistsError, InvalidCredentialsError
 from app.auth.dependencies import AuthServiceDep, CurrentUser
+from app.responses import json_response
+from app.server_timing import ServerTimingRoute
+from app.statement_timeout import route_statement_timeout
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(
+    prefix="/auth",
+    tags=["Auth"],
+    route_class=ServerTimingRoute,
+    dependencies=[Depends(route_statement_timeout)],
+)
 
 
 @router.post("/register", response_model=User, status_code=status.HTTP_201_CREATED)
 async def register(user: UserCreate, service: AuthServiceDep):
     try:
-        return await service.register_user(user)
+        new_user = await service.register_user(user)
     except UserAlreadyExistsError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return json_response(new_user, User, status_code=status.HTTP_201_CREATED)
 
 
 @router.post("/login", response_model=Token)
@@ -33,4 +42,4 @@ async def login(
 
 @router.get("/me", response_model=User)
 async def read_users_me(current_user: CurrentUser):
-    return current_user
+    return json_response(current_user, User)
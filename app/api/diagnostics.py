@@ -0,0 +1,82 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.diagnostics import (
+    AllocationDiff,
+    AllocationSite,
+    MemorySnapshotCreate,
+    MemoryTracingNotStartedError,
+    MemoryTracingStart,
+    MemoryTracingStatus,
+    ProfilingConfig,
+    ProfilingStatus,
+    SnapshotNotFoundError,
+    memory_profiler,
+    profiler,
+    require_admin,
+)
+
+router = APIRouter(
+    prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)]
+)
+
+
+@router.get("/profiling", response_model=ProfilingStatus)
+async def get_profiling_status():
+    return profiler.status()
+
+
+@router.put("/profiling", response_model=ProfilingStatus)
+async def configure_profiling(config: ProfilingConfig):
+    profiler.configure(config)
+    return profiler.status()
+
+
+@router.delete("/profiling", response_model=ProfilingStatus)
+async def disable_profiling():
+    profiler.configure(ProfilingConfig())
+    return profiler.status()
+
+
+@router.get("/memory", response_model=MemoryTracingStatus)
+async def get_memory_status():
+    return memory_profiler.status()
+
+
+@router.post("/memory/start", response_model=MemoryTracingStatus)
+async def start_memory_tracing(params: MemoryTracingStart):
+    memory_profiler.start(frames=params.frames)
+    return memory_profiler.status()
+
+
+@router.post("/memory/stop", response_model=MemoryTracingStatus)
+async def stop_memory_tracing():
+    memory_profiler.stop()
+    return memory_profiler.status()
+
+
+@router.post(
+    "/memory/snapshots",
+    response_model=MemoryTracingStatus,
+    status_code=status.HTTP_201_CREATED,
+)
+async def take_memory_snapshot(snapshot: MemorySnapshotCreate):
+    try:
+        await memory_profiler.take_snapshot(snapshot.name)
+    except MemoryTracingNotStartedError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return memory_profiler.status()
+
+
+@router.get("/memory/snapshots/{name}/top", response_model=list[AllocationSite])
+async def get_memory_top(name: str, limit: int = Query(20, ge=1, le=500)):
+    try:
+        return await memory_profiler.top(name, limit=limit)
+    except SnapshotNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+
+@router.get("/memory/diff", response_model=list[AllocationDiff])
+async def get_memory_diff(base: str, target: str, limit: int = Query(20, ge=1, le=500)):
+    try:
+        return await memory_profiler.diff(base, target, limit=limit)
+    except SnapshotNotFoundError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Response, status
+from app.health import HealthReport, readiness
+from app.responses import JSON
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+_LIVE = b'{"status":"ok"}'
+
+
+@router.get("/live")
+async def live():
+    """Процесс жив и обслуживает event loop; зависимости не проверяются."""
+    return Response(_LIVE, media_type=JSON)
+
+
+@router.get(
+    "/ready",
+    response_model=HealthReport,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": HealthReport}},
+)
+async def ready():
+    """Результат последней фоновой проверки; сам запрос в БД не ходит."""
+    ok, body = readiness.current()
+    return Response(
+        body,
+        status_code=status.HTTP_200_OK if ok else status.HTTP_503_SERVICE_UNAVAILABLE,
+        media_type=JSON,
+    )
@@ -1,33 +1,192 @@
+import hashlib
+from typing import Annotated, Awaitable, Callable, Optional
 from uuid import UUID
-from fastapi import APIRouter, HTTPException, status
-from app.task_manager.schemas import TaskCreate, Task, TaskUpdate
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse
+from app.task_manager.schemas import (
+    TASK_FIELDS,
+    TaskCreate,
+    Task,
+    TaskFields,
+    TaskUpdate,
+)
 from app.task_manager.exceptions import TaskNotFoundError
 from app.task_manager.dependencies import TaskServiceDep
 from app.auth.dependencies import CurrentUser
+from app.idempotency import IdempotencyKeyReusedError, idempotency_store
+from app.responses import (
+    COLUMNAR_JSON,
+    MSGPACK,
+    json_response,
+    list_response,
+)
+from app.server_timing import ServerTimingRoute
+from app.statement_timeout import route_statement_timeout
 
-router = APIRouter(prefix="/tasks", tags=["Tasks"])
+router = APIRouter(
+    prefix="/tasks",
+    tags=["Tasks"],
+    route_class=ServerTimingRoute,
+    dependencies=[Depends(route_statement_timeout)],
+)
+
+
+def task_fields(
+    fields: Optional[str] = Query(
+        None,
+        description=(
+            "Поля задачи через запятую, например task_id,title,status. "
+            "Из БД читаются только они; description возвращается целиком."
+        ),
+    ),
+) -> Optional[list[str]]:
+    if fields is None:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in TASK_FIELDS]
+    if not requested or unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Unknown fields: {', '.join(unknown)}; "
+            f"allowed: {', '.join(TASK_FIELDS)}",
+        )
+    return list(dict.fromkeys(requested))
+
+
+TaskFieldsQuery = Annotated[Optional[list[str]], Depends(task_fields)]
+
+
+class Idempotency:
+    """Выполнение изменяющего запроса с учетом заголовка Idempotency-Key."""
+
+    def __init__(self, key: Optional[tuple] = None, fingerprint: str = ""):
+        self.key = key
+        self.fingerprint = fingerprint
+
+    async def run(self, call: Callable[[], Awaitable[Response]]) -> Response:
+        if self.key is None:
+            return await call()
+
+        async def call_with_rejection() -> Response:
+            # Окончательный отказ 4xx (например, 404) сохраняется как ответ:
+            # повтор получает его, а не выполняет запрос заново.
+            try:
+                return await call()
+            except HTTPException as e:
+                if e.status_code >= 500:
+                    raise
+                return JSONResponse(
+                    {"detail": e.detail}, status_code=e.status_code, headers=e.headers
+                )
+
+        try:
+            return await idempotency_store.execute(
+                self.key, self.fingerprint, call_with_rejection
+            )
+        except IdempotencyKeyReusedError as e:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+            )
+
+
+async def idempotency(
+    request: Request,
+    current_user: CurrentUser,
+    idempotency_key: Annotated[
+        Optional[str],
+        Header(
+            max_length=255,
+            description="Повтор запроса с тем же ключом вернет первый ответ "
+            "без повторного выполнения.",
+        ),
+    ] = None,
+) -> Idempotency:
+    if idempotency_key is None:
+        return Idempotency()
+    fingerprint = hashlib.sha256(
+        f"{request.method} {request.url.path}\n".encode() + await request.body()
+    ).hexdigest()
+    return Idempotency((current_user.user_id, idempotency_key), fingerprint)
+
+
+IdempotencyDep = Annotated[Idempotency, Depends(idempotency)]
 
 
 @router.post("/", response_model=Task, status_code=status.HTTP_201_CREATED)
 async def create_task(
-    task: TaskCreate, service: TaskServiceDep, current_user: CurrentUser
+    task: TaskCreate,
+    service: TaskServiceDep,
+    current_user: CurrentUser,
+    idempotency: IdempotencyDep,
 ):
-    return await service.create_task(task, user_id=current_user.user_id)
+    async def handle() -> Response:
+        return json_response(
+            await service.create_task(task, user_id=current_user.user_id),
+            Task,
+            status_code=status.HTTP_201_CREATED,
+        )
 
+    return await idempotency.run(handle)
 
-@router.get("/", response_model=list[Task])
-async def get_all_tasks(service: TaskServiceDep, current_user: CurrentUser):
-    return await service.get_all_tasks(user_id=current_user.user_id)
+
+@router.get(
+    "/",
+    response_model=list[Task] | list[TaskFields],
+    responses={
+        200: {
+            "description": "Массив задач или колоночное представление "
+            '{"columns": [...], "rows": [[...]], "common": {"user_id": ...}}',
+            "content": {COLUMNAR_JSON: {}, MSGPACK: {}},
+        }
+    },
+)
+async def get_all_tasks(
+    request: Request,
+    service: TaskServiceDep,
+    current_user: CurrentUser,
+    fields: TaskFieldsQuery,
+):
+    """
+    Список задач. Описание по умолчанию обрезано до
+    TASK_LIST_DESCRIPTION_LENGTH символов (с "…" в конце).
+    Формат ответа выбирается заголовком Accept.
+    """
+    tasks = await service.get_all_tasks(user_id=current_user.user_id, fields=fields)
+    return list_response(
+        request,
+        tasks,
+        Task if fields is None else TaskFields,
+        columns=fields or TASK_FIELDS,
+        common=("user_id",),
+        exclude_unset=fields is not None,
+    )
 
 
-@router.get("/{task_id}", response_model=Task)
+@router.get("/{task_id}", response_model=Task | TaskFields)
 async def get_task_by_id(
-    task_id: UUID, service: TaskServiceDep, current_user: CurrentUser
+    task_id: UUID,
+    service: TaskServiceDep,
+    current_user: CurrentUser,
+    fields: TaskFieldsQuery,
 ):
     try:
-        return await service.get_task_by_id(task_id, user_id=current_user.user_id)
+        task = await service.get_task_by_id(
+            task_id, user_id=current_user.user_id, fields=fields
+        )
     except TaskNotFoundError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    if fields is None:
+        return json_response(task, Task)
+    return json_response(task, TaskFields, exclude_unset=True)
 
 
 @router.put("/{task_id}", response_model=Task)
@@ -36,18 +195,32 @@ async def update_task(
     update: TaskUpdate,
     service: TaskServiceDep,
     current_user: CurrentUser,
+    idempotency: IdempotencyDep,
 ):
-    try:
-        return await service.update_task(task_id, update, user_id=current_user.user_id)
-    except TaskNotFoundError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    async def handle() -> Response:
+        try:
+            task = await service.update_task(
+                task_id, update, user_id=current_user.user_id
+            )
+        except TaskNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        return json_response(task, Task)
+
+    return await idempotency.run(handle)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
-    task_id: UUID, service: TaskServiceDep, current_user: CurrentUser
+    task_id: UUID,
+    service: TaskServiceDep,
+    current_user: CurrentUser,
+    idempotency: IdempotencyDep,
 ):
-    try:
-        return await service.delete_task(task_id, user_id=current_user.user_id)
-    except TaskNotFoundError as e:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    async def handle() -> Response:
+        try:
+            await service.delete_task(task_id, user_id=current_user.user_id)
+        except TaskNotFoundError as e:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    return await idempotency.run(handle)
@@ -3,6 +3,8 @@ from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db_session
+from app.server_timing import measure
+from app.unit_of_work import UnitOfWorkDep
 from .repository import AbstractUserRepository, UserRepository
 from .service import AbstractAuthService, AuthService
 from .schemas import User
@@ -20,9 +22,9 @@ def get_user_repository(
 UserRepositoryDep = Annotated[AbstractUserRepository, Depends(get_user_repository)]
 
 
-def get_auth_service(repo: UserRepositoryDep) -> AuthService:
+def get_auth_service(repo: UserRepositoryDep, uow: UnitOfWorkDep) -> AuthService:
     """Предоставляет сервис аутентификации."""
-    return AuthService(repo)
+    return AuthService(repo, uow)
 
 
 AuthServiceDep = Annotated[AbstractAuthService, Depends(get_auth_service)]
@@ -32,7 +34,8 @@ async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)], service: AuthServiceDep
 ) -> User:
     """Зависимость для получения текущего пользователя."""
-    return await service.get_current_user(token)
+    with measure("auth"):
+        return await service.get_current_user(token)
 
 
 CurrentUser = Annotated[User, Depends(get_current_user)]
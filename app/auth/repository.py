@@ -1,14 +1,19 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from .models import UserORM
 from .schemas import User, UserCreate
+from app.replication import read_your_writes, replica_reads
+from app.server_timing import measure
+from app.tracing import trace_methods
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_select_user_by_email = select(UserORM).where(UserORM.email == bindparam("email"))
+
 
 class AbstractUserRepository(ABC):
     """Репозиторий для работы с пользователями."""
@@ -29,6 +34,7 @@ class AbstractUserRepository(ABC):
         pass
 
 
+@trace_methods
 class UserRepository(AbstractUserRepository):
     """Репозиторий для работы с пользователями, возвращающий DTO."""
 
@@ -36,20 +42,23 @@ class UserRepository(AbstractUserRepository):
         self.session = session
 
     async def get_by_email(self, email: str) -> Optional[User]:
-        result = await self.session.execute(
-            select(UserORM).where(UserORM.email == email)
-        )
+        with replica_reads(email):
+            result = await self.session.execute(_select_user_by_email, {"email": email})
         user_orm = result.scalar_one_or_none()
-        return User.model_validate(user_orm) if user_orm else None
+        with measure("validate"):
+            return User.model_validate(user_orm) if user_orm else None
 
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
-        user_orm = await self.session.get(UserORM, user_id)
-        return User.model_validate(user_orm) if user_orm else None
+        with replica_reads(user_id):
+            user_orm = await self.session.get(UserORM, user_id)
+        with measure("validate"):
+            return User.model_validate(user_orm) if user_orm else None
 
     async def create(self, user_data: UserCreate) -> User:
         new_user = UserORM(email=user_data.email)
         new_user.set_password(user_data.password)  # Хэшируем пароль
         self.session.add(new_user)
-        await self.session.commit()
-        await self.session.refresh(new_user)
-        return User.model_validate(new_user)
+        await self.session.flush()
+        read_your_writes.mark(new_user.email, new_user.user_id)
+        with measure("validate"):
+            return User.model_validate(new_user)
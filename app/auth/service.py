@@ -1,7 +1,11 @@
 import jwt
+from typing import Optional
 from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from app.config import settings
+from app.replication import primary_reads
+from app.tracing import trace_methods
+from app.unit_of_work import AbstractUnitOfWork, NullUnitOfWork
 from .exceptions import UserAlreadyExistsError, InvalidCredentialsError
 from .repository import AbstractUserRepository
 from .schemas import UserCreate, UserLogin, User, TokenData
@@ -12,8 +16,13 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 class AbstractAuthService:
     """Абстрактный базовый класс для сервиса аутентификации."""
 
-    def __init__(self, repository: AbstractUserRepository):
+    def __init__(
+        self,
+        repository: AbstractUserRepository,
+        uow: Optional[AbstractUnitOfWork] = None,
+    ):
         self.repository = repository
+        self.uow = uow or NullUnitOfWork()
 
     async def register_user(self, user_data: UserCreate) -> User:
         """Регистрирует нового пользователя."""
@@ -32,17 +41,22 @@ class AbstractAuthService:
         pass
 
 
+@trace_methods
 class AuthService(AbstractAuthService):
     """Сервис для аутентификации и авторизации."""
 
     async def register_user(self, user_data: UserCreate) -> User:
-        existing_user = await self.repository.get_by_email(user_data.email)
-        if existing_user:
-            raise UserAlreadyExistsError(user_data.email)
-        return await self.repository.create(user_data)
+        async with self.uow:
+            # Проверка перед записью не должна зависеть от отставания реплики.
+            with primary_reads():
+                existing_user = await self.repository.get_by_email(user_data.email)
+            if existing_user:
+                raise UserAlreadyExistsError(user_data.email)
+            return await self.repository.create(user_data)
 
     async def authenticate_user(self, login_data: UserLogin) -> User:
-        user = await self.repository.get_by_email(login_data.email)
+        async with self.uow.read_only():
+            user = await self.repository.get_by_email(login_data.email)
         if not user or not pwd_context.verify(
             login_data.password, user.hashed_password
         ):
@@ -70,7 +84,8 @@ class AuthService(AbstractAuthService):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
             )
-        user = await self.repository.get_by_email(token_data.email)
+        async with self.uow.read_only():
+            user = await self.repository.get_by_email(token_data.email)
         if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
@@ -0,0 +1,126 @@
+import zlib
+from typing import Callable, Optional, Protocol
+from app.config import Settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/msgpack",
+    "+json",
+    "+xml",
+)
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def flush(self) -> bytes:
+        """Выталкивает накопленные данные, не завершая поток."""
+
+    def finish(self) -> bytes:
+        """Завершает поток."""
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def available_codecs(settings: Settings) -> dict[str, Callable[[], Compressor]]:
+    """
+    Кодеки Content-Encoding в порядке предпочтения сервера: zstd и br —
+    если установлены пакеты zstandard и brotli, gzip — всегда.
+    """
+    codecs: dict[str, Callable[[], Compressor]] = {}
+    if zstandard is not None:
+        codecs["zstd"] = lambda: ZstdCompressor(settings.COMPRESSION_ZSTD_LEVEL)
+    if brotli is not None:
+        codecs["br"] = lambda: BrotliCompressor(settings.COMPRESSION_BROTLI_QUALITY)
+    codecs["gzip"] = lambda: GzipCompressor(settings.COMPRESSION_GZIP_LEVEL)
+    return codecs
+
+
+def choose_encoding(accept_encoding: Optional[str], offered) -> Optional[str]:
+    """
+    Кодек из offered с наибольшим q в Accept-Encoding (при равных q —
+    в порядке offered) или None, если клиент не принимает ни один.
+    """
+    qualities: dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        coding, *params = (item.strip().lower() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding] = quality
+    wildcard = qualities.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for coding in offered:
+        quality = qualities.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    if not content_type:
+        return False
+    media_type = content_type.split(";")[0].strip().lower()
+    return any(
+        media_type.startswith(prefix) if prefix.endswith("/") else prefix in media_type
+        for prefix in COMPRESSIBLE_TYPES
+    )
@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -9,11 +10,110 @@ class Settings(BaseSettings):
 
     DATABASE_URL: str
     ECHO_SQL: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_POOL_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # -1 — не пересоздавать
+    DB_POOL_PRE_PING: bool = False
+    DB_POOL_MIN_SIZE: int = 2  # соединений, открываемых при старте
+    DB_QUERY_CACHE_SIZE: int = 500  # скомпилированных запросов на движок
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100  # asyncpg; 0 — за pgbouncer
+    # Таймаут каждого выражения БД (0 — без ограничения) и его значения
+    # для отдельных маршрутов по имени эндпоинта
+    DB_STATEMENT_TIMEOUT_MS: float = 0.0
+    DB_ROUTE_STATEMENT_TIMEOUT_MS: dict[str, float] = {}
+    DB_REPLICA_URLS: list[str] = []
+    DB_REPLICA_CHECK_INTERVAL_SECONDS: float = 5.0
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Файловая SQLite: WAL, прагмы, один писатель и пул читателей
+    SQLITE_OPTIMIZED: bool = False
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268_435_456
+    SQLITE_CACHE_SIZE: int = -65_536  # отрицательное значение — в КиБ
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_READ_POOL_SIZE: int = 4
 
     AUTH_SECRET_KEY: str
     AUTH_ALGORITHM: str = "HS256"
     AUTH_ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Длина description в списке задач по умолчанию; полный текст —
+    # в GET /tasks/{task_id} или с fields=description
+    TASK_LIST_DESCRIPTION_LENGTH: int = 200
+
+    # Idempotency-Key для изменения задач: ответы хранятся в памяти процесса
+    IDEMPOTENCY_TTL_SECONDS: float = 86_400.0
+    IDEMPOTENCY_MAX_ENTRIES: int = 10_000
+
+    # Допуск запросов: лимит одновременных запросов на класс маршрутов
+    # (auth, reads, writes) подстраивается по задержке (AIMD), излишек
+    # ждет в короткой очереди или получает 503 с Retry-After
+    ADMISSION_ENABLED: bool = False
+    ADMISSION_INITIAL_LIMIT: int = 20
+    ADMISSION_MIN_LIMIT: int = 2
+    ADMISSION_MAX_LIMIT: int = 200
+    ADMISSION_TARGET_LATENCY_MS: dict[str, float] = {
+        "auth": 500.0,  # хеширование пароля
+        "reads": 100.0,
+        "writes": 250.0,
+    }
+    ADMISSION_BACKOFF: float = 0.9
+    # Медленным считается ответ дольше целевой задержки и дольше
+    # наблюдаемой базовой задержки класса, умноженной на этот коэффициент
+    ADMISSION_LATENCY_TOLERANCE: float = 2.0
+    ADMISSION_QUEUE_SIZE: int = 50
+    ADMISSION_QUEUE_TIMEOUT_SECONDS: float = 0.5
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+    ADMISSION_BYPASS_PATHS: list[str] = ["/", "/health", "/metrics", "/admin"]
+
+    # /health/ready отдает результат фоновой проверки БД, пула и event loop
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 2.0
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 1.0
+    HEALTH_MAX_POOL_SATURATION: float = 1.0  # доля занятых соединений пула
+    HEALTH_MAX_LOOP_LAG_SECONDS: float = 0.5
+
+    SERVER_HOST: str = "0.0.0.0"
+    SERVER_PORT: int = 8000
+    SERVER_WORKERS: int = 0  # 0 — по числу ядер
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEP_ALIVE_SECONDS: int = 75
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 30
+    SERVER_ACCESS_LOG: bool = False
+
+    SERVER_TIMING_ENABLED: bool = False
+    CANCEL_ON_DISCONNECT: bool = False  # отменять обработку, если клиент ушел
+
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # байт; меньшие ответы не сжимаются
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    ADMIN_TOKEN: Optional[str] = None
+
+    PROFILING_ENABLED: bool = False
+    PROFILING_DIR: str = "profiles"
+    PROFILING_SECRET: Optional[str] = None
+    PROFILING_SIGNATURE_MAX_AGE_SECONDS: int = 300
+
+    LOOP_WATCHDOG_ENABLED: bool = True
+    LOOP_WATCHDOG_INTERVAL_SECONDS: float = 0.05
+    LOOP_WATCHDOG_THRESHOLD_SECONDS: float = 0.1
+
+    MEMORY_REPORT_INTERVAL_SECONDS: float = 60.0
+    MEMORY_MAX_SNAPSHOTS: int = 10
+
+    TRACING_ENABLED: bool = False
+    TRACING_SERVICE_NAME: str = "task-manager"
+    TRACING_SAMPLE_RATIO: float = 0.1
+    TRACING_EXPORT_PATH: str = "traces.jsonl"
+    TRACING_EXPORTER: Optional[str] = None
+    TRACING_BATCH_SIZE: int = 512
+    TRACING_MAX_QUEUE_SIZE: int = 4096
+    TRACING_EXPORT_INTERVAL_SECONDS: float = 5.0
+
     TEST_DATABASE_URL: str = "sqlite+aiosqlite:///:memory:"
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
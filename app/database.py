@@ -1,25 +1,282 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+import asyncio
+import os
+import time
+from typing import Any, AsyncGenerator, Optional
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    create_async_engine,
+    async_sessionmaker,
+    AsyncSession,
+)
 from sqlalchemy.orm import DeclarativeBase
-from app.config import settings
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from app.config import Settings, settings
+from app.metrics import registry
+from app.replication import Replica, RoutingSession, create_replica_set
+from app.server_timing import get_server_timing
+from app.statement_timeout import instrument_engine
+
+pool_checkout_wait_seconds = registry.summary(
+    "db_pool_checkout_wait_seconds",
+    "Время получения соединения из пула, включая ожидание свободного.",
+)
+pool_overflow_total = registry.counter(
+    "db_pool_overflow",
+    "Соединения, открытые сверх DB_POOL_SIZE.",
+)
+pool_hold_seconds = registry.summary(
+    "db_connection_hold_seconds",
+    "Время от выдачи соединения из пула до его возврата.",
+)
+pool_timeouts_total = registry.counter(
+    "db_pool_timeouts",
+    "Запросы соединения, не дождавшиеся его за DB_POOL_TIMEOUT_SECONDS.",
+)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений, публикующий метрики ожидания и переполнения."""
+
+    def connect(self):
+        overflow = self._overflow
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_timeouts_total.inc()
+            raise
+        finally:
+            pool_checkout_wait_seconds.observe(time.perf_counter() - started_at)
+        if self._overflow > max(overflow, 0):
+            pool_overflow_total.inc()
+        return connection
+
+
+@event.listens_for(Pool, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    connection_record.info["checked_out_at"] = time.perf_counter()
+
+
+@event.listens_for(Pool, "checkin")
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    checked_out_at = connection_record.info.pop("checked_out_at", None)
+    if checked_out_at is None:
+        return
+    held = time.perf_counter() - checked_out_at
+    pool_hold_seconds.observe(held)
+    timing = get_server_timing()
+    if timing is not None:
+        timing.add("pool", held)
 
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.ECHO_SQL)
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (
+        None,
+        "",
+        ":memory:",
+    )
+
+
+def is_optimized_sqlite(settings: Settings, url: Optional[str] = None) -> bool:
+    url = url or settings.DATABASE_URL
+    return (
+        settings.SQLITE_OPTIMIZED
+        and make_url(url).get_backend_name() == "sqlite"
+        and not _is_memory_sqlite(url)
+    )
+
+
+def engine_options(
+    settings: Settings, url: Optional[str] = None, read_only: bool = False
+) -> dict[str, Any]:
+    """
+    Параметры пула и кэшей запросов для create_async_engine. SQLite в памяти
+    живет в единственном соединении (StaticPool), настройки пула к ней
+    не применяются. Для оптимизированной файловой SQLite пул писателя состоит
+    из одного соединения: транзакции с записью ждут его в очереди пула,
+    а не получают "database is locked".
+    """
+    url = url or settings.DATABASE_URL
+    options: dict[str, Any] = {"query_cache_size": settings.DB_QUERY_CACHE_SIZE}
+    if make_url(url).drivername == "postgresql+asyncpg":
+        # Подготовленные выражения на стороне сервера, кэш на каждое соединение.
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE
+        }
+    if _is_memory_sqlite(url):
+        return options
+    options |= {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_POOL_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if is_optimized_sqlite(settings, url):
+        options["pool_size"] = settings.SQLITE_READ_POOL_SIZE if read_only else 1
+        options["max_overflow"] = 0
+    return options
+
+
+def sqlite_pragmas(settings: Settings, read_only: bool = False) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={settings.SQLITE_CACHE_SIZE}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _apply_pragmas(engine: AsyncEngine, pragmas: list[str]) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_sqlite_engines(url: str) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    Писатель с единственным соединением и пул соединений только для чтения
+    к одному файлу SQLite. В режиме WAL читатели не блокируют писателя
+    и сразу видят зафиксированные им данные.
+    """
+    writer = create_async_engine(
+        url, echo=settings.ECHO_SQL, **engine_options(settings, url)
+    )
+    _apply_pragmas(writer, sqlite_pragmas(settings))
+    instrument_engine(writer)
+    reader = create_async_engine(
+        url, echo=settings.ECHO_SQL, **engine_options(settings, url, read_only=True)
+    )
+    _apply_pragmas(reader, sqlite_pragmas(settings, read_only=True))
+    instrument_engine(reader)
+    return writer, reader
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(
+        url, echo=settings.ECHO_SQL, **engine_options(settings, url)
+    )
+    instrument_engine(engine)
+    return engine
+
+
+if is_optimized_sqlite(settings):
+    engine, _sqlite_reader = create_sqlite_engines(settings.DATABASE_URL)
+    replicas = create_replica_set(
+        _create_engine, extra=[Replica("sqlite-reader", _sqlite_reader)]
+    )
+else:
+    engine = _create_engine(settings.DATABASE_URL)
+    replicas = create_replica_set(_create_engine)
 AsyncSessionLocal = async_sessionmaker(
-    bind=engine, class_=AsyncSession, expire_on_commit=False
+    bind=engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
+    info={
+        "replicas": replicas,
+        "all_reads_to_replicas": is_optimized_sqlite(settings)
+        and not settings.DB_REPLICA_URLS,
+    },
+)
+
+registry.gauge(
+    "db_pool_checked_out",
+    "Соединения пула, выданные в работу.",
+    callback=lambda: getattr(engine.sync_engine.pool, "checkedout", lambda: 0)(),
 )
+registry.gauge(
+    "db_pool_overflow_current",
+    "Текущее число соединений сверх DB_POOL_SIZE.",
+    callback=lambda: max(getattr(engine.sync_engine.pool, "_overflow", 0), 0),
+)
+
+
+async def prewarm_pool(engine: AsyncEngine, size: int) -> int:
+    """
+    Заранее открывает до size соединений и возвращает их в пул, чтобы первые
+    запросы после старта не платили за установку соединения.
+    """
+    pool = engine.sync_engine.pool
+    if not isinstance(pool, AsyncAdaptedQueuePool):
+        return 0
+    size = min(size, pool.size())
+    connections = [engine.connect() for _ in range(size)]
+    results = await asyncio.gather(
+        *(connection.start() for connection in connections), return_exceptions=True
+    )
+    for connection, result in zip(connections, results):
+        if not isinstance(result, BaseException):
+            await connection.close()
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return size
+
+
+def _reset_engine_after_fork() -> None:
+    # Соединения, унаследованные от родителя, закрывает родитель:
+    # дочерний процесс просто забывает их и открывает свои.
+    engine.sync_engine.dispose(close=False)
+    for replica in replicas.replicas:
+        replica.engine.sync_engine.dispose(close=False)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_engine_after_fork)
 
 
 class Base(DeclarativeBase):
     pass
 
 
+class LazySession:
+    """
+    Заместитель AsyncSession: настоящая сессия создается при первом
+    обращении к ней, поэтому запросы, отклоненные до работы с БД,
+    не создают и не закрывают сессию.
+    """
+
+    def __init__(self, factory: async_sessionmaker):
+        self._factory = factory
+        self._session: Optional[AsyncSession] = None
+
+    @property
+    def created(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """
     Зависимость FastAPI для получения сессии БД.
-    Обеспечивает корректный commit или rollback транзакции.
+    Сессия создается лениво; соединение берется из пула на время
+    операции и возвращается после ее commit (см. app.unit_of_work).
     """
-    session = AsyncSessionLocal()
+    session = LazySession(AsyncSessionLocal)
     try:
         yield session
     except Exception:
@@ -0,0 +1,42 @@
+from .dependencies import require_admin
+from .exceptions import (
+    DiagnosticsError,
+    MemoryTracingNotStartedError,
+    ProfilerBusyError,
+    SnapshotNotFoundError,
+)
+from .memory import MemoryProfiler, MemoryReporter, memory_profiler
+from .profiling import RequestProfiler, profiler, sign_correlation_id
+from .schemas import (
+    AllocationDiff,
+    AllocationSite,
+    MemorySnapshotCreate,
+    MemoryTracingStart,
+    MemoryTracingStatus,
+    ProfilingConfig,
+    ProfilingStatus,
+)
+from .watchdog import LoopLagWatchdog, watchdog
+
+__all__ = [
+    "require_admin",
+    "DiagnosticsError",
+    "ProfilerBusyError",
+    "MemoryTracingNotStartedError",
+    "SnapshotNotFoundError",
+    "MemoryProfiler",
+    "MemoryReporter",
+    "memory_profiler",
+    "RequestProfiler",
+    "profiler",
+    "sign_correlation_id",
+    "ProfilingConfig",
+    "ProfilingStatus",
+    "MemoryTracingStart",
+    "MemorySnapshotCreate",
+    "MemoryTracingStatus",
+    "AllocationSite",
+    "AllocationDiff",
+    "LoopLagWatchdog",
+    "watchdog",
+]
@@ -0,0 +1,20 @@
+import hmac
+from typing import Annotated, Optional
+from fastapi import Header, HTTPException, status
+from app.config import settings
+
+
+def require_admin(
+    x_admin_token: Annotated[Optional[str], Header()] = None,
+) -> None:
+    """Зависимость, пропускающая только запросы с корректным X-Admin-Token."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin API is disabled"
+        )
+    if x_admin_token is None or not hmac.compare_digest(
+        x_admin_token, settings.ADMIN_TOKEN
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token"
+        )
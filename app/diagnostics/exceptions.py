@@ -0,0 +1,18 @@
+class DiagnosticsError(Exception):
+    pass
+
+
+class ProfilerBusyError(DiagnosticsError):
+    def __init__(self):
+        super().__init__("Another request is already being profiled.")
+
+
+class MemoryTracingNotStartedError(DiagnosticsError):
+    def __init__(self):
+        super().__init__("Memory tracing is not started.")
+
+
+class SnapshotNotFoundError(DiagnosticsError):
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"Memory snapshot {name} not found.")
@@ -0,0 +1,158 @@
+import asyncio
+import gc
+import os
+import resource
+import tracemalloc
+from typing import Optional
+from app.config import settings
+from app.logging_config import logger
+from app.metrics import registry
+from .exceptions import MemoryTracingNotStartedError, SnapshotNotFoundError
+from .schemas import AllocationDiff, AllocationSite, MemoryTracingStatus
+
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def get_rss_bytes() -> int:
+    """
+    Текущий RSS процесса. На Linux читается из /proc, на остальных
+    платформах возвращается пиковый RSS из getrusage.
+    """
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+registry.gauge(
+    "process_resident_memory_bytes",
+    "Resident set size процесса.",
+    callback=get_rss_bytes,
+)
+
+
+class MemoryProfiler:
+    """
+    Управление tracemalloc: запуск, именованные снимки, топ и разница снимков.
+    Хранится не больше max_snapshots последних снимков; старые вытесняются.
+    """
+
+    def __init__(self, max_snapshots: int = 10):
+        self.max_snapshots = max_snapshots
+        self._snapshots: dict[str, tracemalloc.Snapshot] = {}
+
+    def start(self, frames: int = 1) -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        # Снимки прошлого запуска несравнимы с новыми (другая глубина стека).
+        self._snapshots.clear()
+        tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self._snapshots.clear()
+
+    def status(self) -> MemoryTracingStatus:
+        traced, peak = tracemalloc.get_traced_memory()
+        return MemoryTracingStatus(
+            tracing=tracemalloc.is_tracing(),
+            traced_memory_bytes=traced,
+            peak_memory_bytes=peak,
+            snapshots=list(self._snapshots),
+        )
+
+    async def take_snapshot(self, name: str) -> None:
+        """Снимает и сохраняет снимок (вне event loop: это долгая операция)."""
+        if not tracemalloc.is_tracing():
+            raise MemoryTracingNotStartedError()
+        snapshot = await asyncio.to_thread(tracemalloc.take_snapshot)
+        self._snapshots.pop(name, None)
+        while len(self._snapshots) >= self.max_snapshots:
+            del self._snapshots[next(iter(self._snapshots))]
+        self._snapshots[name] = snapshot.filter_traces(_SNAPSHOT_FILTERS)
+
+    def _get(self, name: str) -> tracemalloc.Snapshot:
+        snapshot = self._snapshots.get(name)
+        if snapshot is None:
+            raise SnapshotNotFoundError(name)
+        return snapshot
+
+    async def top(self, name: str, limit: int = 20) -> list[AllocationSite]:
+        """Возвращает места с наибольшим объемом аллокаций в снимке."""
+        snapshot = self._get(name)
+        stats = await asyncio.to_thread(snapshot.statistics, "lineno")
+        return [
+            AllocationSite(
+                file=stat.traceback[0].filename,
+                line=stat.traceback[0].lineno,
+                size_bytes=stat.size,
+                count=stat.count,
+            )
+            for stat in stats[:limit]
+        ]
+
+    async def diff(
+        self, base: str, target: str, limit: int = 20
+    ) -> list[AllocationDiff]:
+        """Возвращает места с наибольшим ростом аллокаций между снимками."""
+        base_snapshot, target_snapshot = self._get(base), self._get(target)
+        stats = await asyncio.to_thread(
+            target_snapshot.compare_to, base_snapshot, "lineno"
+        )
+        return [
+            AllocationDiff(
+                file=stat.traceback[0].filename,
+                line=stat.traceback[0].lineno,
+                size_bytes=stat.size,
+                size_diff_bytes=stat.size_diff,
+                count=stat.count,
+                count_diff=stat.count_diff,
+            )
+            for stat in stats[:limit]
+        ]
+
+
+class MemoryReporter:
+    """Периодически пишет в лог RSS процесса и статистику сборщика мусора."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="memory-reporter")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            self.report()
+
+    def report(self) -> None:
+        gc_stats = gc.get_stats()
+        logger.info(
+            "Memory report: rss=%d bytes, gc_counts=%s, gc_collections=%s, "
+            "gc_collected=%s, gc_uncollectable=%s",
+            get_rss_bytes(),
+            gc.get_count(),
+            [generation["collections"] for generation in gc_stats],
+            [generation["collected"] for generation in gc_stats],
+            [generation["uncollectable"] for generation in gc_stats],
+        )
+
+
+memory_profiler = MemoryProfiler(max_snapshots=settings.MEMORY_MAX_SNAPSHOTS)
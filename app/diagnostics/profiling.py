@@ -0,0 +1,173 @@
+import asyncio
+import cProfile
+import hashlib
+import hmac
+import io
+import itertools
+import pstats
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from app.config import settings
+from app.logging_config import logger
+from .exceptions import ProfilerBusyError
+from .schemas import ProfilingConfig, ProfilingStatus
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+_INTERLEAVING_NOTE = (
+    "cProfile records the whole thread: time spent in other requests that ran\n"
+    "on the event loop while this one awaited is included. For a clean profile\n"
+    "reproduce the request without concurrent load.\n\n"
+)
+
+
+def sign_correlation_id(
+    correlation_id: str, secret: str, timestamp: Optional[int] = None
+) -> str:
+    """
+    Вычисляет подпись для заголовка X-Profile-Signature в виде
+    «<unix-время>.<HMAC-SHA256 от времени и correlation ID>».
+    """
+    if timestamp is None:
+        timestamp = int(time.time())
+    digest = hmac.new(
+        secret.encode(), f"{timestamp}.{correlation_id}".encode(), hashlib.sha256
+    ).hexdigest()
+    return f"{timestamp}.{digest}"
+
+
+class RequestProfiler:
+    """
+    Профилировщик запросов по требованию.
+    Запрос профилируется, если он подписан заголовком X-Profile-Signature,
+    если его correlation ID заказан через админ-API или он попал в выборку 1 из N.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        secret: Optional[str] = None,
+        signature_max_age: float = 300,
+    ):
+        self.output_dir = Path(output_dir)
+        self.secret = secret
+        self.signature_max_age = signature_max_age
+        self.profiles_written = 0
+        self._config = ProfilingConfig()
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+        self._active = False
+        # Принятые подписи до истечения срока: повтор подписи отклоняется.
+        self._used_signatures: dict[str, float] = {}
+
+    @property
+    def armed(self) -> bool:
+        """Есть ли заказанные через админ-API запросы или выборка."""
+        return bool(self._config.sample_every or self._config.correlation_ids)
+
+    def configure(self, config: ProfilingConfig) -> None:
+        """Применяет настройки выборки, заданные через админ-API."""
+        self._config = config.model_copy(deep=True)
+        self._counter = itertools.count(1)
+
+    def status(self) -> ProfilingStatus:
+        return ProfilingStatus(
+            **self._config.model_dump(),
+            profiles_written=self.profiles_written,
+            output_dir=str(self.output_dir),
+        )
+
+    def is_signed(self, correlation_id: str, signature: Optional[str]) -> bool:
+        """
+        Проверяет подпись correlation ID секретом профилировщика. Подпись
+        старше signature_max_age секунд или уже предъявленная отклоняется.
+        """
+        if not self.secret or not signature:
+            return False
+        timestamp, _, _ = signature.partition(".")
+        if not timestamp.isdigit():
+            return False
+        now = time.time()
+        if abs(now - int(timestamp)) > self.signature_max_age:
+            return False
+        expected = sign_correlation_id(correlation_id, self.secret, int(timestamp))
+        if not hmac.compare_digest(expected, signature):
+            return False
+        self._used_signatures = {
+            used: expires_at
+            for used, expires_at in self._used_signatures.items()
+            if expires_at > now
+        }
+        if signature in self._used_signatures:
+            return False
+        self._used_signatures[signature] = int(timestamp) + self.signature_max_age
+        return True
+
+    def should_profile(self, correlation_id: str, signature: Optional[str]) -> bool:
+        """Решает, нужно ли профилировать запрос."""
+        if signature is not None:
+            return self.is_signed(correlation_id, signature)
+        if not self.armed:
+            return False
+        config = self._config
+        if correlation_id in config.correlation_ids:
+            config.correlation_ids.remove(correlation_id)
+            return True
+        if config.sample_every and next(self._counter) % config.sample_every == 0:
+            if config.max_profiles is not None:
+                config.max_profiles -= 1
+                if config.max_profiles <= 0:
+                    config.sample_every = 0
+                    config.max_profiles = None
+            return True
+        return False
+
+    def start(self) -> cProfile.Profile:
+        """
+        Запускает профилирование. cProfile видит весь поток, поэтому
+        одновременно профилируется только один запрос, а в профиль попадают
+        и другие запросы, выполнявшиеся в event loop, пока этот ждал await.
+        """
+        with self._lock:
+            if self._active:
+                raise ProfilerBusyError()
+            self._active = True
+        profile = cProfile.Profile()
+        profile.enable()
+        return profile
+
+    async def finish(self, profile: cProfile.Profile, correlation_id: str) -> Path:
+        """Останавливает профилирование и сохраняет результат на диск."""
+        profile.disable()
+        with self._lock:
+            self._active = False
+        path = await asyncio.to_thread(self._dump, profile, correlation_id)
+        self.profiles_written += 1
+        logger.info("Request profile saved to %s", path)
+        return path
+
+    def _dump(self, profile: cProfile.Profile, correlation_id: str) -> Path:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = _UNSAFE_FILENAME_CHARS.sub("_", correlation_id)[:128]
+        stats_path = self.output_dir / f"{name}.prof"
+        profile.dump_stats(stats_path)
+
+        report = io.StringIO()
+        report.write(_INTERLEAVING_NOTE)
+        stats = pstats.Stats(profile, stream=report)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(50)
+        stats.print_callees(50)
+        text_path = self.output_dir / f"{name}.txt"
+        text_path.write_text(report.getvalue(), encoding="utf-8")
+        return stats_path
+
+
+profiler = RequestProfiler(
+    output_dir=settings.PROFILING_DIR,
+    secret=settings.PROFILING_SECRET,
+    signature_max_age=settings.PROFILING_SIGNATURE_MAX_AGE_SECONDS,
+)
@@ -0,0 +1,40 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+
+class ProfilingConfig(BaseModel):
+    sample_every: int = Field(0, ge=0)
+    max_profiles: Optional[int] = Field(None, ge=1)
+    correlation_ids: list[str] = Field(default_factory=list)
+
+
+class ProfilingStatus(ProfilingConfig):
+    profiles_written: int
+    output_dir: str
+
+
+class MemoryTracingStart(BaseModel):
+    frames: int = Field(1, ge=1, le=100)
+
+
+class MemorySnapshotCreate(BaseModel):
+    name: str = Field(min_length=1, max_length=64)
+
+
+class MemoryTracingStatus(BaseModel):
+    tracing: bool
+    traced_memory_bytes: int
+    peak_memory_bytes: int
+    snapshots: list[str]
+
+
+class AllocationSite(BaseModel):
+    file: str
+    line: int
+    size_bytes: int
+    count: int
+
+
+class AllocationDiff(AllocationSite):
+    size_diff_bytes: int
+    count_diff: int
@@ -0,0 +1,114 @@
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+from app.config import settings
+from app.logging_config import get_task_correlation_id, logger
+from app.metrics import registry
+
+loop_lag_seconds = registry.summary(
+    "event_loop_lag_seconds",
+    "Задержка срабатывания таймеров event loop.",
+    quantiles=(0.5, 0.9, 0.99, 0.999),
+    window=4096,
+)
+loop_blocked_total = registry.counter(
+    "event_loop_blocked",
+    "Количество блокировок event loop дольше порога.",
+)
+
+
+class LoopLagWatchdog:
+    """
+    Сторож event loop.
+    Корутина на loop регулярно засыпает на interval и измеряет опоздание
+    пробуждения, обновляя heartbeat. Отдельный поток следит за heartbeat:
+    если loop не отвечает дольше threshold, поток снимает стек главного потока
+    и пишет его в лог вместе с correlation ID выполняющейся задачи.
+    """
+
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self.last_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.create_task(self._measure(), name="loop-lag-watchdog")
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-lag-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    async def _measure(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self._heartbeat = time.monotonic()
+            self.last_lag = lag
+            loop_lag_seconds.observe(lag)
+            if lag > self.threshold:
+                loop_blocked_total.inc()
+                logger.warning("Event loop lag %.1f ms", lag * 1000)
+
+    def _watch(self) -> None:
+        reported_heartbeat = None
+        while not self._stopped.wait(self.interval):
+            heartbeat = self._heartbeat
+            stalled_for = time.monotonic() - heartbeat - self.interval
+            if stalled_for > self.threshold and heartbeat != reported_heartbeat:
+                reported_heartbeat = heartbeat
+                self._report_blocking(stalled_for)
+
+    def _report_blocking(self, stalled_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = "".join(traceback.format_stack(frame))
+        logger.warning(
+            "Event loop blocked for at least %.1f ms, loop thread stack:\n%s",
+            stalled_for * 1000,
+            stack,
+            extra={"correlation_id": self._active_correlation_id()},
+        )
+
+    def _active_correlation_id(self) -> str:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+        if task is None:
+            return "N/A"
+        return get_task_correlation_id(task) or "N/A"
+
+
+watchdog = LoopLagWatchdog(
+    interval=settings.LOOP_WATCHDOG_INTERVAL_SECONDS,
+    threshold=settings.LOOP_WATCHDOG_THRESHOLD_SECONDS,
+)
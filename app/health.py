@@ -0,0 +1,179 @@
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Callable, Literal, Optional
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool, QueuePool
+from app.config import settings
+from app.database import engine
+from app.diagnostics import watchdog
+from app.logging_config import logger
+from app.metrics import registry
+from app.statement_timeout import set_statement_timeout
+
+
+class CheckResult(BaseModel):
+    ok: bool
+    detail: Optional[str] = None
+
+
+class HealthReport(BaseModel):
+    status: Literal["ok", "unavailable"]
+    checked_at: Optional[datetime] = None
+    checks: dict[str, CheckResult]
+
+
+class ReadinessProber:
+    """
+    Фоновая проверка готовности: раз в interval секунд проверяет запрос
+    к БД, заполненность пула соединений и задержку event loop и хранит
+    готовый ответ. Эндпоинт готовности только отдает сохраненные байты:
+    частые пробы оркестратора не ходят в БД и не ждут соединения из пула.
+    Результат старше stale_after секунд считается неготовностью.
+
+    SELECT 1 выполняется через отдельное соединение без пула (probe_engine):
+    проверка не ждет занятое соединение пула, например единственное
+    соединение писателя SQLite во время записи.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        loop_lag: Callable[[], float],
+        interval: float,
+        timeout: float,
+        max_pool_saturation: float,
+        max_loop_lag: float,
+        probe_engine: Optional[AsyncEngine] = None,
+    ):
+        self.engine = engine
+        self.probe_engine = probe_engine or _probe_engine(engine)
+        self.loop_lag = loop_lag
+        self.interval = interval
+        self.timeout = timeout
+        self.max_pool_saturation = max_pool_saturation
+        self.max_loop_lag = max_loop_lag
+        self.stale_after = 3 * interval + timeout
+        self.report: Optional[HealthReport] = None
+        self.body = b""
+        self._checked_at = float("-inf")
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return (
+            self.report is not None
+            and self.report.status == "ok"
+            and time.monotonic() - self._checked_at <= self.stale_after
+        )
+
+    def current(self) -> tuple[bool, bytes]:
+        """Готовность и тело ответа по последней проверке."""
+        if self.ready:
+            return True, self.body
+        if self.report is not None and self.report.status != "ok":
+            return False, self.body
+        # Проверки еще не было или фоновая проверка перестала обновляться.
+        stale = HealthReport(
+            status="unavailable",
+            checked_at=self.report.checked_at if self.report is not None else None,
+            checks={},
+        )
+        return False, stale.model_dump_json().encode()
+
+    async def check(self) -> HealthReport:
+        checks = {
+            "database": await self._check_database(),
+            "pool": self._check_pool(),
+            "event_loop": self._check_loop_lag(),
+        }
+        report = HealthReport(
+            status=(
+                "ok" if all(check.ok for check in checks.values()) else "unavailable"
+            ),
+            checked_at=datetime.now(timezone.utc),
+            checks=checks,
+        )
+        previous = self.report.status if self.report is not None else "ok"
+        if report.status != previous:
+            logger.warning("Readiness changed to %s: %s", report.status, checks)
+        self.report = report
+        self.body = report.model_dump_json().encode()
+        self._checked_at = time.monotonic()
+        return report
+
+    async def _check_database(self) -> CheckResult:
+        started_at = time.perf_counter()
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self.probe_engine.connect() as conn:
+                    await conn.scalar(select(1))
+        except Exception as e:
+            return CheckResult(ok=False, detail=f"{type(e).__name__}: {e}"[:200])
+        elapsed = (time.perf_counter() - started_at) * 1000
+        return CheckResult(ok=True, detail=f"{elapsed:.1f} ms")
+
+    def _check_pool(self) -> CheckResult:
+        pool = self.engine.sync_engine.pool
+        if not isinstance(pool, QueuePool):
+            return CheckResult(ok=True)
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        if capacity <= 1:
+            # Единственное соединение занято при любой записи: это не перегрузка.
+            return CheckResult(ok=True, detail="single connection, not checked")
+        saturation = pool.checkedout() / capacity
+        return CheckResult(
+            ok=saturation < self.max_pool_saturation,
+            detail=f"{pool.checkedout()}/{capacity} checked out",
+        )
+
+    def _check_loop_lag(self) -> CheckResult:
+        lag = self.loop_lag()
+        return CheckResult(ok=lag <= self.max_loop_lag, detail=f"{lag * 1000:.1f} ms")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="readiness-prober")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self.probe_engine is not self.engine:
+            await self.probe_engine.dispose()
+
+    async def _run(self) -> None:
+        # Задача работает в своем контексте: таймаут касается только проверок.
+        set_statement_timeout(self.timeout)
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+
+def _probe_engine(engine: AsyncEngine) -> AsyncEngine:
+    if not isinstance(engine.sync_engine.pool, QueuePool):
+        # SQLite в памяти живет в единственном соединении движка.
+        return engine
+    return create_async_engine(engine.url, poolclass=NullPool)
+
+
+readiness = ReadinessProber(
+    engine,
+    loop_lag=lambda: watchdog.last_lag,
+    interval=settings.HEALTH_CHECK_INTERVAL_SECONDS,
+    timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+    max_pool_saturation=settings.HEALTH_MAX_POOL_SATURATION,
+    max_loop_lag=settings.HEALTH_MAX_LOOP_LAG_SECONDS,
+)
+registry.gauge(
+    "health_ready",
+    "Готовность к приему трафика по последней фоновой проверке (1 или 0).",
+    callback=lambda: float(readiness.ready),
+)
@@ -0,0 +1,115 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Hashable, Optional
+from fastapi import Response
+from app.config import settings
+from app.metrics import registry
+
+idempotent_replays_total = registry.counter(
+    "idempotent_replays",
+    "Ответы, повторенные по Idempotency-Key без выполнения запроса.",
+)
+
+
+class IdempotencyKeyReusedError(Exception):
+    def __init__(self, key: Hashable):
+        self.key = key
+        super().__init__("Idempotency-Key was already used for a different request.")
+
+
+@dataclass(frozen=True)
+class StoredResponse:
+    status_code: int
+    body: bytes
+    media_type: Optional[str]
+
+    def to_response(self) -> Response:
+        response = Response(
+            self.body, status_code=self.status_code, media_type=self.media_type
+        )
+        response.headers["Idempotent-Replayed"] = "true"
+        return response
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    result: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+    expires_at: float = float("inf")
+
+
+class IdempotencyStore:
+    """
+    Первые ответы на запросы с Idempotency-Key. Повтор с тем же ключом
+    получает сохраненный ответ без выполнения запроса, а пришедший во время
+    выполнения первого — ждет его результата. Ответы 5xx и исключения не
+    сохраняются: ожидающие повторы выполняются заново.
+    Состояние хранится в памяти процесса: не дольше ttl секунд и не больше
+    max_entries завершенных ответов.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, _Entry] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def execute(
+        self,
+        key: Hashable,
+        fingerprint: str,
+        call: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        while (entry := self._get(key)) is not None:
+            if entry.fingerprint != fingerprint:
+                raise IdempotencyKeyReusedError(key)
+            stored = await asyncio.shield(entry.result)
+            if stored is not None:
+                idempotent_replays_total.inc()
+                return stored.to_response()
+
+        entry = self._entries[key] = _Entry(fingerprint)
+        stored = None
+        try:
+            response = await call()
+            if response.status_code < 500:
+                stored = StoredResponse(
+                    response.status_code, bytes(response.body), response.media_type
+                )
+            return response
+        finally:
+            if stored is None:
+                del self._entries[key]
+            else:
+                entry.expires_at = time.monotonic() + self.ttl
+                self._evict()
+            entry.result.set_result(stored)
+
+    def _get(self, key: Hashable) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def _evict(self) -> None:
+        # Словарь упорядочен по времени начала запросов; выполняющиеся
+        # записи не вытесняются.
+        now = time.monotonic()
+        overflow = len(self._entries) - self.max_entries
+        for key, entry in list(self._entries.items()):
+            if entry.expires_at <= now or (overflow > 0 and entry.result.done()):
+                del self._entries[key]
+                overflow -= 1
+            elif overflow <= 0:
+                break
+
+
+idempotency_store = IdempotencyStore(
+    settings.IDEMPOTENCY_TTL_SECONDS, settings.IDEMPOTENCY_MAX_ENTRIES
+)
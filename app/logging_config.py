@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import json
 from datetime import datetime, timezone
@@ -13,7 +14,11 @@ class CorrelationIdFilter(logging.Filter):
     """Фильтр для добавления correlation ID в лог-записи."""
 
     def filter(self, record):
-        record.correlation_id = _correlation_id_var.get() or "N/A"
+        record.correlation_id = (
+            getattr(record, "correlation_id", None)
+            or _correlation_id_var.get()
+            or "N/A"
+        )
         return True
 
 
@@ -85,3 +90,13 @@ logger = logging.getLogger(__name__)
 def set_correlation_id(correlation_id: str) -> None:
     """Устанавливает correlation ID в контексте."""
     _correlation_id_var.set(correlation_id)
+
+
+def get_correlation_id() -> str | None:
+    """Возвращает correlation ID текущего контекста."""
+    return _correlation_id_var.get()
+
+
+def get_task_correlation_id(task: asyncio.Task) -> str | None:
+    """Возвращает correlation ID из контекста задачи (в том числе из другого потока)."""
+    return task.get_context().get(_correlation_id_var)
@@ -1,19 +1,42 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy import select
-from app.middleware import CorrelationIdMiddleware
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app.config import settings
+from app.middleware import (
+    AdmissionControlMiddleware,
+    CancelOnDisconnectMiddleware,
+    CompressionMiddleware,
+    CorrelationIdMiddleware,
+    ProfilingMiddleware,
+    ReadYourWritesMiddleware,
+    ServerTimingMiddleware,
+    TracingMiddleware,
+)
 from app.logging_config import setup_logging, logger
-from app.database import engine
+from app import server_timing, tracing
+from app.admission import admission
+from app.statement_timeout import StatementTimeoutError
+from app.database import engine, prewarm_pool, replicas
+from app.replication import read_your_writes
 
 from app.auth import AuthError
 from app.api.task_manager import router as task_manager_router
 
 from app.task_manager import TaskServiceError
 from app.api.auth import router as auth_router
+from app.api.diagnostics import router as diagnostics_router
+from app.api.metrics import router as metrics_router
+from app.api.health import router as health_router
+from app.health import readiness
+from app.diagnostics import MemoryReporter, profiler, watchdog
 
 
 setup_logging()
+server_timing.instrument_sqlalchemy()
+tracing.instrument_sqlalchemy()
 
 
 @asynccontextmanager
@@ -23,17 +46,49 @@ async def lifespan(app: FastAPI):
         async with engine.connect() as conn:
             await conn.scalar(select(1))
         logger.info("Database connection established successfully")
+        warmed = await prewarm_pool(engine, settings.DB_POOL_MIN_SIZE)
+        logger.info("Connection pool pre-warmed with %d connections", warmed)
     except Exception as e:
         logger.critical(
             "Failed to connect to database on startup: %s", str(e), exc_info=True
         )
         raise
+    replicas.start()
+    await readiness.check()
+    readiness.start()
+    if settings.LOOP_WATCHDOG_ENABLED:
+        await watchdog.start()
+    if tracing.tracer.processor is not None:
+        tracing.tracer.processor.start()
+    memory_reporter = MemoryReporter(interval=settings.MEMORY_REPORT_INTERVAL_SECONDS)
+    if settings.MEMORY_REPORT_INTERVAL_SECONDS > 0:
+        memory_reporter.start()
     yield
     logger.info("Application shutdown...")
+    await readiness.stop()
+    await memory_reporter.stop()
+    await watchdog.stop()
+    if tracing.tracer.processor is not None:
+        await asyncio.to_thread(tracing.tracer.processor.shutdown)
+    await replicas.stop()
+    await replicas.dispose()
     await engine.dispose()
 
 
 app = FastAPI(title="Task Manager API", version="1.0.0", lifespan=lifespan)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+app.add_middleware(ServerTimingMiddleware)
+if read_your_writes.window > 0:
+    app.add_middleware(ReadYourWritesMiddleware, read_your_writes=read_your_writes)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware, tracer=tracing.tracer)
+if settings.CANCEL_ON_DISCONNECT:
+    app.add_middleware(CancelOnDisconnectMiddleware)
+if settings.ADMISSION_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware, admission=admission)
 app.add_middleware(CorrelationIdMiddleware)
 
 
@@ -52,6 +107,38 @@ async def generic_exception_handler(request: Request, exc: Exception):
     )
 
 
+@app.exception_handler(StatementTimeoutError)
+async def statement_timeout_exception_handler(
+    request: Request, exc: StatementTimeoutError
+):
+    logger.warning(
+        "Statement timeout during %s %s: %s",
+        request.method,
+        request.url.path,
+        str(exc),
+        extra={"client_host": request.client.host},
+    )
+    return JSONResponse(
+        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+        content={"detail": "The database did not respond in time."},
+    )
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_exception_handler(request: Request, exc: PoolTimeoutError):
+    logger.warning(
+        "Database pool timeout during %s %s",
+        request.method,
+        request.url.path,
+        extra={"client_host": request.client.host},
+    )
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "No database connection available, retry later."},
+        headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+    )
+
+
 @app.exception_handler(TaskServiceError)
 async def task_service_exception_handler(request: Request, exc: TaskServiceError):
     logger.error(
@@ -86,6 +173,9 @@ async def auth_exception_handler(request: Request, exc: AuthError):
 
 app.include_router(task_manager_router)
 app.include_router(auth_router)
+app.include_router(diagnostics_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
 
 @app.get("/", tags=["Root"])
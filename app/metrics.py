@@ -0,0 +1,185 @@
+import math
+import threading
+from collections import deque
+from typing import Callable, Iterable
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], **extra) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    rendered = ",".join(f'{name}="{value}"' for name, value in pairs)
+    return "{" + rendered + "}"
+
+
+class _Metric:
+    """Базовый класс метрики с необязательными метками."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._children: dict[tuple[str, ...], "_Metric"] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels: str) -> "_Metric":
+        """Возвращает дочернюю метрику для заданных значений меток."""
+        key = tuple(str(labels[name]) for name in self.label_names)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _new_child(self) -> "_Metric":
+        return type(self)(self.name, self.documentation)
+
+    def _samples(self) -> list[tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        children = self._children.items() if self.label_names else [((), self)]
+        for values, metric in children:
+            for suffix, extra_labels, value in metric._samples():
+                labels = _format_labels(self.label_names, values, **extra_labels)
+                lines.append(f"{self.name}{suffix}{labels} {value}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Монотонно растущий счетчик."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()):
+        super().__init__(name, documentation, labels)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def _samples(self):
+        return [("_total", {}, self.value)]
+
+
+class Gauge(_Metric):
+    """Текущее значение; может вычисляться функцией в момент сбора."""
+
+    type_name = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        callback: Callable[[], float] | None = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self.value = 0.0
+        self.callback = callback
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.inc(-amount)
+
+    def get(self) -> float:
+        return self.callback() if self.callback is not None else self.value
+
+    def _samples(self):
+        return [("", {}, self.get())]
+
+
+class Summary(_Metric):
+    """Сводка наблюдений с квантилями по скользящему окну последних значений."""
+
+    type_name = "summary"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Iterable[str] = (),
+        quantiles: Iterable[float] = (0.5, 0.95, 0.99),
+        window: int = 1024,
+    ):
+        super().__init__(name, documentation, labels)
+        self.quantile_levels = tuple(quantiles)
+        self.window = window
+        self.count = 0
+        self.sum = 0.0
+        self._observations: deque[float] = deque(maxlen=window)
+
+    def _new_child(self) -> "Summary":
+        return Summary(
+            self.name,
+            self.documentation,
+            quantiles=self.quantile_levels,
+            window=self.window,
+        )
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            self._observations.append(value)
+
+    def quantile(self, level: float) -> float:
+        """Возвращает квантиль по наблюдениям в окне (NaN, если их нет)."""
+        with self._lock:
+            observations = sorted(self._observations)
+        if not observations:
+            return math.nan
+        index = min(len(observations) - 1, int(level * len(observations)))
+        return observations[index]
+
+    def _samples(self):
+        samples = [
+            ("", {"quantile": str(level)}, self.quantile(level))
+            for level in self.quantile_levels
+        ]
+        samples.append(("_sum", {}, self.sum))
+        samples.append(("_count", {}, self.count))
+        return samples
+
+
+class MetricsRegistry:
+    """Реестр метрик процесса с выводом в текстовом формате Prometheus."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, **kwargs) -> Counter:
+        return self._register(Counter(name, documentation, **kwargs))
+
+    def gauge(self, name: str, documentation: str, **kwargs) -> Gauge:
+        return self._register(Gauge(name, documentation, **kwargs))
+
+    def summary(self, name: str, documentation: str, **kwargs) -> Summary:
+        return self._register(Summary(name, documentation, **kwargs))
+
+    def get(self, name: str) -> _Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
@@ -1,9 +1,26 @@
+import asyncio
+import contextvars
+import math
+import time
 from fastapi import Request
-from fastapi.responses import Response
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers, MutableHeaders
 from starlette.middleware.base import BaseHTTPMiddleware
-from app.logging_config import set_correlation_id
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.admission import AdmissionControl, OverloadedError
+from app.compression import available_codecs, choose_encoding, is_compressible
+from app.config import settings
+from app.diagnostics import ProfilerBusyError, RequestProfiler
+from app.logging_config import get_correlation_id, logger, set_correlation_id
+from app.replication import LAST_WRITE_COOKIE, ReadYourWrites, start_client_writes
+from app.server_timing import start_server_timing
+from app.statement_timeout import start_statement_scope
+from app.tracing import STATUS_ERROR, Tracer, use_span
 from uuid import uuid4
 
+CLIENT_CLOSED_REQUEST = 499
+
 
 class CorrelationIdMiddleware(BaseHTTPMiddleware):
     """Middleware для управления correlation ID."""
@@ -14,3 +31,360 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
         response: Response = await call_next(request)
         response.headers["X-Correlation-ID"] = correlation_id
         return response
+
+
+class ServerTimingMiddleware:
+    """
+    ASGI middleware, добавляющее заголовок Server-Timing с длительностями фаз.
+    Включается настройкой SERVER_TIMING_ENABLED.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not settings.SERVER_TIMING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        timing = start_server_timing()
+
+        async def send_with_timing(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timing.to_header())
+            await send(message)
+
+        await self.app(scope, receive, send_with_timing)
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware, запускающее запрос под cProfile по подписанному заголовку
+    X-Profile-Signature или по настройкам, заданным через админ-API.
+    Подключается только при PROFILING_ENABLED.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: RequestProfiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        signature = Headers(scope=scope).get("X-Profile-Signature")
+        if signature is None and not self.profiler.armed:
+            await self.app(scope, receive, send)
+            return
+
+        correlation_id = get_correlation_id() or str(uuid4())
+        if not self.profiler.should_profile(correlation_id, signature):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            profile = self.profiler.start()
+        except ProfilerBusyError as e:
+            logger.warning("Skipping request profiling: %s", str(e))
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await self.profiler.finish(profile, correlation_id)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware, открывающее серверный спан запроса. Принимает входящий
+    заголовок traceparent и возвращает идентификаторы трассы в traceresponse.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        span = self.tracer.start_server_span(
+            f"{method} {scope['path']}", Headers(scope=scope).get("traceparent")
+        )
+        span.set_attribute("http.request.method", method)
+        span.set_attribute("url.path", scope["path"])
+        span.set_attribute("correlation_id", get_correlation_id() or "N/A")
+
+        async def send_with_trace(message: Message):
+            if message["type"] == "http.response.start":
+                span.set_attribute("http.response.status_code", message["status"])
+                if message["status"] >= 500:
+                    span.status_code = STATUS_ERROR
+                headers = MutableHeaders(scope=message)
+                headers.append("traceresponse", span.context.to_traceparent())
+            await send(message)
+
+        with use_span(span):
+            try:
+                await self.app(scope, receive, send_with_trace)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware, сжимающее ответы кодеком из Accept-Encoding (gzip,
+    br и zstd — при установленных brotli и zstandard). Ответы короче
+    COMPRESSION_MIN_SIZE отправляются как есть: на них сжатие тратит больше
+    процессора, чем экономит сети. Потоковые ответы сжимаются по частям,
+    и каждая часть выталкивается клиенту сразу; начало потока без
+    Content-Length придерживается, пока не наберет COMPRESSION_MIN_SIZE.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.codecs = available_codecs(settings)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(
+            Headers(scope=scope).get("Accept-Encoding"), self.codecs
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        compressor = None
+        # Начало потокового ответа без Content-Length: копится, пока не
+        # наберется COMPRESSION_MIN_SIZE или не закончится тело.
+        pending: list[bytes] = []
+        pending_size = 0
+
+        async def send_compressed(message: Message):
+            nonlocal start, compressor, pending_size
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    "content-encoding" in headers
+                    or message["status"] in (204, 304)
+                    or not is_compressible(headers.get("content-type"))
+                ):
+                    await send(message)
+                else:
+                    # Решение о сжатии откладывается до тела ответа.
+                    start = message
+                return
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                headers = MutableHeaders(scope=start)
+                if "content-length" in headers:
+                    size = int(headers["content-length"])
+                else:
+                    pending.append(body)
+                    pending_size += len(body)
+                    if more_body and pending_size < settings.COMPRESSION_MIN_SIZE:
+                        return
+                    body = b"".join(pending)
+                    pending.clear()
+                    size = pending_size
+                headers.add_vary_header("Accept-Encoding")
+                if size < settings.COMPRESSION_MIN_SIZE:
+                    await send(start)
+                    await send({**message, "body": body})
+                    start = None
+                    return
+                compressor = self.codecs[encoding]()
+                headers["Content-Encoding"] = encoding
+                if more_body:
+                    del headers["Content-Length"]
+                else:
+                    compressed = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(compressed))
+                    await send(start)
+                    await send({**message, "body": compressed})
+                    return
+                await send(start)
+
+            if more_body:
+                chunk = compressor.compress(body) + compressor.flush()
+            else:
+                chunk = compressor.compress(body) + compressor.finish()
+            await send({**message, "body": chunk})
+
+        await self.app(scope, receive, send_compressed)
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware, передающее клиенту время его последней записи в cookie
+    LAST_WRITE_COOKIE: в течение окна read-your-writes его чтения идут
+    в основную БД в любом воркере, а не только в записавшем.
+    """
+
+    def __init__(self, app: ASGIApp, read_your_writes: ReadYourWrites):
+        self.app = app
+        self.max_age = math.ceil(read_your_writes.window)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        client = start_client_writes(
+            HTTPConnection(scope).cookies.get(LAST_WRITE_COOKIE)
+        )
+
+        async def send_with_cookie(message: Message):
+            if (
+                message["type"] == "http.response.start"
+                and client.written_at is not None
+            ):
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{LAST_WRITE_COOKIE}={client.written_at:.3f}; "
+                    f"Max-Age={self.max_age}; Path=/; HttpOnly; SameSite=lax",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware допуска запросов: при перегрузке класса маршрутов
+    запрос сразу получает 503 с Retry-After, а не ждет в очереди uvicorn.
+    Задержка для подстройки лимита считается от допуска до начала ответа.
+    """
+
+    def __init__(self, app: ASGIApp, admission: AdmissionControl):
+        self.app = app
+        self.admission = admission
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        controller = self.admission.controller_for(scope["method"], scope["path"])
+        if controller is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await controller.acquire()
+        except OverloadedError as e:
+            logger.warning("Rejecting %s %s: %s", scope["method"], scope["path"], e)
+            response = JSONResponse(
+                status_code=503,
+                content={"detail": "Server is overloaded, retry later."},
+                headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+
+        started_at = time.monotonic()
+        latency = None
+
+        async def send_with_latency(message: Message):
+            nonlocal latency
+            if message["type"] == "http.response.start":
+                latency = time.monotonic() - started_at
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_latency)
+        finally:
+            if latency is None:
+                latency = time.monotonic() - started_at
+            controller.release(latency, started_at)
+
+
+class CancelOnDisconnectMiddleware:
+    """
+    ASGI middleware, отменяющее обработку запроса, если клиент отключился
+    до конца ответа: обработчик выполняется в отдельной задаче, а входящие
+    сообщения читаются заранее. Выполняющееся выражение SQLite прерывается
+    через StatementScope, asyncpg при отмене сам отменяет запрос на сервере.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        messages: asyncio.Queue[Message] = asyncio.Queue()
+        disconnected = False
+        response_started = False
+        response_complete = False
+
+        async def receive_message() -> Message:
+            if disconnected and messages.empty():
+                return {"type": "http.disconnect"}
+            return await messages.get()
+
+        async def send_tracked(message: Message):
+            nonlocal response_started, response_complete
+            if message["type"] == "http.response.start":
+                response_started = True
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                response_complete = True
+            await send(message)
+
+        context = contextvars.copy_context()
+        statements = context.run(start_statement_scope)
+        handler = asyncio.get_running_loop().create_task(
+            self.app(scope, receive_message, send_tracked), context=context
+        )
+
+        async def watch_disconnect():
+            nonlocal disconnected
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    disconnected = True
+                    if not response_complete:
+                        statements.cancel()
+                        handler.cancel()
+                    return
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await handler
+        except asyncio.CancelledError:
+            if not statements.cancelled or asyncio.current_task().cancelling():
+                raise
+            logger.info(
+                "Client disconnected, cancelled %s %s", scope["method"], scope["path"]
+            )
+            # Ответ уже никто не прочтет, но внешние middleware и сервер
+            # ждут его завершения.
+            if not response_started:
+                await send(
+                    {
+                        "type": "http.response.start",
+                        "status": CLIENT_CLOSED_REQUEST,
+                        "headers": [],
+                    }
+                )
+            await send({"type": "http.response.body", "body": b""})
+        finally:
+            watcher.cancel()
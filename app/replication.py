@@ -0,0 +1,295 @@
+import asyncio
+import functools
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Hashable, Iterable, Optional
+from sqlalchemy import event, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.logging_config import logger
+from app.metrics import registry
+
+LAST_WRITE_COOKIE = "last_write"
+
+_replica_reads_var: ContextVar[Optional[bool]] = ContextVar(
+    "_replica_reads_var", default=None
+)
+
+
+class Replica:
+    """Реплика только для чтения и результат последней проверки ее доступности."""
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        event.listen(engine.sync_engine, "handle_error", self._on_error)
+
+    def _on_error(self, exception_context) -> None:
+        # Обрыв соединения выводит реплику из ротации до следующей проверки.
+        if exception_context.is_disconnect:
+            self.mark_unhealthy(exception_context.original_exception)
+
+    def mark_unhealthy(self, reason: BaseException) -> None:
+        if self.healthy:
+            logger.warning("Replica %s marked unhealthy: %s", self.name, reason)
+        self.healthy = False
+
+
+class ReplicaSet:
+    """
+    Реплики для чтения с выбором по кругу среди доступных и фоновой
+    проверкой доступности.
+    """
+
+    def __init__(
+        self,
+        replicas: list[Replica],
+        check_interval: float = 5.0,
+        check_timeout: float = 2.0,
+    ):
+        self.replicas = replicas
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def healthy_count(self) -> int:
+        return sum(replica.healthy for replica in self.replicas)
+
+    def choose(self) -> Optional[Replica]:
+        """Следующая доступная реплика или None, если доступных нет."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+        return healthy[next(self._counter) % len(healthy)]
+
+    async def check(self, replica: Replica) -> None:
+        try:
+            async with asyncio.timeout(self.check_timeout):
+                async with replica.engine.connect() as conn:
+                    await conn.scalar(select(1))
+        except Exception as e:
+            replica.mark_unhealthy(e)
+            return
+        if not replica.healthy:
+            logger.info("Replica %s is healthy again", replica.name)
+        replica.healthy = True
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(self.check(replica) for replica in self.replicas))
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-health-check")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    async def _run(self) -> None:
+        while True:
+            await self.check_all()
+            await asyncio.sleep(self.check_interval)
+
+
+class ClientWrites:
+    """
+    Время последней записи клиента (time.time()): из cookie запроса
+    и от записи в текущем запросе.
+    """
+
+    def __init__(self, seen_at: Optional[float] = None):
+        self.seen_at = seen_at
+        self.written_at: Optional[float] = None
+
+    def last_write(self) -> Optional[float]:
+        return self.written_at if self.written_at is not None else self.seen_at
+
+
+_client_writes_var: ContextVar[Optional[ClientWrites]] = ContextVar(
+    "_client_writes_var", default=None
+)
+
+
+def start_client_writes(cookie: Optional[str]) -> ClientWrites:
+    """Начинает учет записей клиента в текущем запросе по значению cookie."""
+    try:
+        seen_at = float(cookie) if cookie else None
+    except ValueError:
+        seen_at = None
+    client = ClientWrites(seen_at)
+    _client_writes_var.set(client)
+    return client
+
+
+class ReadYourWrites:
+    """
+    Помнит, кто недавно писал в основную БД: в течение window секунд
+    чтения по этому ключу идут мимо реплик, чтобы не увидеть отставшие данные.
+    Ключи хранятся в памяти процесса, а время последней записи клиента
+    дополнительно уходит ему в cookie (ReadYourWritesMiddleware): так
+    следующий запрос, попавший в другой воркер, тоже читает из основной БД.
+    """
+
+    def __init__(self, window: float):
+        self.window = window
+        self._written_at: dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, *keys: Hashable) -> None:
+        if self.window <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                self._written_at[key] = now
+            if len(self._written_at) > 10_000:
+                self._prune(now)
+        client = _client_writes_var.get()
+        if client is not None:
+            client.written_at = time.time()
+
+    def is_sticky(self, key: Hashable) -> bool:
+        client = _client_writes_var.get()
+        if client is not None and (last_write := client.last_write()) is not None:
+            # Часы воркеров на разных машинах могут немного расходиться.
+            if abs(time.time() - last_write) < self.window:
+                return True
+        written_at = self._written_at.get(key)
+        return written_at is not None and time.monotonic() - written_at < self.window
+
+    def _prune(self, now: float) -> None:
+        self._written_at = {
+            key: written_at
+            for key, written_at in self._written_at.items()
+            if now - written_at < self.window
+        }
+
+
+read_your_writes = ReadYourWrites(
+    settings.DB_READ_YOUR_WRITES_SECONDS if settings.DB_REPLICA_URLS else 0
+)
+
+
+@contextmanager
+def replica_reads(consistency_key: Hashable = None):
+    """
+    Запросы внутри блока можно отправить на реплику, если по
+    consistency_key не было недавней записи. Внутри primary_reads блок
+    ничего не меняет: явный выбор основной БД сильнее.
+    """
+    if _replica_reads_var.get() is False:
+        yield
+        return
+    if consistency_key is not None and read_your_writes.is_sticky(consistency_key):
+        yield
+        return
+    token = _replica_reads_var.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads_var.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """Запросы внутри блока идут в основную БД (чтение ради записи)."""
+    token = _replica_reads_var.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads_var.reset(token)
+
+
+class RoutingSession(Session):
+    """
+    Сессия, отправляющая чтения из блока replica_reads на реплику из
+    info["replicas"], а все остальное — в основную БД. Реплика закрепляется
+    за сессией при первом выборе.
+
+    С info["all_reads_to_replicas"] (реплики без отставания, например читатели
+    того же файла SQLite) на реплику идут все чтения вне транзакции с записью.
+    С info["autocommit"] соединения выдаются в режиме AUTOCOMMIT.
+    """
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kw: Any):
+        bind = self._route(mapper, clause, **kw)
+        if self.info.get("autocommit"):
+            return _autocommit(bind)
+        return bind
+
+    def _route(self, mapper: Any, clause: Any, **kw: Any):
+        replicas: Optional[ReplicaSet] = self.info.get("replicas")
+        if replicas and self._reads_from_replica():
+            replica = self.info.get("replica")
+            if replica is None or not replica.healthy:
+                replica = self.info["replica"] = replicas.choose()
+            if replica is not None:
+                return replica.engine.sync_engine
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def _reads_from_replica(self) -> bool:
+        if self._flushing or self.info.get("writing"):
+            return False
+        replica_reads = _replica_reads_var.get()
+        if replica_reads is not None:
+            return replica_reads
+        return self.info.get("all_reads_to_replicas", False)
+
+
+@functools.cache
+def _autocommit(bind: Engine) -> Engine:
+    # pysqlite и так не открывает транзакцию для SELECT, а переключение
+    # режима стоило бы двух обращений к потоку aiosqlite.
+    if bind.dialect.name == "sqlite":
+        return bind
+    return bind.execution_options(isolation_level="AUTOCOMMIT")
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_writing(session, flush_context) -> None:
+    # Данные, записанные в транзакции, видны только соединению писателя.
+    session.info["writing"] = True
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _unmark_writing(session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop("writing", None)
+
+
+def create_replica_set(engine_factory, extra: Iterable[Replica] = ()) -> ReplicaSet:
+    """Создает реплики из DB_REPLICA_URLS; engine_factory(url) строит движок."""
+    replicas = [
+        Replica(f"replica-{number}", engine_factory(url))
+        for number, url in enumerate(settings.DB_REPLICA_URLS)
+    ]
+    replicas.extend(extra)
+    replica_set = ReplicaSet(
+        replicas, check_interval=settings.DB_REPLICA_CHECK_INTERVAL_SECONDS
+    )
+    registry.gauge(
+        "db_replicas_healthy",
+        "Реплики, доступные для чтения.",
+        callback=replica_set.healthy_count,
+    )
+    return replica_set
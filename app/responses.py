@@ -0,0 +1,147 @@
+import functools
+from operator import attrgetter
+from typing import Any, Generic, Optional, Sequence, TypeVar
+from fastapi import Request, Response
+from pydantic import BaseModel, TypeAdapter
+from app.server_timing import measure
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+JSON = "application/json"
+COLUMNAR_JSON = "application/vnd.columnar+json"
+MSGPACK = "application/msgpack"
+
+RowT = TypeVar("RowT")
+
+
+@functools.cache
+def _adapter(type_: Any) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def json_response(
+    content: Any, type_: Any, status_code: int = 200, exclude_unset: bool = False
+) -> Response:
+    """
+    Готовый JSON-ответ для данных, уже провалидированных в репозитории.
+
+    FastAPI не трогает возвращенный Response: модель не валидируется
+    повторно по response_model и не проходит через jsonable_encoder
+    и json.dumps. Сериализатор pydantic-core пишет сразу байты.
+    response_model в декораторе остается для схемы OpenAPI.
+    С exclude_unset в ответ попадают только заданные поля моделей.
+    """
+    with measure("serialize"):
+        body = _adapter(type_).dump_json(content, exclude_unset=exclude_unset)
+    return Response(body, status_code=status_code, media_type=JSON)
+
+
+def list_media_types() -> list[str]:
+    """Представления списков, которые умеет отдавать сервер; первое — по умолчанию."""
+    media_types = [JSON, COLUMNAR_JSON]
+    if msgpack is not None:
+        media_types.append(MSGPACK)
+    return media_types
+
+
+def negotiate(accept: Optional[str], offered: Sequence[str]) -> str:
+    """
+    Выбирает из offered тип с наибольшим q в заголовке Accept; точное
+    совпадение важнее маски, при равных q побеждает тип, стоящий раньше
+    в offered. Если подходящего нет, возвращает offered[0].
+    """
+    exact: dict[str, float] = {}
+    wildcard = 0.0
+    for part in (accept or "").split(","):
+        media_type, *params = (item.strip() for item in part.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if media_type in ("*/*", "application/*"):
+            wildcard = max(wildcard, quality)
+        elif media_type in offered:
+            exact[media_type] = max(exact.get(media_type, 0.0), quality)
+
+    def quality_of(media_type: str) -> float:
+        return exact.get(media_type, wildcard)
+
+    best = max(offered, key=quality_of)
+    return best if quality_of(best) > 0 else offered[0]
+
+
+class ColumnarList(BaseModel, Generic[RowT]):
+    """
+    Колоночное представление списка: имена колонок один раз, затем строки
+    значений. Колонки, одинаковые во всех строках (например, user_id
+    в списке задач пользователя), вынесены в common.
+    """
+
+    columns: list[str]
+    rows: list[RowT]
+    common: dict[str, Any]
+
+
+def columnar(
+    items: list, columns: Sequence[str], common: Sequence[str] = ()
+) -> ColumnarList:
+    common = [column for column in common if column in columns] if items else []
+    columns = [column for column in columns if column not in common]
+    if len(columns) > 1:
+        rows = list(map(attrgetter(*columns), items))
+    elif columns:
+        rows = [(value,) for value in map(attrgetter(columns[0]), items)]
+    else:
+        rows = [() for _ in items]
+    return ColumnarList.model_construct(
+        columns=columns,
+        rows=rows,
+        common={column: getattr(items[0], column) for column in common},
+    )
+
+
+@functools.cache
+def _columnar_adapter(item_type: type[BaseModel], columns: tuple[str, ...]):
+    # Типизированные строки сериализуются pydantic-core по схеме,
+    # без определения типа каждого значения.
+    row_type = tuple[
+        tuple(item_type.model_fields[column].annotation for column in columns)
+    ]
+    return _adapter(ColumnarList[row_type])
+
+
+def list_response(
+    request: Request,
+    content: list,
+    item_type: Any,
+    columns: Sequence[str],
+    common: Sequence[str] = (),
+    exclude_unset: bool = False,
+) -> Response:
+    """
+    Ответ со списком в представлении, выбранном по заголовку Accept:
+    массив объектов (JSON, по умолчанию), колоночный JSON или msgpack.
+    В колоночных представлениях значения берутся прямо из атрибутов
+    моделей, поэтому попадают в ответ только колонки из columns.
+    """
+    media_type = negotiate(request.headers.get("accept"), list_media_types())
+    if media_type == JSON:
+        response = json_response(content, list[item_type], exclude_unset=exclude_unset)
+    else:
+        with measure("serialize"):
+            payload = columnar(content, columns, common)
+            adapter = _columnar_adapter(item_type, tuple(payload.columns))
+            if media_type == MSGPACK:
+                body = msgpack.packb(adapter.dump_python(payload, mode="json"))
+            else:
+                body = adapter.dump_json(payload)
+        response = Response(body, media_type=media_type)
+    response.headers["Vary"] = "Accept"
+    return response
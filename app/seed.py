@@ -0,0 +1,287 @@
+"""
+Генератор синтетических пользователей и задач для БД из DATABASE_URL.
+
+Пишет данные пачками через Core insert (на PostgreSQL + asyncpg — через COPY),
+откладывает создание вторичных индексов до конца загрузки и печатает
+скорость в строках в секунду. Хэш пароля вычисляется один раз.
+
+    python -m app.seed --users 100000 --tasks 5000000 \\
+        --status-weights created=0.5,in_progress=0.3,completed=0.2
+"""
+
+import argparse
+import asyncio
+import bisect
+import itertools
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Iterator
+from sqlalchemy import Table, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from app.auth.models import UserORM, pwd_context
+from app.config import settings
+from app.task_manager.models import TaskORM
+from app.task_manager.schemas import TaskStatus
+
+_WORDS = (
+    "report review deploy fix update write call plan design test refactor "
+    "prepare send check release migrate document analyze meeting budget "
+    "client server database backup invoice sprint backlog feature bug "
+    "customer draft schedule research optimize monitor"
+).split()
+
+
+@dataclass
+class SeedConfig:
+    users: int
+    tasks: int
+    status_weights: dict[TaskStatus, float] = field(
+        default_factory=lambda: {status: 1.0 for status in TaskStatus}
+    )
+    title_length: tuple[int, int] = (10, 60)
+    description_length: tuple[int, int] = (0, 500)
+    null_description_ratio: float = 0.2
+    batch_size: int = 50_000
+    password: str = "password123"
+    email_prefix: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    random_seed: int | None = None
+
+    def __post_init__(self):
+        _validate_status_weights(self.status_weights)
+
+
+def _validate_status_weights(weights: dict[TaskStatus, float]) -> None:
+    described = ",".join(
+        f"{status.value}={weight:g}" for status, weight in weights.items()
+    )
+    if any(weight < 0 for weight in weights.values()):
+        raise ValueError(f"status weights must be non-negative: {described}")
+    if sum(weights.values()) <= 0:
+        raise ValueError(f"status weights must have a positive sum: {described}")
+
+
+@dataclass
+class SeedReport:
+    users: int
+    tasks: int
+    users_seconds: float
+    tasks_seconds: float
+    index_seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        elapsed = self.users_seconds + self.tasks_seconds
+        return (self.users + self.tasks) / max(elapsed, 1e-9)
+
+
+def _corpus(rng: random.Random, size: int = 1 << 16) -> str:
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def _user_rows(
+    config: SeedConfig, user_ids: list[uuid.UUID], hashed_password: str
+) -> Iterator[tuple]:
+    for number, user_id in enumerate(user_ids):
+        yield (
+            user_id,
+            f"{config.email_prefix}.user{number}@example.com",
+            hashed_password,
+            True,
+        )
+
+
+def _task_rows(
+    config: SeedConfig, user_ids: list[uuid.UUID], rng: random.Random
+) -> Iterator[tuple]:
+    # Тексты — срезы заранее собранного корпуса: генерация по словам
+    # для каждой строки оказывается дороже самой вставки.
+    corpus = _corpus(rng)
+    title_min, title_max = config.title_length
+    description_min, description_max = config.description_length
+    max_offset = len(corpus) - max(title_max, description_max) - 1
+    statuses = list(config.status_weights)
+    cumulative_weights = list(itertools.accumulate(config.status_weights.values()))
+    total_weight = cumulative_weights[-1]
+    for number in range(config.tasks):
+        offset = rng.randrange(max_offset)
+        title = corpus[offset : offset + rng.randint(title_min, title_max)].strip()
+        description = None
+        if rng.random() >= config.null_description_ratio:
+            offset = rng.randrange(max_offset)
+            length = rng.randint(description_min, description_max)
+            description = corpus[offset : offset + length]
+        status = statuses[
+            bisect.bisect(cumulative_weights, rng.random() * total_weight)
+        ]
+        yield (
+            uuid.UUID(int=rng.getrandbits(128), version=4),
+            title.capitalize() or "Task",
+            description,
+            status,
+            user_ids[number % len(user_ids)],
+        )
+
+
+def _batches(rows: Iterator[tuple], size: int) -> Iterator[list[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def _load(conn: AsyncConnection, table: Table, rows: Iterator[tuple], size: int):
+    columns = [column.name for column in table.columns]
+    if conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg":
+        raw = await conn.get_raw_connection()
+        driver = raw.driver_connection
+        for batch in _batches(rows, size):
+            if table is TaskORM.__table__:
+                batch = [(*row[:3], row[3].name, row[4]) for row in batch]
+            await driver.copy_records_to_table(
+                table.name, records=batch, columns=columns
+            )
+        return
+    statement = insert(table)
+    for batch in _batches(rows, size):
+        await conn.execute(statement, [dict(zip(columns, row)) for row in batch])
+
+
+async def seed_database(engine: AsyncEngine, config: SeedConfig) -> SeedReport:
+    """
+    Заполняет существующую схему. Вторичные индексы user и task удаляются
+    перед загрузкой и создаются заново после нее.
+    """
+    rng = random.Random(config.random_seed)
+    hashed_password = pwd_context.hash(config.password)
+    user_ids = [
+        uuid.UUID(int=rng.getrandbits(128), version=4) for _ in range(config.users)
+    ]
+    tables = (UserORM.__table__, TaskORM.__table__)
+    indexes = [index for table in tables for index in table.indexes]
+
+    async with engine.begin() as conn:
+        if conn.dialect.name == "sqlite":
+            await conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        for index in indexes:
+            await conn.run_sync(index.drop, checkfirst=True)
+
+        started_at = time.perf_counter()
+        await _load(
+            conn,
+            UserORM.__table__,
+            _user_rows(config, user_ids, hashed_password),
+            config.batch_size,
+        )
+        users_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        if config.users:
+            await _load(
+                conn,
+                TaskORM.__table__,
+                _task_rows(config, user_ids, rng),
+                config.batch_size,
+            )
+        tasks_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        for index in indexes:
+            await conn.run_sync(index.create, checkfirst=True)
+        index_seconds = time.perf_counter() - started_at
+
+    return SeedReport(
+        users=config.users,
+        tasks=config.tasks if config.users else 0,
+        users_seconds=users_seconds,
+        tasks_seconds=tasks_seconds,
+        index_seconds=index_seconds,
+    )
+
+
+def _parse_range(value: str) -> tuple[int, int]:
+    low, _, high = value.partition(":")
+    low, high = int(low), int(high or low)
+    if low < 0 or high < low:
+        raise argparse.ArgumentTypeError(f"invalid range: {value}")
+    return low, high
+
+
+def _parse_status_weights(value: str) -> dict[TaskStatus, float]:
+    weights = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        try:
+            weights[TaskStatus(name.strip())] = float(weight)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid status weight: {item}")
+    try:
+        _validate_status_weights(weights)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return weights
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--users", type=int, required=True)
+    parser.add_argument("--tasks", type=int, required=True)
+    parser.add_argument(
+        "--status-weights",
+        type=_parse_status_weights,
+        default={status: 1.0 for status in TaskStatus},
+        help="например created=0.5,in_progress=0.3,completed=0.2",
+    )
+    parser.add_argument("--title-length", type=_parse_range, default=(10, 60))
+    parser.add_argument("--description-length", type=_parse_range, default=(0, 500))
+    parser.add_argument("--null-description-ratio", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--password", default="password123")
+    parser.add_argument("--random-seed", type=int, default=None)
+    parser.add_argument("--database-url", default=None)
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace) -> None:
+    engine = create_async_engine(args.database_url or settings.DATABASE_URL)
+    config = SeedConfig(
+        users=args.users,
+        tasks=args.tasks,
+        status_weights=args.status_weights,
+        title_length=args.title_length,
+        description_length=args.description_length,
+        null_description_ratio=args.null_description_ratio,
+        batch_size=args.batch_size,
+        password=args.password,
+        random_seed=args.random_seed,
+    )
+    try:
+        report = await seed_database(engine, config)
+    finally:
+        await engine.dispose()
+    print(
+        f"users: {report.users} in {report.users_seconds:.1f}s "
+        f"({report.users / max(report.users_seconds, 1e-9):,.0f} rows/s)"
+    )
+    print(
+        f"tasks: {report.tasks} in {report.tasks_seconds:.1f}s "
+        f"({report.tasks / max(report.tasks_seconds, 1e-9):,.0f} rows/s)"
+    )
+    print(f"indexes rebuilt in {report.index_seconds:.1f}s")
+    print(f"total: {report.rows_per_second:,.0f} rows/s")
+    print(f"password for all users: {config.password}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
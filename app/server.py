@@ -0,0 +1,76 @@
+"""
+Production-запуск приложения: python -m app.
+
+Поднимает SERVER_WORKERS процессов uvicorn. Каждый воркер импортирует
+приложение заново и создает собственный движок и пул соединений.
+"""
+
+import argparse
+import importlib.util
+import os
+from typing import Any, Optional
+import uvicorn
+from app.config import Settings, settings
+
+APP_IMPORT_STRING = "app.main:app"
+
+
+def detect_loop() -> str:
+    """uvloop, если установлен, иначе стандартный asyncio."""
+    return "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+
+
+def detect_http() -> str:
+    """Парсер httptools, если установлен, иначе h11."""
+    return "httptools" if importlib.util.find_spec("httptools") else "h11"
+
+
+def worker_count(configured: int) -> int:
+    """Число воркеров; 0 — по числу доступных процессу ядер."""
+    if configured > 0:
+        return configured
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def uvicorn_options(
+    settings: Settings,
+    workers: Optional[int] = None,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+) -> dict[str, Any]:
+    """Параметры uvicorn.run по настройкам приложения."""
+    return {
+        "host": host or settings.SERVER_HOST,
+        "port": port or settings.SERVER_PORT,
+        "workers": worker_count(workers or settings.SERVER_WORKERS),
+        "loop": detect_loop(),
+        "http": detect_http(),
+        "backlog": settings.SERVER_BACKLOG,
+        # Дольше idle-таймаута балансировщика, иначе он получает
+        # сброшенные соединения при переиспользовании keep-alive.
+        "timeout_keep_alive": settings.SERVER_KEEP_ALIVE_SECONDS,
+        "limit_concurrency": settings.SERVER_LIMIT_CONCURRENCY,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        "access_log": settings.SERVER_ACCESS_LOG,
+        "proxy_headers": True,
+        "server_header": False,
+    }
+
+
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--log-level", default="info")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    options = uvicorn_options(
+        settings, workers=args.workers, host=args.host, port=args.port
+    )
+    uvicorn.run(APP_IMPORT_STRING, log_level=args.log_level, **options)
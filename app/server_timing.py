@@ -0,0 +1,139 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable
+
+from fastapi import Response
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_server_timing_var: ContextVar["ServerTiming | None"] = ContextVar(
+    "_server_timing_var", default=None
+)
+
+
+class ServerTiming:
+    """Накопитель длительностей фаз обработки одного запроса."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.handler_finished_at: float | None = None
+        self._durations: dict[str, float] = {}
+
+    def add(self, name: str, duration: float) -> None:
+        """Добавляет длительность (в секундах) к фазе с указанным именем."""
+        self._durations[name] = self._durations.get(name, 0.0) + duration
+
+    def duration(self, name: str) -> float:
+        """Накопленная длительность фазы в секундах."""
+        return self._durations.get(name, 0.0)
+
+    def to_header(self) -> str:
+        """Формирует значение заголовка Server-Timing (длительности в мс)."""
+        metrics = [
+            f"{name};dur={duration * 1000:.3f}"
+            for name, duration in self._durations.items()
+        ]
+        total = time.perf_counter() - self.started_at
+        metrics.append(f"total;dur={total * 1000:.3f}")
+        return ", ".join(metrics)
+
+
+def start_server_timing() -> ServerTiming:
+    """Включает сбор фаз для текущего контекста запроса."""
+    timing = ServerTiming()
+    _server_timing_var.set(timing)
+    return timing
+
+
+def get_server_timing() -> ServerTiming | None:
+    """Возвращает накопитель текущего запроса или None, если сбор выключен."""
+    return _server_timing_var.get()
+
+
+@contextmanager
+def measure(name: str):
+    """Измеряет длительность блока и добавляет её к фазе текущего запроса."""
+    timing = _server_timing_var.get()
+    if timing is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - started_at)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _server_timing_var.get() is not None:
+        conn.info.setdefault("server_timing_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _server_timing_var.get()
+    started = conn.info.get("server_timing_started")
+    if timing is not None and started:
+        timing.add("db", time.perf_counter() - started.pop())
+
+
+def instrument_sqlalchemy() -> None:
+    """Подключает измерение фазы "db" ко всем движкам SQLAlchemy."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _timed_endpoint(endpoint: Callable) -> Callable:
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        timing = _server_timing_var.get()
+        if timing is None:
+            return await endpoint(*args, **kwargs)
+        started_at = time.perf_counter()
+        serialized = timing.duration("serialize")
+        response = None
+        try:
+            response = await endpoint(*args, **kwargs)
+            return response
+        finally:
+            finished_at = time.perf_counter()
+            # Готовый Response сериализован в обработчике (json_response
+            # сам пишет фазу "serialize"): она не входит в "handler",
+            # а маршрут не добавляет к ней время рендеринга FastAPI.
+            nested = timing.duration("serialize") - serialized
+            timing.add("handler", finished_at - started_at - nested)
+            if not isinstance(response, Response):
+                timing.handler_finished_at = finished_at
+
+    return wrapper
+
+
+class ServerTimingRoute(APIRoute):
+    """
+    Маршрут, замеряющий фазы "handler" (тело эндпоинта) и "serialize"
+    (валидация response_model, кодирование и рендеринг ответа). Для готового
+    Response фазу "serialize" пишет только json_response/list_response.
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            timing = _server_timing_var.get()
+            if timing is not None and timing.handler_finished_at is not None:
+                timing.add(
+                    "serialize", time.perf_counter() - timing.handler_finished_at
+                )
+            return response
+
+        return timed_handler
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+from app.metrics import registry
+
+singleflight_executions_total = registry.counter(
+    "singleflight_executions",
+    "Выполнения, результат которых разделили одинаковые одновременные вызовы.",
+    labels=("name",),
+)
+singleflight_coalesced_total = registry.counter(
+    "singleflight_coalesced",
+    "Вызовы, получившие результат уже выполняющегося одинакового вызова.",
+    labels=("name",),
+)
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных вызовов: пока выполняется вызов
+    с ключом (group, key), остальные вызовы с тем же ключом ждут и получают
+    его результат или исключение. forget(group) отцепляет выполняющиеся
+    вызовы группы, например после записи: начатые позже вызовы выполнятся
+    заново и увидят новые данные.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: dict[Hashable, dict[Hashable, asyncio.Future]] = {}
+        self._executions = singleflight_executions_total.labels(name=name)
+        self._coalesced = singleflight_coalesced_total.labels(name=name)
+
+    async def do(
+        self, group: Hashable, key: Hashable, call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        while (future := self._calls.get(group, {}).get(key)) is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if future.cancelled():
+                    # Отменили ведущий вызов (клиент ушел), а не этот:
+                    # выполняем сами.
+                    continue
+                raise
+            self._coalesced.inc()
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls.setdefault(group, {})[key] = future
+        self._executions.inc()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Исключение уже передано вызывающему; ожидающих может не быть.
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            current = self._calls.get(group)
+            if current is not None and current.get(key) is future:
+                del current[key]
+                if not current:
+                    del self._calls[group]
+
+    def forget(self, group: Hashable) -> None:
+        self._calls.pop(group, None)
@@ -0,0 +1,233 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Request
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+from app.metrics import registry
+
+# Число инструкций виртуальной машины SQLite между проверками прерывания.
+SQLITE_PROGRESS_STEPS = 10_000
+PG_QUERY_CANCELED = "57014"
+
+statement_timeouts_total = registry.counter(
+    "db_statement_timeouts",
+    "Выражения БД, прерванные по таймауту.",
+)
+statements_cancelled_total = registry.counter(
+    "db_statements_cancelled",
+    "Выражения БД, прерванные из-за отключения клиента.",
+)
+statements_cancelled_externally_total = registry.counter(
+    "db_statements_cancelled_externally",
+    "Выражения PostgreSQL, отмененные сервером не по таймауту запроса.",
+)
+
+
+class StatementTimeoutError(Exception):
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        super().__init__(f"Database statement timed out after {timeout:g} s.")
+
+
+class StatementScope:
+    """
+    Выражения БД одного запроса: таймаут каждого выражения в секундах
+    (None — без ограничения) и флаг отмены после отключения клиента.
+    """
+
+    def __init__(self, timeout: Optional[float]):
+        self.timeout = timeout
+        self.cancelled = False
+
+    def cancel(self) -> None:
+        self.cancelled = True
+
+
+_scope_var: ContextVar[Optional[StatementScope]] = ContextVar(
+    "_statement_scope_var", default=None
+)
+
+
+def _default_timeout() -> Optional[float]:
+    return settings.DB_STATEMENT_TIMEOUT_MS / 1000 or None
+
+
+def start_statement_scope() -> StatementScope:
+    """Начинает область выражений текущего запроса с таймаутом по умолчанию."""
+    scope = StatementScope(_default_timeout())
+    _scope_var.set(scope)
+    return scope
+
+
+def set_statement_timeout(timeout: Optional[float]) -> None:
+    """Задает таймаут выражений БД до конца текущего запроса."""
+    scope = _scope_var.get()
+    if scope is None:
+        _scope_var.set(StatementScope(timeout))
+    else:
+        scope.timeout = timeout
+
+
+async def route_statement_timeout(request: Request) -> None:
+    """
+    Зависимость роутера: таймаут выражений маршрута из
+    DB_ROUTE_STATEMENT_TIMEOUT_MS (по имени эндпоинта).
+    """
+    timeout_ms = settings.DB_ROUTE_STATEMENT_TIMEOUT_MS.get(request.scope["route"].name)
+    if timeout_ms is not None:
+        set_statement_timeout(timeout_ms / 1000 or None)
+
+
+def _current_timeout() -> Optional[float]:
+    scope = _scope_var.get()
+    return scope.timeout if scope is not None else _default_timeout()
+
+
+class _SQLiteGuard:
+    """
+    Состояние progress handler соединения SQLite. Обработчик вызывается
+    в потоке aiosqlite и прерывает выражение после дедлайна или отмены.
+    """
+
+    def __init__(self):
+        self.deadline = float("inf")
+        self.scope: Optional[StatementScope] = None
+        self.timeout: Optional[float] = None
+        self.timed_out = False
+
+    def start(self, scope: Optional[StatementScope], timeout: Optional[float]) -> None:
+        self.scope = scope
+        self.timeout = timeout
+        self.timed_out = False
+        self.deadline = time.monotonic() + timeout if timeout else float("inf")
+
+    def finish(self) -> None:
+        self.scope = None
+        self.deadline = float("inf")
+
+    def check(self) -> int:
+        scope = self.scope
+        if scope is not None and scope.cancelled:
+            statements_cancelled_total.inc()
+        elif time.monotonic() > self.deadline:
+            self.timed_out = True
+        else:
+            return 0
+        # Прерывание завершает выражение целиком: следующие выражения
+        # соединения (например, откат) прерывать не нужно.
+        self.finish()
+        return 1
+
+
+def _install_sqlite(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def install_progress_handler(dbapi_connection, connection_record):
+        guard = connection_record.info["statement_guard"] = _SQLiteGuard()
+        dbapi_connection.await_(
+            dbapi_connection.driver_connection.set_progress_handler(
+                guard.check, SQLITE_PROGRESS_STEPS
+            )
+        )
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def start(conn, cursor, statement, parameters, context, executemany):
+        guard = conn.info.get("statement_guard")
+        if guard is not None:
+            guard.start(_scope_var.get(), _current_timeout())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def finish(conn, cursor, statement, parameters, context, executemany):
+        guard = conn.info.get("statement_guard")
+        if guard is not None:
+            guard.finish()
+
+    @event.listens_for(engine.sync_engine, "reset")
+    def reset(dbapi_connection, connection_record, reset_state):
+        guard = connection_record.info.get("statement_guard")
+        if guard is not None:
+            guard.finish()
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def translate(context):
+        if context.connection is None:
+            return
+        guard = context.connection.info.get("statement_guard")
+        if guard is None or not isinstance(context.original_exception, Exception):
+            # При отмене задачи выражение еще выполняется в потоке aiosqlite:
+            # его прервет progress handler по флагу отмены или дедлайну.
+            return
+        timed_out, timeout = guard.timed_out, guard.timeout
+        guard.finish()
+        if timed_out:
+            statement_timeouts_total.inc()
+            raise StatementTimeoutError(timeout) from context.original_exception
+
+
+def _set_statement_timeout_sql(timeout_ms: int) -> str:
+    return f"SET statement_timeout = {timeout_ms}"
+
+
+def _install_postgresql(engine: AsyncEngine) -> None:
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def set_timeout(conn, cursor, statement, parameters, context, executemany):
+        timeout = _current_timeout()
+        timeout_ms = int(timeout * 1000) if timeout else 0
+        conn.info["statement_started"] = time.monotonic()
+        if conn.info.get("statement_timeout_ms") == timeout_ms:
+            return
+        set_cursor = conn.connection.cursor()
+        set_cursor.execute(_set_statement_timeout_sql(timeout_ms))
+        set_cursor.close()
+        conn.info["statement_timeout_ms"] = timeout_ms
+        # SET в транзакции отменяется ее откатом: до commit значение
+        # в кэше предварительное.
+        conn.info["statement_timeout_uncommitted"] = True
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def keep_timeout(conn):
+        conn.info.pop("statement_timeout_uncommitted", None)
+
+    @event.listens_for(engine.sync_engine, "rollback")
+    def forget_timeout(conn):
+        if conn.info.pop("statement_timeout_uncommitted", None):
+            conn.info.pop("statement_timeout_ms", None)
+
+    @event.listens_for(engine.sync_engine, "reset")
+    def forget_timeout_on_reset(dbapi_connection, connection_record, reset_state):
+        if connection_record.info.pop("statement_timeout_uncommitted", None):
+            connection_record.info.pop("statement_timeout_ms", None)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def translate(context):
+        original = context.original_exception
+        if getattr(original, "sqlstate", None) != PG_QUERY_CANCELED:
+            return
+        # 57014 означает и истекший statement_timeout, и отмену запроса
+        # (клиент ушел, pg_cancel_backend): таймаутом считается только
+        # выражение, которое выполнялось дольше установленного дедлайна.
+        scope = _scope_var.get()
+        if scope is not None and scope.cancelled:
+            statements_cancelled_total.inc()
+            return
+        info = context.connection.info if context.connection is not None else {}
+        timeout_ms = info.get("statement_timeout_ms")
+        started = info.get("statement_started")
+        if timeout_ms and started is not None:
+            if (time.monotonic() - started) * 1000 >= timeout_ms:
+                statement_timeouts_total.inc()
+                raise StatementTimeoutError(timeout_ms / 1000) from original
+        statements_cancelled_externally_total.inc()
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """
+    Подключает к движку таймауты выражений: progress handler для SQLite,
+    statement_timeout для PostgreSQL. Ошибка таймаута заменяется на
+    StatementTimeoutError.
+    """
+    if engine.dialect.name == "sqlite":
+        _install_sqlite(engine)
+    elif engine.dialect.name == "postgresql":
+        _install_postgresql(engine)
@@ -2,6 +2,7 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db_session
+from app.unit_of_work import UnitOfWorkDep
 from .repository import TaskSQLAlchemyRepository
 from .service import TaskService
 
@@ -17,9 +18,9 @@ DBSession = Annotated[AsyncSession, Depends(get_db_session)]
 TaskRepositoryDep = Annotated[TaskSQLAlchemyRepository, Depends(get_task_repository)]
 
 
-def get_task_service(repo: TaskRepositoryDep) -> TaskService:
+def get_task_service(repo: TaskRepositoryDep, uow: UnitOfWorkDep) -> TaskService:
     """Зависимость, которая создает и предоставляет TaskService."""
-    return TaskService(repo)
+    return TaskService(repo, uow)
 
 
 TaskServiceDep = Annotated[TaskService, Depends(get_task_service)]
@@ -1,24 +1,85 @@
+import functools
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import List, Optional
-from sqlalchemy import select
+from typing import Collection, List, Optional, Union
+from pydantic import TypeAdapter
+from sqlalchemy import Text, bindparam, case, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from .models import TaskORM
-from .schemas import Task, TaskCreate, TaskUpdate
+from .schemas import TASK_FIELDS, Task, TaskCreate, TaskFields, TaskUpdate
 from .exceptions import TaskNotFoundError
+from app.config import settings
+from app.replication import read_your_writes, replica_reads
+from app.server_timing import measure
+from app.tracing import trace_methods
+
+
+def _truncated(column, length: int):
+    """Первые length символов колонки; "…" в конце отмечает обрезанный текст."""
+    return case(
+        (
+            func.length(column) > length,
+            func.substr(column, 1, length, type_=Text).concat("…"),
+        ),
+        else_=column,
+    ).label(column.key)
+
+
+# Запросы собраны один раз: ключ кэша компиляции у неизменяемой конструкции
+# вычисляется однократно, а не при каждом вызове. Список читается кортежами
+# колонок, без объектов TaskORM, identity map и отслеживания состояния,
+# которые здесь сразу выбрасывались бы. Длинные описания обрезаются в SQL.
+_select_user_tasks = select(
+    TaskORM.task_id,
+    TaskORM.title,
+    _truncated(TaskORM.description, settings.TASK_LIST_DESCRIPTION_LENGTH),
+    TaskORM.status,
+    TaskORM.user_id,
+).where(TaskORM.user_id == bindparam("user_id"))
+_select_user_task = select(TaskORM).where(
+    TaskORM.task_id == bindparam("task_id"),
+    TaskORM.user_id == bindparam("user_id"),
+)
+# Пакетная валидация словарей в pydantic-core быстрее, чем
+# Task.model_construct по одной строке.
+_tasks_adapter = TypeAdapter(list[Task])
+_task_fields_adapter = TypeAdapter(list[TaskFields])
+
+
+@functools.cache
+def _select_task_fields(fields: tuple[str, ...], by_id: bool = False):
+    """Запрос только колонок fields; собирается один раз на набор полей."""
+    statement = select(*(getattr(TaskORM, field) for field in fields)).where(
+        TaskORM.user_id == bindparam("user_id")
+    )
+    if by_id:
+        statement = statement.where(TaskORM.task_id == bindparam("task_id"))
+    return statement
+
+
+def _known_fields(fields: Collection[str]) -> tuple[str, ...]:
+    return tuple(field for field in TASK_FIELDS if field in fields)
 
 
 class AbstractTaskRepository(ABC):
     """Репозиторий для работы с задачами."""
 
     @abstractmethod
-    async def get_all(self, user_id: UUID) -> List[Task]:
-        """Получить все задачи пользователя."""
+    async def get_all(
+        self, user_id: UUID, fields: Optional[Collection[str]] = None
+    ) -> Union[List[Task], List[TaskFields]]:
+        """
+        Получить все задачи пользователя. Без fields описание обрезается
+        до TASK_LIST_DESCRIPTION_LENGTH символов, с fields читаются только
+        перечисленные поля (описание — целиком).
+        """
         pass
 
     @abstractmethod
-    async def get_by_id(self, task_id: UUID, user_id: UUID) -> Optional[Task]:
-        """Получить задачу по ID."""
+    async def get_by_id(
+        self, task_id: UUID, user_id: UUID, fields: Optional[Collection[str]] = None
+    ) -> Union[Task, TaskFields]:
+        """Получить задачу по ID (с fields — только перечисленные поля)."""
         pass
 
     @abstractmethod
@@ -39,56 +100,86 @@ class AbstractTaskRepository(ABC):
         pass
 
 
+@trace_methods
 class TaskSQLAlchemyRepository(AbstractTaskRepository):
     """Репозиторий для работы с задачами, использующий SQLAlchemy."""
 
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def get_all(self, user_id: UUID) -> List[Task]:
+    async def get_all(
+        self, user_id: UUID, fields: Optional[Collection[str]] = None
+    ) -> Union[List[Task], List[TaskFields]]:
+        if fields is None:
+            statement, adapter = _select_user_tasks, _tasks_adapter
+        else:
+            statement = _select_task_fields(_known_fields(fields))
+            adapter = _task_fields_adapter
+        with replica_reads(user_id):
+            result = await self.session.execute(statement, {"user_id": user_id})
+        keys = tuple(result.keys())
+        with measure("validate"):
+            return adapter.validate_python([dict(zip(keys, row)) for row in result])
+
+    async def _get_orm(self, task_id: UUID, user_id: UUID) -> TaskORM:
         result = await self.session.execute(
-            select(TaskORM).where(TaskORM.user_id == user_id)
-        )
-        tasks = result.scalars().all()
-        return [Task.model_validate(task) for task in tasks]
-
-    async def get_by_id(self, task_id: UUID, user_id: UUID) -> Optional[Task]:
-        result = await self.session.execute(
-            select(TaskORM).where(
-                TaskORM.task_id == task_id,
-                TaskORM.user_id == user_id,
-            )
+            _select_user_task, {"task_id": task_id, "user_id": user_id}
         )
         task_orm = result.scalar_one_or_none()
         if task_orm is None:
             raise TaskNotFoundError(task_id)
-        return Task.model_validate(task_orm) if task_orm else None
+        return task_orm
+
+    async def get_by_id(
+        self, task_id: UUID, user_id: UUID, fields: Optional[Collection[str]] = None
+    ) -> Union[Task, TaskFields]:
+        if fields is not None:
+            return await self._get_fields(task_id, user_id, _known_fields(fields))
+        with replica_reads(user_id):
+            task_orm = await self._get_orm(task_id=task_id, user_id=user_id)
+        with measure("validate"):
+            return Task.model_validate(task_orm)
+
+    async def _get_fields(
+        self, task_id: UUID, user_id: UUID, fields: tuple[str, ...]
+    ) -> TaskFields:
+        with replica_reads(user_id):
+            result = await self.session.execute(
+                _select_task_fields(fields, by_id=True),
+                {"task_id": task_id, "user_id": user_id},
+            )
+        row = result.first()
+        if row is None:
+            raise TaskNotFoundError(task_id)
+        with measure("validate"):
+            return TaskFields.model_validate(dict(zip(result.keys(), row)))
 
     async def create(self, task_data: TaskCreate, user_id: UUID) -> Task:
         task_orm = TaskORM(**task_data.model_dump(), user_id=user_id)
         self.session.add(task_orm)
-        await self.session.commit()
-        await self.session.refresh(task_orm)
-        return Task.model_validate(task_orm)
+        await self.session.flush()
+        read_your_writes.mark(user_id)
+        with measure("validate"):
+            return Task.model_validate(task_orm)
 
     async def update(
         self, task_id: UUID, user_id: UUID, update_data: TaskUpdate
     ) -> Task:
-        task_orm = await self.get_by_id(task_id=task_id, user_id=user_id)
-        if not task_orm:
-            raise TaskNotFoundError(task_id)
+        task_orm = await self._get_orm(task_id=task_id, user_id=user_id)
 
         update_dict = update_data.model_dump(exclude_unset=True)
         for key, value in update_dict.items():
             setattr(task_orm, key, value)
 
-        await self.session.commit()
-        await self.session.refresh(task_orm)
-        return Task.model_validate(task_orm)
+        await self.session.flush()
+        read_your_writes.mark(user_id)
+        with measure("validate"):
+            return Task.model_validate(task_orm)
 
     async def delete(self, task_id: UUID, user_id: UUID) -> None:
         task_orm = await self.session.get(TaskORM, task_id)
         if not task_orm or task_orm.user_id != user_id:
             raise TaskNotFoundError(task_id)
         await self.session.delete(task_orm)
-        await self.session.commit()
+        await self.session.flush()
+        read_your_writes.mark(user_id)
@@ -30,3 +30,16 @@ class Task(TaskBase):
     task_id: UUID
     user_id: UUID
     model_config = ConfigDict(from_attributes=True)
+
+
+TASK_FIELDS = tuple(Task.model_fields)
+
+
+class TaskFields(BaseModel):
+    """Задача с подмножеством полей (параметр fields); в ответ попадают только заданные."""
+
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    task_id: Optional[UUID] = None
+    user_id: Optional[UUID] = None
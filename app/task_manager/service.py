@@ -1,23 +1,39 @@
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import List
+from typing import Collection, List, Optional, Union
 from .repository import AbstractTaskRepository
-from .schemas import TaskCreate, TaskUpdate, Task
+from .schemas import TaskCreate, TaskFields, TaskUpdate, Task
+from app.singleflight import SingleFlight
+from app.tracing import trace_methods
+from app.unit_of_work import AbstractUnitOfWork, NullUnitOfWork
+
+# Одинаковые одновременные запросы списка задач пользователя (несколько
+# вкладок и устройств) разделяют один запрос к БД.
+task_lists = SingleFlight("task_list")
 
 
 class AbstractTaskService(ABC):
     """Абстрактный базовый класс для сервиса задач."""
 
-    def __init__(self, repository: AbstractTaskRepository):
+    def __init__(
+        self,
+        repository: AbstractTaskRepository,
+        uow: Optional[AbstractUnitOfWork] = None,
+    ):
         self.repository = repository
+        self.uow = uow or NullUnitOfWork()
 
     @abstractmethod
-    async def get_all_tasks(self, user_id: UUID) -> List[Task]:
+    async def get_all_tasks(
+        self, user_id: UUID, fields: Optional[Collection[str]] = None
+    ) -> Union[List[Task], List[TaskFields]]:
         """Получить все задачи пользователя."""
         pass
 
     @abstractmethod
-    async def get_task_by_id(self, task_id: UUID, user_id: UUID) -> Task:
+    async def get_task_by_id(
+        self, task_id: UUID, user_id: UUID, fields: Optional[Collection[str]] = None
+    ) -> Union[Task, TaskFields]:
         """Получить задачу по ID."""
         pass
 
@@ -39,20 +55,41 @@ class AbstractTaskService(ABC):
         pass
 
 
+@trace_methods
 class TaskService(AbstractTaskService):
-    async def get_all_tasks(self, user_id: UUID) -> List[Task]:
-        return await self.repository.get_all(user_id=user_id)
+    async def get_all_tasks(
+        self, user_id: UUID, fields: Optional[Collection[str]] = None
+    ) -> Union[List[Task], List[TaskFields]]:
+        async def load():
+            async with self.uow.read_only():
+                return await self.repository.get_all(user_id=user_id, fields=fields)
+
+        key = tuple(fields) if fields is not None else None
+        return await task_lists.do(user_id, key, load)
 
-    async def get_task_by_id(self, task_id: UUID, user_id: UUID) -> Task:
-        return await self.repository.get_by_id(task_id=task_id, user_id=user_id)
+    async def get_task_by_id(
+        self, task_id: UUID, user_id: UUID, fields: Optional[Collection[str]] = None
+    ) -> Union[Task, TaskFields]:
+        async with self.uow.read_only():
+            return await self.repository.get_by_id(
+                task_id=task_id, user_id=user_id, fields=fields
+            )
 
     async def create_task(self, task_data: TaskCreate, user_id: UUID) -> Task:
-        return await self.repository.create(task_data, user_id=user_id)
+        async with self.uow:
+            task = await self.repository.create(task_data, user_id=user_id)
+        task_lists.forget(user_id)
+        return task
 
     async def update_task(
         self, task_id: UUID, update_data: TaskUpdate, user_id: UUID
     ) -> Task:
-        return await self.repository.update(task_id, user_id, update_data)
+        async with self.uow:
+            task = await self.repository.update(task_id, user_id, update_data)
+        task_lists.forget(user_id)
+        return task
 
     async def delete_task(self, task_id: UUID, user_id: UUID) -> None:
-        await self.repository.delete(task_id=task_id, user_id=user_id)
+        async with self.uow:
+            await self.repository.delete(task_id=task_id, user_id=user_id)
+        task_lists.forget(user_id)
@@ -0,0 +1,391 @@
+import asyncio
+import importlib
+import json
+import os
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.config import Settings, settings
+from app.logging_config import logger
+
+_TRACEPARENT_RE = re.compile(
+    r"^(?P<version>[0-9a-f]{2})-(?P<trace_id>[0-9a-f]{32})-"
+    r"(?P<span_id>[0-9a-f]{16})-(?P<flags>[0-9a-f]{2})$"
+)
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_current_span_var: ContextVar[Optional["Span"]] = ContextVar(
+    "_current_span_var", default=None
+)
+
+
+@dataclass
+class SpanContext:
+    """Идентификаторы трассы из заголовка traceparent (W3C Trace Context)."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+    @classmethod
+    def from_traceparent(cls, header: Optional[str]) -> Optional["SpanContext"]:
+        """Разбирает traceparent; для некорректного заголовка возвращает None."""
+        if not header:
+            return None
+        match = _TRACEPARENT_RE.match(header.strip().lower())
+        if match is None or match["version"] == "ff":
+            return None
+        if match["trace_id"] == _INVALID_TRACE_ID:
+            return None
+        if match["span_id"] == _INVALID_SPAN_ID:
+            return None
+        return cls(
+            trace_id=match["trace_id"],
+            span_id=match["span_id"],
+            sampled=bool(int(match["flags"], 16) & 0x01),
+        )
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+@dataclass
+class Span:
+    """Интервал трассы с атрибутами."""
+
+    name: str
+    context: SpanContext
+    parent_span_id: Optional[str] = None
+    kind: int = SPAN_KIND_INTERNAL
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_time_ns: int = field(default_factory=time.time_ns)
+    end_time_ns: Optional[int] = None
+    status_code: int = STATUS_UNSET
+    status_message: str = ""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, exc: BaseException) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(exc).__name__}: {exc}"
+
+    def to_otlp(self) -> dict:
+        """Представление спана в формате OTLP/JSON."""
+        span = {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        return span
+
+
+def _otlp_value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class SpanExporter(ABC):
+    """Точка расширения: получатель завершенных спанов."""
+
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """
+    Пишет спаны в файл JSON Lines: одна строка — один
+    ExportTraceServiceRequest в OTLP/JSON (как file exporter OTel Collector).
+    """
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.resource = {
+            "attributes": [
+                {"key": "service.name", "value": {"stringValue": service_name}}
+            ]
+        }
+
+    def export(self, spans: list[Span]) -> None:
+        request = {
+            "resourceSpans": [
+                {
+                    "resource": self.resource,
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [span.to_otlp() for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        with open(self.path, "a", encoding="utf-8") as output:
+            output.write(json.dumps(request, separators=(",", ":")) + "\n")
+
+
+class BatchSpanProcessor:
+    """
+    Копит завершенные спаны в ограниченной очереди и выгружает их пачками
+    из фонового потока. При переполнении новые спаны отбрасываются.
+    """
+
+    def __init__(
+        self,
+        exporter: SpanExporter,
+        max_batch_size: int = 512,
+        max_queue_size: int = 2048,
+        export_interval: float = 5.0,
+    ):
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.max_queue_size = max_queue_size
+        self.export_interval = export_interval
+        self.dropped_spans = 0
+        self._queue: deque[Span] = deque()
+        self._flush_requested = threading.Event()
+        self._stopped = threading.Event()
+        self._export_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def on_end(self, span: Span) -> None:
+        if len(self._queue) >= self.max_queue_size:
+            self.dropped_spans += 1
+            return
+        self._queue.append(span)
+        if len(self._queue) >= self.max_batch_size:
+            self._flush_requested.set()
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="span-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+        self._flush_requested.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.force_flush()
+        self.exporter.shutdown()
+
+    def force_flush(self) -> None:
+        """Синхронно выгружает все накопленные спаны."""
+        with self._export_lock:
+            while self._queue:
+                batch = []
+                while self._queue and len(batch) < self.max_batch_size:
+                    batch.append(self._queue.popleft())
+                try:
+                    self.exporter.export(batch)
+                except Exception:
+                    logger.exception("Failed to export %d spans", len(batch))
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._flush_requested.wait(self.export_interval)
+            self._flush_requested.clear()
+            self.force_flush()
+
+
+class Tracer:
+    """Создает спаны с head-based семплированием в корне трассы."""
+
+    def __init__(self, processor: Optional[BatchSpanProcessor], sample_ratio: float):
+        self.processor = processor
+        self.sample_ratio = sample_ratio
+
+    def _should_sample(self, trace_id: str) -> bool:
+        bound = int(self.sample_ratio * (1 << 64))
+        return int(trace_id[16:], 16) < bound
+
+    def start_server_span(self, name: str, traceparent: Optional[str]) -> Span:
+        """
+        Начинает корневой спан запроса. Решение о семплировании берется из
+        входящего traceparent, а при его отсутствии — по доле sample_ratio.
+        """
+        parent = SpanContext.from_traceparent(traceparent)
+        if parent is not None:
+            trace_id, sampled = parent.trace_id, parent.sampled
+        else:
+            trace_id = os.urandom(16).hex()
+            sampled = self._should_sample(trace_id)
+        return Span(
+            name=name,
+            context=SpanContext(trace_id, os.urandom(8).hex(), sampled),
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=SPAN_KIND_SERVER,
+        )
+
+    def start_child_span(
+        self, name: str, parent: Span, kind: int = SPAN_KIND_INTERNAL
+    ) -> Span:
+        return Span(
+            name=name,
+            context=SpanContext(
+                parent.context.trace_id, os.urandom(8).hex(), parent.context.sampled
+            ),
+            parent_span_id=parent.context.span_id,
+            kind=kind,
+        )
+
+    def end_span(self, span: Span) -> None:
+        span.end_time_ns = time.time_ns()
+        if span.context.sampled and self.processor is not None:
+            self.processor.on_end(span)
+
+
+def _create_exporter(settings: Settings) -> SpanExporter:
+    if settings.TRACING_EXPORTER:
+        module_name, _, attr = settings.TRACING_EXPORTER.partition(":")
+        factory = getattr(importlib.import_module(module_name), attr)
+        return factory()
+    return JsonLinesSpanExporter(
+        settings.TRACING_EXPORT_PATH, service_name=settings.TRACING_SERVICE_NAME
+    )
+
+
+def create_tracer(settings: Settings) -> Tracer:
+    """Создает трассировщик по настройкам приложения."""
+    processor = None
+    if settings.TRACING_ENABLED:
+        processor = BatchSpanProcessor(
+            _create_exporter(settings),
+            max_batch_size=settings.TRACING_BATCH_SIZE,
+            max_queue_size=settings.TRACING_MAX_QUEUE_SIZE,
+            export_interval=settings.TRACING_EXPORT_INTERVAL_SECONDS,
+        )
+    return Tracer(processor, sample_ratio=settings.TRACING_SAMPLE_RATIO)
+
+
+def get_current_span() -> Optional[Span]:
+    return _current_span_var.get()
+
+
+@contextmanager
+def use_span(span: Span):
+    """Делает спан текущим и завершает его на выходе."""
+    token = _current_span_var.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.record_error(e)
+        raise
+    finally:
+        _current_span_var.reset(token)
+        tracer.end_span(span)
+
+
+@contextmanager
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL):
+    """Дочерний спан текущего; вне семплированной трассы ничего не делает."""
+    parent = _current_span_var.get()
+    if parent is None or not parent.context.sampled:
+        yield None
+        return
+    with use_span(tracer.start_child_span(name, parent, kind)) as span:
+        yield span
+
+
+def trace_methods(cls):
+    """
+    Декоратор класса: оборачивает публичные корутины класса в спаны
+    с именем "<Класс>.<метод>".
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not asyncio.iscoroutinefunction(method):
+            continue
+        setattr(cls, name, _traced(f"{cls.__name__}.{name}", method))
+    return cls
+
+
+def _traced(span_name: str, method):
+    @wraps(method)
+    async def wrapper(*args, **kwargs):
+        parent = _current_span_var.get()
+        if parent is None or not parent.context.sampled:
+            return await method(*args, **kwargs)
+        with start_span(span_name):
+            return await method(*args, **kwargs)
+
+    return wrapper
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = _current_span_var.get()
+    if parent is None or not parent.context.sampled:
+        return
+    span = tracer.start_child_span(
+        f"SQL {statement.split(None, 1)[0].upper()}", parent, SPAN_KIND_CLIENT
+    )
+    span.set_attribute("db.system", conn.dialect.name)
+    span.set_attribute("db.statement", statement[:1000])
+    conn.info.setdefault("tracing_spans", []).append(span)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    spans = conn.info.get("tracing_spans")
+    if spans:
+        tracer.end_span(spans.pop())
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    spans = connection.info.get("tracing_spans") if connection is not None else None
+    if spans:
+        span = spans.pop()
+        span.record_error(exception_context.original_exception)
+        tracer.end_span(span)
+
+
+def instrument_sqlalchemy() -> None:
+    """Подключает спаны SQL-запросов ко всем движкам SQLAlchemy."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+tracer = create_tracer(settings)
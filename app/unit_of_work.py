@@ -0,0 +1,117 @@
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Annotated
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db_session
+
+
+class AbstractUnitOfWork(ABC):
+    """
+    Граница транзакции сервисной операции: изменения фиксируются одним
+    commit при выходе из блока async with и откатываются при исключении.
+    Вложенные блоки входят во внешнюю транзакцию.
+    """
+
+    def __init__(self):
+        self._depth = 0
+
+    async def __aenter__(self) -> "AbstractUnitOfWork":
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback) -> None:
+        self._depth -= 1
+        if self._depth:
+            return
+        if exc_type is None:
+            await self.commit()
+        else:
+            await self.rollback()
+
+    @asynccontextmanager
+    async def read_only(self):
+        """Блок только для чтения: без BEGIN/COMMIT, если БД это позволяет."""
+        if self._depth:
+            yield self
+            return
+        self._depth += 1
+        self._begin_read_only()
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            await self._end_read_only()
+
+    @abstractmethod
+    async def commit(self) -> None:
+        pass
+
+    @abstractmethod
+    async def rollback(self) -> None:
+        pass
+
+    def _begin_read_only(self) -> None:
+        pass
+
+    async def _end_read_only(self) -> None:
+        pass
+
+
+class NullUnitOfWork(AbstractUnitOfWork):
+    """UoW без транзакции: границы задает вызывающий код (например, тесты)."""
+
+    async def commit(self) -> None:
+        pass
+
+    async def rollback(self) -> None:
+        pass
+
+
+class SQLAlchemyUnitOfWork(AbstractUnitOfWork):
+    """UoW поверх сессии запроса; репозитории этой сессии только делают flush."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__()
+        self.session = session
+
+    async def __aenter__(self) -> "SQLAlchemyUnitOfWork":
+        if not self._depth:
+            # Все выражения записи, включая чтение перед изменением, идут
+            # в основную БД: транзакцией владеет ее соединение, а реплика
+            # (или читатель SQLite) может не видеть последних данных.
+            self.session.info["writing"] = True
+        await super().__aenter__()
+        return self
+
+    async def commit(self) -> None:
+        try:
+            await self.session.commit()
+        finally:
+            self.session.info.pop("writing", None)
+
+    async def rollback(self) -> None:
+        try:
+            await self.session.rollback()
+        finally:
+            self.session.info.pop("writing", None)
+
+    def _begin_read_only(self) -> None:
+        # RoutingSession выдает для таких запросов соединения в режиме AUTOCOMMIT.
+        self.session.info["autocommit"] = True
+
+    async def _end_read_only(self) -> None:
+        self.session.info.pop("autocommit", None)
+        # Завершает транзакцию сессии и возвращает соединение в пул;
+        # в AUTOCOMMIT на сервер при этом ничего не отправляется.
+        await self.session.commit()
+
+
+def get_unit_of_work(
+    session: Annotated[AsyncSession, Depends(get_db_session)],
+) -> SQLAlchemyUnitOfWork:
+    """Зависимость: UoW над сессией текущего запроса."""
+    return SQLAlchemyUnitOfWork(session)
+
+
+UnitOfWorkDep = Annotated[SQLAlchemyUnitOfWork, Depends(get_unit_of_work)]
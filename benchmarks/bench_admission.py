@@ -0,0 +1,143 @@
+"""
+Полезная пропускная способность при перегрузке с допуском запросов и без него.
+
+Поверх AdmissionControlMiddleware запускается модельный обработчик:
+не больше --capacity одновременных «запросов к БД» по --service-ms
+каждый (как пул соединений). Клиенты приходят с постоянной частотой
+--rps выше емкости и ждут ответа не дольше --client-timeout-ms; брошенный
+клиентом запрос сервер все равно доделывает. Печатает долю ответов,
+успевших к клиенту, 503, таймауты и задержки успешных ответов.
+
+    python -m benchmarks.bench_admission --rps 400 --capacity 10 --service-ms 50
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from benchmarks.common import LatencyStats, configure_environment, write_json
+
+
+def _backend(capacity: int, service_time: float):
+    slots = asyncio.Semaphore(capacity)
+
+    async def app(scope, receive, send):
+        async with slots:
+            await asyncio.sleep(service_time)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app
+
+
+async def _request(app) -> int:
+    status = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {"type": "http", "method": "GET", "path": "/tasks/", "headers": []}
+    await app(scope, receive, send)
+    return status
+
+
+async def _run(app, args: argparse.Namespace) -> dict:
+    latencies, rejected, timed_out = [], 0, 0
+    client_timeout = args.client_timeout_ms / 1000
+
+    async def client():
+        nonlocal rejected, timed_out
+        started_at = time.perf_counter()
+        server = asyncio.ensure_future(_request(app))
+        done, _ = await asyncio.wait({server}, timeout=client_timeout)
+        if not done:
+            timed_out += 1
+        elif server.result() == 503:
+            rejected += 1
+        else:
+            latencies.append(time.perf_counter() - started_at)
+        await asyncio.gather(server)
+
+    clients = []
+    interval = 1 / args.rps
+    started_at = time.perf_counter()
+    for index in range(int(args.rps * args.duration)):
+        delay = started_at + index * interval - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        clients.append(asyncio.create_task(client()))
+    await asyncio.gather(*clients)
+    total = len(clients)
+    return {
+        "requests": total,
+        "ok": len(latencies),
+        "goodput_rps": round(len(latencies) / args.duration, 1),
+        "rejected": rejected,
+        "timed_out": timed_out,
+        "latency": LatencyStats.from_seconds(latencies).to_dict(),
+    }
+
+
+def main(args: argparse.Namespace) -> int:
+    from app.admission import AdmissionControl, AdmissionController, AIMDLimit
+    from app.config import settings
+    from app.middleware import AdmissionControlMiddleware
+
+    controller = AdmissionController(
+        "reads",
+        AIMDLimit(
+            settings.ADMISSION_INITIAL_LIMIT,
+            settings.ADMISSION_MIN_LIMIT,
+            settings.ADMISSION_MAX_LIMIT,
+            args.target_ms / 1000,
+            settings.ADMISSION_BACKOFF,
+            settings.ADMISSION_LATENCY_TOLERANCE,
+        ),
+        settings.ADMISSION_QUEUE_SIZE,
+        settings.ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    )
+    admission = AdmissionControl({"reads": controller}, ())
+    modes = {
+        "unbounded": lambda app: app,
+        "admission": lambda app: AdmissionControlMiddleware(app, admission),
+    }
+    results = {}
+    for name, wrap in modes.items():
+        # Семафор модели привязывается к loop, поэтому создается на каждый запуск.
+        app = wrap(_backend(args.capacity, args.service_ms / 1000))
+        result = results[name] = asyncio.run(_run(app, args))
+        latency = result["latency"]
+        print(
+            f"{name:<10} ok {result['ok']:>6}/{result['requests']:<6} "
+            f"goodput {result['goodput_rps']:>7.1f} rps  "
+            f"503 {result['rejected']:>6}  timeouts {result['timed_out']:>6}  "
+            f"p50 {latency['p50_ms']:>8.1f} ms  p99 {latency['p99_ms']:>8.1f} ms"
+        )
+    print(f"final admission limit: {controller.limit.limit:.1f}")
+    if args.output:
+        write_json(args.output, {"parameters": vars(args), "results": results})
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--rps", type=float, default=400.0)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--capacity", type=int, default=10)
+    parser.add_argument("--service-ms", type=float, default=50.0)
+    parser.add_argument("--client-timeout-ms", type=float, default=1000.0)
+    parser.add_argument("--target-ms", type=float, default=100.0)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment()
+    sys.exit(main(arguments))
@@ -0,0 +1,103 @@
+"""
+Процессорное время против сэкономленных байтов при сжатии ответов.
+
+Для тел ответа GET /tasks/ разного размера и каждого доступного кодека
+(gzip с разными уровнями, br и zstd — если установлены brotli и
+zstandard) печатает размер после сжатия, время сжатия и выигрыш:
+время передачи сэкономленных байтов на канале --bandwidth-mbit минус
+процессорное время на сжатие. Отрицательный выигрыш у маленьких тел
+и есть причина порога COMPRESSION_MIN_SIZE.
+
+    python -m benchmarks.bench_compression --sizes 1 10 100 1000 10000
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.common import configure_environment, write_json
+
+
+def _codecs(levels: list[int]) -> dict:
+    from app import compression
+
+    codecs = {
+        f"gzip-{level}": lambda level=level: compression.GzipCompressor(level)
+        for level in levels
+    }
+    if compression.brotli is not None:
+        for quality in (1, 4, 9):
+            codecs[f"br-{quality}"] = (
+                lambda quality=quality: compression.BrotliCompressor(quality)
+            )
+    if compression.zstandard is not None:
+        for level in (1, 3, 9):
+            codecs[f"zstd-{level}"] = lambda level=level: compression.ZstdCompressor(
+                level
+            )
+    return codecs
+
+
+def _compress(factory, body: bytes) -> bytes:
+    compressor = factory()
+    return compressor.compress(body) + compressor.finish()
+
+
+def main(args: argparse.Namespace) -> int:
+    from app.responses import json_response
+    from app.task_manager.schemas import Task
+    from benchmarks.bench_list_formats import _tasks
+
+    bytes_per_second = args.bandwidth_mbit * 1_000_000 / 8
+    results = []
+    for size in args.sizes:
+        body = json_response(_tasks(size), list[Task]).body
+        for name, factory in _codecs(args.gzip_levels).items():
+            best = float("inf")
+            for _ in range(args.repeat):
+                started_at = time.process_time()
+                compressed = _compress(factory, body)
+                best = min(best, time.process_time() - started_at)
+            saved = len(body) - len(compressed)
+            gain_ms = (saved / bytes_per_second - best) * 1000
+            result = {
+                "tasks": size,
+                "codec": name,
+                "bytes": len(body),
+                "compressed_bytes": len(compressed),
+                "ratio": round(len(body) / len(compressed), 2),
+                "cpu_ms": round(best * 1000, 3),
+                "mb_per_s": round(len(body) / max(best, 1e-9) / 1e6, 1),
+                "gain_ms": round(gain_ms, 3),
+            }
+            results.append(result)
+            print(
+                f"{size:>6} tasks {len(body):>10,} B  {name:<8} "
+                f"-> {len(compressed):>9,} B  x{result['ratio']:<6} "
+                f"cpu {result['cpu_ms']:>8.3f} ms  "
+                f"{result['mb_per_s']:>7.1f} MB/s  gain {gain_ms:>9.3f} ms"
+            )
+    if args.output:
+        write_json(
+            args.output,
+            {"bandwidth_mbit": args.bandwidth_mbit, "results": results},
+        )
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[1, 10, 100, 1000, 10_000]
+    )
+    parser.add_argument("--gzip-levels", nargs="+", type=int, default=[1, 6, 9])
+    parser.add_argument("--bandwidth-mbit", type=float, default=100.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment()
+    sys.exit(main(arguments))
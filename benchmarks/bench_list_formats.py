@@ -0,0 +1,130 @@
+"""
+Размер и скорость представлений списка задач.
+
+Сравнивает массив JSON-объектов (формат по умолчанию), колоночный JSON
+и msgpack (если установлен): размер тела ответа, в том числе после gzip,
+время кодирования на сервере и декодирования на клиенте. Описания —
+как в списке по умолчанию, не длиннее TASK_LIST_DESCRIPTION_LENGTH.
+
+    python -m benchmarks.bench_list_formats --sizes 10 1000 50000
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import time
+import uuid
+
+from benchmarks.common import configure_environment, write_json
+
+
+def _tasks(count: int) -> list:
+    from app.config import settings
+    from app.task_manager.schemas import Task, TaskStatus
+
+    rng = random.Random(1)
+    words = "plan write review deploy fix test report meeting budget".split()
+    user_id = uuid.uuid4()
+    return [
+        Task(
+            task_id=uuid.uuid4(),
+            user_id=user_id,
+            title=" ".join(rng.choices(words, k=3)),
+            description=(
+                " ".join(rng.choices(words, k=30))[
+                    : settings.TASK_LIST_DESCRIPTION_LENGTH
+                ]
+                if number % 3
+                else None
+            ),
+            status=rng.choice(list(TaskStatus)),
+        )
+        for number in range(count)
+    ]
+
+
+def _best_of(call, repeat: int) -> tuple[float, object]:
+    best, value = float("inf"), None
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        value = call()
+        best = min(best, time.perf_counter() - started_at)
+    return best, value
+
+
+def _formats() -> dict:
+    from app.responses import (
+        COLUMNAR_JSON,
+        JSON,
+        MSGPACK,
+        _columnar_adapter,
+        columnar,
+        json_response,
+        list_media_types,
+        msgpack,
+    )
+    from app.task_manager.schemas import TASK_FIELDS, Task
+
+    def encode(media_type: str):
+        def run(tasks: list) -> bytes:
+            if media_type == JSON:
+                return json_response(tasks, list[Task]).body
+            payload = columnar(tasks, TASK_FIELDS, common=("user_id",))
+            adapter = _columnar_adapter(Task, tuple(payload.columns))
+            if media_type == MSGPACK:
+                return msgpack.packb(adapter.dump_python(payload, mode="json"))
+            return adapter.dump_json(payload)
+
+        return run
+
+    decoders = {JSON: json.loads, COLUMNAR_JSON: json.loads}
+    if msgpack is not None:
+        decoders[MSGPACK] = msgpack.unpackb
+    return {
+        media_type: (encode(media_type), decoders[media_type])
+        for media_type in list_media_types()
+    }
+
+
+def main(args: argparse.Namespace) -> int:
+    formats = _formats()
+    results = []
+    for size in args.sizes:
+        tasks = _tasks(size)
+        for media_type, (encode, decode) in formats.items():
+            encode_s, body = _best_of(lambda: encode(tasks), args.repeat)
+            decode_s, _ = _best_of(lambda: decode(body), args.repeat)
+            result = {
+                "size": size,
+                "format": media_type,
+                "bytes": len(body),
+                "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+                "encode_ms": round(encode_s * 1000, 3),
+                "decode_ms": round(decode_s * 1000, 3),
+            }
+            results.append(result)
+            print(
+                f"{size:>7} {media_type:<32} {result['bytes']:>11,} B  "
+                f"gzip {result['gzip_bytes']:>10,} B  "
+                f"encode {result['encode_ms']:>9.3f} ms  "
+                f"decode {result['decode_ms']:>9.3f} ms"
+            )
+    if args.output:
+        write_json(args.output, {"results": results})
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 1000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment()
+    sys.exit(main(arguments))
@@ -0,0 +1,177 @@
+"""
+Стоимость построения горячих запросов на стороне Python.
+
+Сравнивает для запросов репозиториев (список задач пользователя, задача
+по id, пользователь по email) три способа: новый select() при каждом
+вызове, как раньше в репозиториях, собранный один раз запрос с bindparam
+(текущий вариант) и lambda_stmt. Фаза build — построение выражения
+и вычисление ключа кэша компиляции, execute — полный session.execute
+на SQLite в памяти, где база почти не добавляет своего времени.
+
+    python -m benchmarks.bench_queries --iterations 20000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+from benchmarks.common import LatencyStats, configure_environment, write_json
+
+
+def _variants() -> dict[str, dict]:
+    from sqlalchemy import lambda_stmt, select
+    from app.auth import repository as auth_repository
+    from app.auth.models import UserORM
+    from app.task_manager import repository as task_repository
+    from app.task_manager.models import TaskORM
+
+    # Замыкания lambda_stmt должны ссылаться на сами значения параметров:
+    # они становятся связанными параметрами, а не частью ключа кэша.
+    def select_task_columns():
+        return select(
+            TaskORM.task_id,
+            TaskORM.title,
+            TaskORM.description,
+            TaskORM.status,
+            TaskORM.user_id,
+        )
+
+    def lambda_user_tasks(params):
+        user_id = params["user_id"]
+        return lambda_stmt(
+            lambda: select_task_columns().where(TaskORM.user_id == user_id)
+        )
+
+    def lambda_user_task(params):
+        task_id, user_id = params["task_id"], params["user_id"]
+        return lambda_stmt(
+            lambda: select(TaskORM).where(
+                TaskORM.task_id == task_id, TaskORM.user_id == user_id
+            )
+        )
+
+    def lambda_user_by_email(params):
+        email = params["email"]
+        return lambda_stmt(lambda: select(UserORM).where(UserORM.email == email))
+
+    return {
+        "user_tasks": {
+            "fresh": lambda p: (
+                select_task_columns().where(TaskORM.user_id == p["user_id"]),
+                {},
+            ),
+            "prebuilt": lambda p: (task_repository._select_user_tasks, p),
+            "lambda": lambda p: (lambda_user_tasks(p), {}),
+        },
+        "user_task": {
+            "fresh": lambda p: (
+                select(TaskORM).where(
+                    TaskORM.task_id == p["task_id"], TaskORM.user_id == p["user_id"]
+                ),
+                {},
+            ),
+            "prebuilt": lambda p: (task_repository._select_user_task, p),
+            "lambda": lambda p: (lambda_user_task(p), {}),
+        },
+        "user_by_email": {
+            "fresh": lambda p: (select(UserORM).where(UserORM.email == p["email"]), {}),
+            "prebuilt": lambda p: (auth_repository._select_user_by_email, p),
+            "lambda": lambda p: (lambda_user_by_email(p), {}),
+        },
+    }
+
+
+def _params(query: str, user_id: uuid.UUID, task_id: uuid.UUID, email: str) -> dict:
+    if query == "user_tasks":
+        return {"user_id": user_id}
+    if query == "user_task":
+        return {"task_id": task_id, "user_id": user_id}
+    return {"email": email}
+
+
+def measure_build(build, params: dict, iterations: int) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        statement, _ = build(params)
+        statement._generate_cache_key()
+        samples.append(time.perf_counter() - started_at)
+    return samples
+
+
+async def measure_execute(session, build, params: dict, iterations: int) -> list:
+    samples = []
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        statement, bound = build(params)
+        result = await session.execute(statement, bound)
+        result.scalars().all()
+        samples.append(time.perf_counter() - started_at)
+    return samples
+
+
+async def main(args: argparse.Namespace) -> int:
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+    from app.auth.models import UserORM
+    from app.database import Base
+    from app.seed import SeedConfig, seed_database
+    from app.task_manager.models import TaskORM
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed_database(engine, SeedConfig(users=10, tasks=200, random_seed=1))
+
+    results = []
+    async with AsyncSession(engine) as session:
+        task = (await session.scalars(select(TaskORM).limit(1))).one()
+        email = await session.scalar(
+            select(UserORM.email).where(UserORM.user_id == task.user_id)
+        )
+        session.expunge_all()
+        for query, variants in _variants().items():
+            params = _params(query, task.user_id, task.task_id, email)
+            for name, build in variants.items():
+                # Прогрев: первый вызов компилирует запрос и заполняет кэши.
+                await measure_execute(session, build, params, 10)
+                build_stats = LatencyStats.from_seconds(
+                    measure_build(build, params, args.iterations)
+                )
+                execute_stats = LatencyStats.from_seconds(
+                    await measure_execute(session, build, params, args.iterations)
+                )
+                session.expunge_all()
+                results.append(
+                    {
+                        "query": query,
+                        "variant": name,
+                        "build": build_stats.to_dict(),
+                        "execute": execute_stats.to_dict(),
+                    }
+                )
+                print(
+                    f"{query:<14} {name:<9} "
+                    f"build {build_stats.mean_ms * 1000:>8.1f} us  "
+                    f"execute {execute_stats.mean_ms * 1000:>8.1f} us "
+                    f"(p95 {execute_stats.p95_ms * 1000:>8.1f} us)"
+                )
+    await engine.dispose()
+    if args.output:
+        write_json(args.output, {"iterations": args.iterations, "results": results})
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment()
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,128 @@
+"""
+Стоимость сериализации списка задач в ответ, в пересчете на одну задачу.
+
+Сравнивает стандартный путь FastAPI (повторная валидация по
+response_model, jsonable_encoder и json.dumps) с app.responses.json_response
+(pydantic-core сразу пишет байты) на одних и тех же объектах Task. Отдельно
+показана валидация ORM-объектов в Task, которую делает репозиторий.
+
+    python -m benchmarks.bench_serialization --sizes 10 1000 50000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+
+from benchmarks.common import configure_environment, write_json
+
+
+def _orm_tasks(count: int) -> list:
+    from app.auth.models import UserORM  # noqa: F401 — для relationship
+    from app.task_manager.models import TaskORM
+
+    user_id = uuid.uuid4()
+    return [
+        TaskORM(
+            task_id=uuid.uuid4(),
+            user_id=user_id,
+            title=f"Задача {number}",
+            description="Описание задачи для бенчмарка" if number % 2 else None,
+            status="in_progress",
+        )
+        for number in range(count)
+    ]
+
+
+def _app(tasks: list):
+    from fastapi import FastAPI
+    from app.responses import json_response
+    from app.task_manager.schemas import Task
+
+    app = FastAPI()
+
+    @app.get("/default", response_model=list[Task])
+    async def default():
+        return tasks
+
+    @app.get("/fast", response_model=list[Task])
+    async def fast():
+        return json_response(tasks, list[Task])
+
+    return app
+
+
+async def _best_of(call, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        await call()
+        best = min(best, time.perf_counter() - started_at)
+    return best
+
+
+async def measure(size: int, repeat: int) -> dict:
+    import httpx
+    from app.task_manager.schemas import Task
+
+    orm_tasks = _orm_tasks(size)
+    started_at = time.perf_counter()
+    tasks = [Task.model_validate(task) for task in orm_tasks]
+    validate = time.perf_counter() - started_at
+
+    transport = httpx.ASGITransport(app=_app(tasks))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def request(path: str):
+            response = await client.get(path)
+            response.raise_for_status()
+
+        # Пустой ответ того же приложения: накладные расходы ASGI и клиента.
+        empty = await _best_of(lambda: client.get("/openapi.json"), repeat)
+        default = await _best_of(lambda: request("/default"), repeat)
+        fast = await _best_of(lambda: request("/fast"), repeat)
+
+    def per_item_us(seconds: float) -> float:
+        return round(seconds / size * 1e6, 3)
+
+    return {
+        "size": size,
+        "validate_us_per_item": per_item_us(validate),
+        "default_us_per_item": per_item_us(default),
+        "fast_us_per_item": per_item_us(fast),
+        "request_overhead_ms": round(empty * 1000, 3),
+        "speedup": round(default / fast, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    results = []
+    for size in args.sizes:
+        result = await measure(size, args.repeat)
+        results.append(result)
+        print(
+            f"{size:>7} tasks  validate {result['validate_us_per_item']:>7.2f} us  "
+            f"default {result['default_us_per_item']:>7.2f} us  "
+            f"fast {result['fast_us_per_item']:>7.2f} us  "
+            f"x{result['speedup']}"
+        )
+    if args.output:
+        write_json(args.output, {"results": results})
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10, 1000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment()
+    sys.exit(asyncio.run(main(arguments)))
@@ -0,0 +1,169 @@
+"""
+Конкурентные чтения и записи в файловую SQLite: стандартный движок
+против оптимизированного профиля (WAL, прагмы, один писатель и пул читателей).
+
+Писатели создают и обновляют задачи через TaskService,
+читатели запрашивают списки задач. Для каждого режима печатаются
+операции в секунду, p95 и число ошибок (в том числе "database is locked").
+
+    python -m benchmarks.bench_sqlite --writers 16 --readers 32 --duration 10
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+
+from benchmarks.common import (
+    LatencyStats,
+    configure_environment,
+    temporary_directory,
+    write_json,
+)
+
+
+async def _prepare(url: str, users: int, tasks: int) -> None:
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.database import Base
+    from app.seed import SeedConfig, seed_database
+
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await seed_database(engine, SeedConfig(users=users, tasks=tasks, random_seed=1))
+    await engine.dispose()
+
+
+def _session_factory(mode: str, url: str):
+    from sqlalchemy.ext.asyncio import (
+        AsyncSession,
+        async_sessionmaker,
+        create_async_engine,
+    )
+    from app.database import create_sqlite_engines
+    from app.replication import Replica, ReplicaSet, RoutingSession
+
+    if mode == "default":
+        engine = create_async_engine(url)
+        return async_sessionmaker(engine, expire_on_commit=False), [engine]
+    writer, reader = create_sqlite_engines(url)
+    factory = async_sessionmaker(
+        bind=writer,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        info={
+            "replicas": ReplicaSet([Replica("reader", reader)]),
+            "all_reads_to_replicas": True,
+        },
+    )
+    return factory, [writer, reader]
+
+
+async def run_mode(mode: str, url: str, args: argparse.Namespace) -> dict:
+    from sqlalchemy import select
+    from app.auth.models import UserORM
+    from app.task_manager.repository import TaskSQLAlchemyRepository
+    from app.task_manager.schemas import TaskCreate, TaskUpdate
+    from app.task_manager.service import TaskService
+    from app.unit_of_work import SQLAlchemyUnitOfWork
+
+    session_factory, engines = _session_factory(mode, url)
+    async with session_factory() as session:
+        user_ids = (await session.scalars(select(UserORM.user_id))).all()
+
+    latencies = {"write": [], "read": []}
+    errors: Counter[str] = Counter()
+    deadline = time.perf_counter() + args.duration
+
+    async def writer() -> None:
+        while time.perf_counter() < deadline:
+            user_id = random.choice(user_ids)
+            started_at = time.perf_counter()
+            try:
+                async with session_factory() as session:
+                    service = TaskService(
+                        TaskSQLAlchemyRepository(session), SQLAlchemyUnitOfWork(session)
+                    )
+                    task = await service.create_task(
+                        TaskCreate(title="Benchmark"), user_id=user_id
+                    )
+                    await service.update_task(
+                        task.task_id, TaskUpdate(status="completed"), user_id
+                    )
+            except Exception as e:
+                errors[str(getattr(e, "orig", e))] += 1
+                continue
+            latencies["write"].append(time.perf_counter() - started_at)
+
+    async def reader() -> None:
+        while time.perf_counter() < deadline:
+            started_at = time.perf_counter()
+            try:
+                async with session_factory() as session:
+                    await TaskSQLAlchemyRepository(session).get_all(
+                        random.choice(user_ids)
+                    )
+            except Exception as e:
+                errors[str(getattr(e, "orig", e))] += 1
+                continue
+            latencies["read"].append(time.perf_counter() - started_at)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(
+        *(writer() for _ in range(args.writers)),
+        *(reader() for _ in range(args.readers)),
+    )
+    elapsed = time.perf_counter() - started_at
+    for engine in engines:
+        await engine.dispose()
+
+    result = {"mode": mode, "errors": dict(errors)}
+    for kind, samples in latencies.items():
+        stats = LatencyStats.from_seconds(samples)
+        result[kind] = {
+            "ops_per_s": round(len(samples) / elapsed, 1),
+            **stats.to_dict(),
+        }
+    return result
+
+
+async def main(args: argparse.Namespace) -> int:
+    results = []
+    for mode in ("default", "optimized"):
+        path = temporary_directory() / "sqlite.db"
+        url = f"sqlite+aiosqlite:///{path}"
+        await _prepare(url, args.users, args.tasks)
+        result = await run_mode(mode, url, args)
+        results.append(result)
+        print(
+            f"{mode:<10} writes {result['write']['ops_per_s']:>8.1f}/s "
+            f"p95 {result['write']['p95_ms']:>8.2f} ms  "
+            f"reads {result['read']['ops_per_s']:>8.1f}/s "
+            f"p95 {result['read']['p95_ms']:>8.2f} ms  "
+            f"errors {sum(result['errors'].values())}"
+        )
+        for message, count in result["errors"].items():
+            print(f"{'':<10} {count} x {message}")
+    if args.output:
+        write_json(args.output, {"results": results})
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--readers", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment()
+    sys.exit(asyncio.run(main(arguments)))
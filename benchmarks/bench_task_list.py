@@ -0,0 +1,105 @@
+"""
+Память и процессорное время чтения большого списка задач.
+
+Сравнивает прежний путь get_all (объекты TaskORM в identity map и
+Task.model_validate для каждого) с текущим (кортежи колонок и пакетная
+валидация через TypeAdapter). Время — process_time без трассировки памяти,
+пик памяти — по tracemalloc в отдельном прогоне.
+
+    python -m benchmarks.bench_task_list --sizes 1000 50000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+
+from benchmarks.common import configure_environment, write_json
+
+
+async def _orm_path(session, user_id) -> list:
+    from sqlalchemy import select
+    from app.task_manager.models import TaskORM
+    from app.task_manager.schemas import Task
+
+    result = await session.execute(select(TaskORM).where(TaskORM.user_id == user_id))
+    return [Task.model_validate(task) for task in result.scalars().all()]
+
+
+async def _columns_path(session, user_id) -> list:
+    from app.task_manager.repository import TaskSQLAlchemyRepository
+
+    return await TaskSQLAlchemyRepository(session).get_all(user_id)
+
+
+PATHS = {"orm": _orm_path, "columns": _columns_path}
+
+
+async def measure(engine, user_id, path: str, repeat: int) -> dict:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    read = PATHS[path]
+    cpu_times = []
+    for _ in range(repeat):
+        async with AsyncSession(engine) as session:
+            started_at = time.process_time()
+            tasks = await read(session, user_id)
+            cpu_times.append(time.process_time() - started_at)
+        del tasks
+
+    async with AsyncSession(engine) as session:
+        tracemalloc.start()
+        try:
+            tasks = await read(session, user_id)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {
+        "path": path,
+        "rows": len(tasks),
+        "cpu_ms": round(min(cpu_times) * 1000, 2),
+        "peak_mib": round(peak / 2**20, 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    from sqlalchemy import select
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.auth.models import UserORM
+    from app.database import Base
+    from app.seed import SeedConfig, seed_database
+
+    results = []
+    for size in args.sizes:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed_database(engine, SeedConfig(users=1, tasks=size, random_seed=1))
+        async with engine.connect() as conn:
+            user_id = await conn.scalar(select(UserORM.user_id))
+        for path in PATHS:
+            result = await measure(engine, user_id, path, args.repeat)
+            results.append(result)
+            print(
+                f"{result['rows']:>7} tasks  {path:<8} "
+                f"cpu {result['cpu_ms']:>9.2f} ms  peak {result['peak_mib']:>8.2f} MiB"
+            )
+        await engine.dispose()
+    if args.output:
+        write_json(args.output, {"results": results})
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1000, 50_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment()
+    sys.exit(asyncio.run(main(arguments)))
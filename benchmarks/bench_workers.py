@@ -0,0 +1,121 @@
+"""
+Масштабирование пропускной способности по числу воркеров.
+
+Для каждого числа воркеров запускает production-сервер python -m app
+на общей временной БД и прогоняет сценарий из http_load несколькими
+процессами-генераторами нагрузки (один процесс Python быстро упирается
+в свое ядро). Печатает суммарный RPS, ускорение относительно первого
+запуска и худший p95.
+
+    python -m benchmarks.bench_workers --workers 1 2 4 8 --client-processes 4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import sys
+
+from benchmarks.common import configure_environment, write_json
+from benchmarks.http_load import SCENARIOS, _free_port, run_scenario, server_client
+
+import httpx
+
+
+def _client_process(
+    base_url: str, scenario: str, concurrency: int, requests: int, queue
+) -> None:
+    async def run() -> dict:
+        limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=60
+        ) as client:
+            return await run_scenario(
+                client, SCENARIOS[scenario], concurrency, requests
+            )
+
+    queue.put(asyncio.run(run()))
+
+
+async def run_workers(workers: int, args: argparse.Namespace) -> dict:
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+    ]
+    async with server_client(command, port) as client:
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        processes = [
+            context.Process(
+                target=_client_process,
+                args=(
+                    str(client.base_url),
+                    args.scenario,
+                    max(1, args.concurrency // args.client_processes),
+                    max(1, args.requests // args.client_processes),
+                    queue,
+                ),
+            )
+            for _ in range(args.client_processes)
+        ]
+        for process in processes:
+            process.start()
+        results = [
+            await asyncio.to_thread(queue.get) for _ in range(args.client_processes)
+        ]
+        for process in processes:
+            process.join()
+    return {
+        "workers": workers,
+        "requests": sum(result["requests"] for result in results),
+        "errors": sum(result["errors"] for result in results),
+        "rps": round(sum(result["rps"] for result in results), 1),
+        "p95_ms": max(result["p95_ms"] for result in results),
+    }
+
+
+async def main(args: argparse.Namespace) -> int:
+    from benchmarks.http_load import _create_schema
+
+    await _create_schema()
+    records = []
+    for workers in args.workers:
+        record = await run_workers(workers, args)
+        first_rps = records[0]["rps"] if records else record["rps"]
+        record["speedup"] = round(record["rps"] / max(first_rps, 1e-9), 2)
+        records.append(record)
+        print(
+            f"workers={workers:<3} {record['rps']:>9.1f} rps  "
+            f"x{record['speedup']:<5} p95 {record['p95_ms']:>8.2f} ms  "
+            f"errors {record['errors']}"
+        )
+    if args.output:
+        write_json(args.output, {"scenario": args.scenario, "results": records})
+    return 0
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--scenario", choices=list(SCENARIOS), default="list_polling")
+    parser.add_argument("--client-processes", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=4000)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment(arguments.database_url)
+    sys.exit(asyncio.run(main(arguments)))
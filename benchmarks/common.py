@@ -0,0 +1,145 @@
+import atexit
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+ROOT_DIR = BENCHMARKS_DIR.parent
+BENCHMARK_PASSWORD = "benchmark-password"
+MIN_LATENCY_SAMPLES = 100
+
+
+def temporary_directory() -> Path:
+    """Временный каталог для файлов БД бенчмарка; удаляется при выходе."""
+    directory = tempfile.TemporaryDirectory(prefix="task-manager-bench-")
+    atexit.register(directory.cleanup)
+    return Path(directory.name)
+
+
+def configure_environment(database_url: str | None = None) -> str:
+    """
+    Настраивает переменные окружения приложения до импорта app.*.
+    По умолчанию используется отдельный временный файл SQLite, чтобы
+    бенчмарк никогда не писал в рабочую БД из .env, с профилем
+    SQLITE_OPTIMIZED: без WAL одновременные записи падают с database is locked.
+    """
+    if database_url is None:
+        path = temporary_directory() / "bench.db"
+        database_url = f"sqlite+aiosqlite:///{path}"
+        os.environ.setdefault("SQLITE_OPTIMIZED", "true")
+    os.environ["DATABASE_URL"] = database_url
+    os.environ.setdefault("AUTH_SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("MEMORY_REPORT_INTERVAL_SECONDS", "0")
+    if str(ROOT_DIR) not in sys.path:
+        sys.path.insert(0, str(ROOT_DIR))
+    return database_url
+
+
+def percentile(sorted_values: list[float], level: float) -> float:
+    """Перцентиль методом ближайшего ранга по отсортированным значениям."""
+    if not sorted_values:
+        return float("nan")
+    index = max(0, min(len(sorted_values) - 1, round(level * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+@dataclass
+class LatencyStats:
+    """Сводка задержек в миллисекундах."""
+
+    count: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_seconds(cls, samples: list[float]) -> "LatencyStats":
+        values = sorted(sample * 1000 for sample in samples)
+        return cls(
+            count=len(values),
+            mean_ms=statistics.fmean(values) if values else float("nan"),
+            p50_ms=percentile(values, 0.50),
+            p95_ms=percentile(values, 0.95),
+            p99_ms=percentile(values, 0.99),
+            max_ms=values[-1] if values else float("nan"),
+        )
+
+    def to_dict(self) -> dict:
+        return {key: round(value, 3) for key, value in asdict(self).items()}
+
+
+def environment_info() -> dict:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_json(path: str | Path, payload: dict) -> None:
+    Path(path).write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+
+
+def load_json(path: str | Path) -> dict:
+    return json.loads(Path(path).read_text())
+
+
+def relative_metrics(result: dict, calibration: dict) -> dict:
+    """
+    Показатели сценария относительно калибровочного прогона (GET /
+    при той же конкурентности): отношения, в отличие от миллисекунд
+    и RPS, мало зависят от скорости машины. Задержки делятся на медиану
+    калибровки: ее хвосты сами по себе шумные.
+    """
+    return {
+        "concurrency": result["concurrency"],
+        "rps_ratio": round(result["rps"] / calibration["rps"], 4),
+        "p95_ratio": round(result["p95_ms"] / calibration["p50_ms"], 2),
+    }
+
+
+def compare_with_baseline(
+    results: dict[str, dict],
+    calibration: dict,
+    baseline: dict[str, dict],
+    tolerance: float,
+) -> list[str]:
+    """
+    Сравнивает результаты сценариев с базовыми относительными показателями
+    (снятыми при той же конкурентности). Регрессия — любая ошибка, рост
+    p95 или падение RPS относительно калибровки больше чем на долю
+    tolerance. p99 слишком шумный для порога и только печатается; p95
+    не сравнивается у сценариев короче MIN_LATENCY_SAMPLES запросов.
+    """
+    regressions = []
+    for name, result in results.items():
+        if result["errors"]:
+            regressions.append(
+                f"{name}: {result['errors']} of {result['requests']} requests failed"
+            )
+        expected = baseline.get(name)
+        if expected is None or expected["concurrency"] != result["concurrency"]:
+            continue
+        actual = relative_metrics(result, calibration)
+        limit = expected["p95_ratio"] * (1 + tolerance)
+        if result["count"] >= MIN_LATENCY_SAMPLES and actual["p95_ratio"] > limit:
+            regressions.append(
+                f"{name}: p95_ratio {actual['p95_ratio']:.2f} > {limit:.2f} "
+                f"(baseline {expected['p95_ratio']:.2f})"
+            )
+        limit = expected["rps_ratio"] * (1 - tolerance)
+        if actual["rps_ratio"] < limit:
+            regressions.append(
+                f"{name}: rps_ratio {actual['rps_ratio']:.4f} < {limit:.4f} "
+                f"(baseline {expected['rps_ratio']:.4f})"
+            )
+    return regressions
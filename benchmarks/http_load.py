@@ -0,0 +1,411 @@
+"""
+Нагрузочный бенчмарк HTTP API.
+
+Гоняет реальное ASGI-приложение app.main:app в процессе (httpx + ASGITransport)
+или через локальный uvicorn, печатает RPS и p50/p95/p99 по сценариям
+и сравнивает их с базовым файлом в долях от калибровочного прогона GET /:
+любая ошибка или регрессия завершает запуск с кодом 1.
+
+    python -m benchmarks.http_load --target asgi --baseline benchmarks/baseline.json
+    python -m benchmarks.http_load --target uvicorn --update-baseline
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from benchmarks.common import (
+    BENCHMARK_PASSWORD,
+    BENCHMARKS_DIR,
+    LatencyStats,
+    compare_with_baseline,
+    configure_environment,
+    environment_info,
+    load_json,
+    relative_metrics,
+    write_json,
+)
+
+import httpx
+
+StepFn = Callable[[httpx.AsyncClient, Any], Awaitable[httpx.Response]]
+SetupFn = Callable[[httpx.AsyncClient, int], Awaitable[list[Any]]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    setup: SetupFn
+    step: StepFn
+    requests: int
+
+
+@dataclass
+class VirtualUser:
+    headers: dict[str, str]
+    task_ids: list[str]
+    email: str = ""
+
+
+def _unique_email(prefix: str) -> str:
+    return f"{prefix}-{uuid.uuid4().hex[:12]}@bench.example.com"
+
+
+async def _register_and_login(client: httpx.AsyncClient, email: str) -> VirtualUser:
+    await client.post(
+        "/auth/register", json={"email": email, "password": BENCHMARK_PASSWORD}
+    )
+    response = await client.post(
+        "/auth/login", data={"username": email, "password": BENCHMARK_PASSWORD}
+    )
+    response.raise_for_status()
+    token = response.json()["access_token"]
+    return VirtualUser(
+        headers={"Authorization": f"Bearer {token}"}, task_ids=[], email=email
+    )
+
+
+def _task_payload(index: int) -> dict:
+    return {
+        "title": f"Benchmark task {index}",
+        "description": "Lorem ipsum dolor sit amet, " * random.randint(1, 8),
+        "status": random.choice(["created", "in_progress", "completed"]),
+    }
+
+
+async def _create_task(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    response = await client.post(
+        "/tasks/", json=_task_payload(len(user.task_ids)), headers=user.headers
+    )
+    if response.status_code == 201:
+        user.task_ids.append(response.json()["task_id"])
+    return response
+
+
+async def _seed_users(
+    client: httpx.AsyncClient, count: int, tasks_per_user: int, prefix: str
+) -> list[VirtualUser]:
+    users = [
+        await _register_and_login(client, _unique_email(prefix)) for _ in range(count)
+    ]
+    for user in users:
+        for _ in range(tasks_per_user):
+            await _create_task(client, user)
+    return users
+
+
+async def setup_calibration(client: httpx.AsyncClient, concurrency: int) -> list[Any]:
+    return [None] * concurrency
+
+
+async def step_calibration(client: httpx.AsyncClient, state: Any) -> httpx.Response:
+    return await client.get("/")
+
+
+async def setup_register_login(
+    client: httpx.AsyncClient, concurrency: int
+) -> list[Any]:
+    return [None] * concurrency
+
+
+async def step_register_login(client: httpx.AsyncClient, state: Any) -> httpx.Response:
+    email = _unique_email("register")
+    response = await client.post(
+        "/auth/register", json={"email": email, "password": BENCHMARK_PASSWORD}
+    )
+    if response.status_code != 201:
+        return response
+    return await client.post(
+        "/auth/login", data={"username": email, "password": BENCHMARK_PASSWORD}
+    )
+
+
+async def setup_crud_mix(client: httpx.AsyncClient, concurrency: int) -> list[Any]:
+    return await _seed_users(client, concurrency, tasks_per_user=5, prefix="crud")
+
+
+async def step_crud_mix(client: httpx.AsyncClient, user: VirtualUser) -> httpx.Response:
+    operation = random.choices(
+        ["create", "get", "update", "list", "delete"], weights=[30, 25, 20, 15, 10]
+    )[0]
+    if operation == "create" or not user.task_ids:
+        return await _create_task(client, user)
+    task_id = random.choice(user.task_ids)
+    if operation == "get":
+        return await client.get(f"/tasks/{task_id}", headers=user.headers)
+    if operation == "update":
+        return await client.put(
+            f"/tasks/{task_id}", json={"status": "completed"}, headers=user.headers
+        )
+    if operation == "list":
+        return await client.get("/tasks/", headers=user.headers)
+    user.task_ids.remove(task_id)
+    return await client.delete(f"/tasks/{task_id}", headers=user.headers)
+
+
+async def setup_list_polling(client: httpx.AsyncClient, concurrency: int) -> list[Any]:
+    users = await _seed_users(client, 1, tasks_per_user=200, prefix="polling")
+    return users * concurrency
+
+
+async def step_list_polling(
+    client: httpx.AsyncClient, user: VirtualUser
+) -> httpx.Response:
+    return await client.get("/tasks/", headers=user.headers)
+
+
+async def setup_bulk_users(client: httpx.AsyncClient, concurrency: int) -> list[Any]:
+    users = await _seed_users(client, 50, tasks_per_user=10, prefix="bulk")
+    cycle = itertools.cycle(users)
+    return [cycle for _ in range(concurrency)]
+
+
+async def step_bulk_users(client: httpx.AsyncClient, users) -> httpx.Response:
+    user = next(users)
+    if random.random() < 0.8:
+        return await client.get("/tasks/", headers=user.headers)
+    return await _create_task(client, user)
+
+
+# Эталон скорости машины: сценарии сравниваются с базой в долях от него.
+CALIBRATION = Scenario(
+    "calibration",
+    "GET / без БД и аутентификации",
+    setup_calibration,
+    step_calibration,
+    requests=1000,
+)
+
+SCENARIOS = {
+    scenario.name: scenario
+    for scenario in [
+        Scenario(
+            "register_login",
+            "регистрация нового пользователя и вход (bcrypt)",
+            setup_register_login,
+            step_register_login,
+            requests=40,
+        ),
+        Scenario(
+            "crud_mix",
+            "смесь create/get/update/list/delete по своим задачам",
+            setup_crud_mix,
+            step_crud_mix,
+            requests=1000,
+        ),
+        Scenario(
+            "list_polling",
+            "частый опрос GET /tasks/ одного пользователя с 200 задачами",
+            setup_list_polling,
+            step_list_polling,
+            requests=500,
+        ),
+        Scenario(
+            "bulk_users",
+            "50 пользователей: 80% чтение списка, 20% создание задач",
+            setup_bulk_users,
+            step_bulk_users,
+            requests=1000,
+        ),
+    ]
+}
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, scenario: Scenario, concurrency: int, requests: int
+) -> dict:
+    states = await scenario.setup(client, concurrency)
+    latencies: list[float] = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def worker(state: Any) -> None:
+        nonlocal errors
+        while next(remaining) < requests:
+            started_at = time.perf_counter()
+            response = await scenario.step(client, state)
+            latencies.append(time.perf_counter() - started_at)
+            if response.status_code >= 400:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker(state) for state in states))
+    elapsed = time.perf_counter() - started_at
+
+    stats = LatencyStats.from_seconds(latencies).to_dict()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "rps": round(len(latencies) / elapsed, 1),
+        **stats,
+    }
+
+
+async def _create_schema() -> None:
+    from app.database import Base, engine
+    import app.auth.models  # noqa: F401
+    import app.task_manager.models  # noqa: F401
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+@asynccontextmanager
+async def asgi_client():
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            yield client
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@asynccontextmanager
+async def server_client(command: list[str], port: int, timeout: float = 30.0):
+    """Запускает сервер командой command и ждет, пока он начнет отвечать."""
+    process = subprocess.Popen(command, env=os.environ.copy())
+    base_url = f"http://127.0.0.1:{port}"
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    try:
+        async with httpx.AsyncClient(
+            base_url=base_url, limits=limits, timeout=60
+        ) as client:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    await client.get("/")
+                    break
+                except httpx.TransportError:
+                    if process.poll() is not None or time.monotonic() > deadline:
+                        raise RuntimeError("Server did not start") from None
+                    await asyncio.sleep(0.1)
+            yield client
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def uvicorn_client():
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    return server_client(command, port)
+
+
+async def main(args: argparse.Namespace) -> int:
+    await _create_schema()
+    client_factory = asgi_client if args.target == "asgi" else uvicorn_client
+    names = list(SCENARIOS) if args.scenarios == ["all"] else args.scenarios
+
+    results = {}
+    async with client_factory() as client:
+        calibration = await _run_and_print(client, CALIBRATION, args)
+        for name in names:
+            results[name] = await _run_and_print(client, SCENARIOS[name], args)
+
+    payload = {
+        "environment": environment_info(),
+        "target": args.target,
+        "calibration": calibration,
+        "scenarios": results,
+    }
+    if args.output:
+        write_json(args.output, payload)
+
+    regressions = [
+        f"{name}: {result['errors']} of {result['requests']} requests failed"
+        for name, result in results.items()
+        if result["errors"]
+    ]
+    if args.update_baseline:
+        if regressions:
+            # Прогон с ошибками не годится в базу.
+            for regression in regressions:
+                print(f"NOT UPDATED {regression}")
+            return 1
+        baseline = load_json(args.baseline) if os.path.exists(args.baseline) else {}
+        baseline[args.target] = {
+            name: relative_metrics(result, calibration)
+            for name, result in results.items()
+        }
+        write_json(args.baseline, baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        baseline = load_json(args.baseline).get(args.target, {})
+    regressions = compare_with_baseline(results, calibration, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+async def _run_and_print(
+    client: httpx.AsyncClient, scenario: Scenario, args: argparse.Namespace
+) -> dict:
+    requests = max(1, int(scenario.requests * args.scale))
+    result = await run_scenario(client, scenario, args.concurrency, requests)
+    print(
+        f"{scenario.name:<16} {result['rps']:>9.1f} rps  "
+        f"p50 {result['p50_ms']:>8.2f} ms  p95 {result['p95_ms']:>8.2f} ms  "
+        f"p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}"
+    )
+    return result
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--target", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument(
+        "--scenarios", nargs="+", default=["all"], choices=["all", *SCENARIOS]
+    )
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="множитель числа запросов"
+    )
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--baseline", default=str(BENCHMARKS_DIR / "baseline.json"))
+    parser.add_argument("--tolerance", type=float, default=0.5)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", default=None)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    configure_environment(arguments.database_url)
+    sys.exit(asyncio.run(main(arguments)))
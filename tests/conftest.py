@@ -7,6 +7,7 @@ import asyncio
 from typing import AsyncGenerator
 
 import pytest_asyncio
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from httpx import AsyncClient, ASGITransport
 
@@ -15,8 +16,25 @@ from app.main import app
 from app.config import settings
 
 test_engine = create_async_engine(settings.TEST_DATABASE_URL, echo=False)
+
+
+if test_engine.dialect.name == "sqlite":
+    # pysqlite сам не открывает транзакцию до первой записи, и SAVEPOINT
+    # сессии фиксировался бы мимо внешней транзакции теста.
+    @event.listens_for(test_engine.sync_engine, "connect")
+    def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(test_engine.sync_engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
 TestingSessionLocal = async_sessionmaker(
-    autocommit=False, autoflush=False, bind=test_engine
+    autocommit=False,
+    autoflush=False,
+    bind=test_engine,
+    join_transaction_mode="create_savepoint",
 )
 
 
@@ -0,0 +1,71 @@
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from fastapi import status
+
+from app import database
+from app.config import settings
+from app.database import Base
+from app.main import app
+from app.server_timing import ServerTiming
+
+pytestmark = pytest.mark.asyncio
+
+USER_PAYLOAD = {"email": "lazy@example.com", "password": "password123"}
+
+
+@pytest_asyncio.fixture
+async def app_client():
+    """Клиент без подмены get_db_session: запросы идут через ленивую сессию."""
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    async with database.engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+async def test_rejected_request_does_not_create_session(
+    app_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Запрос без токена отклоняется, не создавая сессию БД."""
+    created = []
+    factory = database.AsyncSessionLocal
+    monkeypatch.setattr(
+        database, "AsyncSessionLocal", lambda: created.append(1) or factory()
+    )
+
+    response = await app_client.get("/tasks/")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert created == []
+
+
+async def test_connection_is_returned_before_serialization(
+    app_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Соединение возвращается в пул до конца обработчика; время удержания в Server-Timing."""
+    await app_client.post("/auth/register", json=USER_PAYLOAD)
+    response = await app_client.post(
+        "/auth/login",
+        data={"username": USER_PAYLOAD["email"], "password": USER_PAYLOAD["password"]},
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    await app_client.post("/tasks/", json={"title": "Lazy"}, headers=headers)
+
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+    phases = []
+    add = ServerTiming.add
+    monkeypatch.setattr(
+        ServerTiming,
+        "add",
+        lambda self, name, duration: phases.append(name) or add(self, name, duration),
+    )
+    response = await app_client.get("/tasks/", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "pool;dur=" in response.headers["Server-Timing"]
+    last_pool = len(phases) - 1 - phases[::-1].index("pool")
+    assert last_pool < phases.index("handler")
@@ -0,0 +1,105 @@
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+from app.config import settings
+from app.diagnostics import profiler
+
+pytestmark = pytest.mark.asyncio
+
+ADMIN_TOKEN = "admin-token"
+
+
+@pytest.fixture
+def admin_headers(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """Фикстура, включающая админ-API и возвращающая заголовки доступа."""
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", ADMIN_TOKEN)
+    return {"X-Admin-Token": ADMIN_TOKEN}
+
+
+async def test_admin_api_disabled_without_token(client: AsyncClient):
+    """Без настроенного ADMIN_TOKEN админ-API недоступно."""
+    response = await client.get("/admin/profiling")
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def test_admin_api_rejects_invalid_token(
+    client: AsyncClient, admin_headers: dict
+):
+    """Неверный токен отклоняется."""
+    response = await client.get("/admin/profiling", headers={"X-Admin-Token": "x"})
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+async def test_configure_profiling(client: AsyncClient, admin_headers: dict):
+    """Админ-API включает и выключает выборочное профилирование."""
+    response = await client.put(
+        "/admin/profiling",
+        json={"sample_every": 100, "correlation_ids": ["req-1"]},
+        headers=admin_headers,
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["sample_every"] == 100
+    assert profiler.armed
+
+    response = await client.delete("/admin/profiling", headers=admin_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["sample_every"] == 0
+    assert not profiler.armed
+
+
+async def test_metrics_exposes_loop_lag(client: AsyncClient):
+    """Эндпоинт /metrics отдает квантили задержки event loop."""
+    response = await client.get("/metrics")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'event_loop_lag_seconds{quantile="0.99"}' in response.text
+
+
+async def test_memory_snapshots_and_diff(client: AsyncClient, admin_headers: dict):
+    """Снимки tracemalloc: топ аллокаций и разница между снимками."""
+    response = await client.post(
+        "/admin/memory/snapshots", json={"name": "before"}, headers=admin_headers
+    )
+    assert response.status_code == status.HTTP_409_CONFLICT
+
+    response = await client.post(
+        "/admin/memory/start", json={"frames": 1}, headers=admin_headers
+    )
+    assert response.json()["tracing"] is True
+    try:
+        await client.post(
+            "/admin/memory/snapshots", json={"name": "before"}, headers=admin_headers
+        )
+        retained = [bytearray(1024) for _ in range(1000)]
+        response = await client.post(
+            "/admin/memory/snapshots", json={"name": "after"}, headers=admin_headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["snapshots"] == ["before", "after"]
+
+        response = await client.get(
+            "/admin/memory/snapshots/after/top?limit=5", headers=admin_headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()) == 5
+
+        response = await client.get(
+            "/admin/memory/diff?base=before&target=after", headers=admin_headers
+        )
+        top_growth = response.json()[0]
+        assert top_growth["file"] == __file__
+        assert top_growth["size_diff_bytes"] >= 1024 * len(retained)
+
+        response = await client.get(
+            "/admin/memory/diff?base=missing&target=after", headers=admin_headers
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    finally:
+        response = await client.post("/admin/memory/stop", headers=admin_headers)
+    assert response.json() == {
+        "tracing": False,
+        "traced_memory_bytes": 0,
+        "peak_memory_bytes": 0,
+        "snapshots": [],
+    }
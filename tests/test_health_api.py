@@ -0,0 +1,32 @@
+import pytest
+from httpx import AsyncClient
+from fastapi import status
+
+from app.health import readiness
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_liveness_does_not_check_dependencies(client: AsyncClient):
+    """Liveness отвечает 200 без обращения к зависимостям."""
+    response = await client.get("/health/live")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {"status": "ok"}
+
+
+async def test_readiness_returns_cached_probe_result(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Readiness отдает результат последней фоновой проверки."""
+    await readiness.check()
+    ready = await client.get("/health/ready")
+
+    monkeypatch.setattr(readiness, "loop_lag", lambda: 10.0)
+    await readiness.check()
+    lagging = await client.get("/health/ready")
+    await readiness.check()
+
+    assert ready.status_code == status.HTTP_200_OK
+    assert ready.json()["checks"]["database"]["ok"] is True
+    assert lagging.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert lagging.json()["checks"]["event_loop"]["ok"] is False
@@ -0,0 +1,92 @@
+import time
+import pytest
+from httpx import ASGITransport, AsyncClient
+from fastapi import APIRouter, FastAPI, status
+from pydantic import BaseModel, field_serializer
+
+from app.config import settings
+from app.middleware import ServerTimingMiddleware
+from app.responses import json_response
+from app.server_timing import ServerTimingRoute
+
+pytestmark = pytest.mark.asyncio
+
+USER_PAYLOAD = {"email": "timing@example.com", "password": "password123"}
+
+
+async def _login(client: AsyncClient) -> dict:
+    await client.post("/auth/register", json=USER_PAYLOAD)
+    response = await client.post(
+        "/auth/login",
+        data={"username": USER_PAYLOAD["email"], "password": USER_PAYLOAD["password"]},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _phases(header: str) -> set[str]:
+    return {metric.split(";")[0].strip() for metric in header.split(",")}
+
+
+def _durations(header: str) -> list[tuple[str, float]]:
+    metrics = (metric.strip().split(";dur=") for metric in header.split(","))
+    return [(name, float(duration)) for name, duration in metrics]
+
+
+class SlowModel(BaseModel):
+    value: int
+
+    @field_serializer("value")
+    def slow_value(self, value: int) -> int:
+        time.sleep(0.05)
+        return value
+
+
+async def test_server_timing_disabled_by_default(client: AsyncClient):
+    """Без включенной настройки заголовок не добавляется."""
+    response = await client.get("/")
+    assert response.status_code == status.HTTP_200_OK
+    assert "Server-Timing" not in response.headers
+
+
+async def test_server_timing_phases_for_task_list(
+    client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Список задач размечается фазами auth, db, validate, handler, serialize."""
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+    headers = await _login(client)
+    await client.post(
+        "/tasks/", json={"title": "Timed", "status": "created"}, headers=headers
+    )
+
+    response = await client.get("/tasks/", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    phases = _phases(response.headers["Server-Timing"])
+    assert {"auth", "db", "validate", "handler", "serialize", "total"} <= phases
+
+
+async def test_prebuilt_response_serialize_phase_recorded_once(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Сериализация json_response попадает в одну фазу serialize, не в handler."""
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", True)
+    router = APIRouter(route_class=ServerTimingRoute)
+
+    @router.get("/slow")
+    async def slow():
+        return json_response(SlowModel(value=1), SlowModel)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.add_middleware(ServerTimingMiddleware)
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/slow")
+
+    durations = _durations(response.headers["Server-Timing"])
+    serialize = [duration for name, duration in durations if name == "serialize"]
+    handler = dict(durations)["handler"]
+    assert len(serialize) == 1
+    assert serialize[0] >= 50
+    assert handler < 50
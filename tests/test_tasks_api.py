@@ -3,6 +3,11 @@ import pytest_asyncio
 from httpx import AsyncClient
 from fastapi import status
 from uuid_extensions import uuid7
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app import statement_timeout
+from app.config import settings
+from app.statement_timeout import StatementTimeoutError
+from app.task_manager.service import TaskService
 
 pytestmark = pytest.mark.asyncio
 
@@ -173,3 +178,220 @@ async def test_get_task_not_found(authenticated_client_one: AsyncClient):
     non_existent_id = uuid7()
     response = await authenticated_client_one.get(f"/tasks/{non_existent_id}")
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_update_task(authenticated_client_one: AsyncClient):
+    """Тест частичного обновления своей задачи."""
+    create_response = await authenticated_client_one.post(
+        "/tasks/", json={"title": "Old", "description": "Keep", "status": "created"}
+    )
+    task_id = create_response.json()["task_id"]
+
+    response = await authenticated_client_one.put(
+        f"/tasks/{task_id}", json={"title": "New", "status": "completed"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["title"] == "New"
+    assert data["status"] == "completed"
+    assert data["description"] == "Keep"
+    response = await authenticated_client_one.get(f"/tasks/{task_id}")
+    assert response.json()["title"] == "New"
+
+
+async def test_get_all_tasks_truncates_long_description(
+    authenticated_client_one: AsyncClient,
+):
+    """Тест: в списке длинное описание обрезано, в карточке задачи — полное."""
+    description = "d" * (settings.TASK_LIST_DESCRIPTION_LENGTH + 50)
+    create_response = await authenticated_client_one.post(
+        "/tasks/", json={"title": "Long", "description": description}
+    )
+    task_id = create_response.json()["task_id"]
+
+    listed = (await authenticated_client_one.get("/tasks/")).json()[0]
+    detail = (await authenticated_client_one.get(f"/tasks/{task_id}")).json()
+
+    assert listed["description"] == "d" * settings.TASK_LIST_DESCRIPTION_LENGTH + "…"
+    assert detail["description"] == description
+
+
+async def test_get_tasks_with_sparse_fields(authenticated_client_one: AsyncClient):
+    """Тест параметра fields для списка и карточки задачи."""
+    description = "d" * (settings.TASK_LIST_DESCRIPTION_LENGTH + 1)
+    create_response = await authenticated_client_one.post(
+        "/tasks/", json={"title": "Sparse", "description": description}
+    )
+    task_id = create_response.json()["task_id"]
+
+    listed = await authenticated_client_one.get(
+        "/tasks/", params={"fields": "task_id,title"}
+    )
+    full = await authenticated_client_one.get(
+        "/tasks/", params={"fields": "task_id,description"}
+    )
+    detail = await authenticated_client_one.get(
+        f"/tasks/{task_id}", params={"fields": "status"}
+    )
+
+    assert listed.json() == [{"title": "Sparse", "task_id": task_id}]
+    assert full.json() == [{"description": description, "task_id": task_id}]
+    assert detail.json() == {"status": "created"}
+
+
+@pytest.mark.parametrize("fields", ["title,owner", "", " , "])
+async def test_get_tasks_rejects_unknown_fields(
+    authenticated_client_one: AsyncClient, fields
+):
+    """Тест: неизвестные поля в fields дают 422."""
+    response = await authenticated_client_one.get("/tasks/", params={"fields": fields})
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+async def test_get_all_tasks_columnar_format(authenticated_client_one: AsyncClient):
+    """Тест колоночного представления списка по заголовку Accept."""
+    for title in ("First", "Second"):
+        await authenticated_client_one.post("/tasks/", json={"title": title})
+    tasks = (await authenticated_client_one.get("/tasks/")).json()
+
+    response = await authenticated_client_one.get(
+        "/tasks/", headers={"Accept": "application/vnd.columnar+json"}
+    )
+
+    assert response.headers["content-type"] == "application/vnd.columnar+json"
+    assert "Accept" in response.headers["vary"].split(", ")
+    data = response.json()
+    assert data["columns"] == ["title", "description", "status", "task_id"]
+    assert data["common"] == {"user_id": tasks[0]["user_id"]}
+    assert [dict(zip(data["columns"], row)) for row in data["rows"]] == [
+        {key: value for key, value in task.items() if key != "user_id"}
+        for task in tasks
+    ]
+
+
+async def test_get_all_tasks_msgpack_format(authenticated_client_one: AsyncClient):
+    """Тест бинарного представления списка в msgpack."""
+    msgpack = pytest.importorskip("msgpack")
+    await authenticated_client_one.post("/tasks/", json={"title": "Packed"})
+
+    response = await authenticated_client_one.get(
+        "/tasks/",
+        params={"fields": "title"},
+        headers={"Accept": "application/msgpack"},
+    )
+
+    assert response.headers["content-type"] == "application/msgpack"
+    assert msgpack.unpackb(response.content) == {
+        "columns": ["title"],
+        "rows": [["Packed"]],
+        "common": {},
+    }
+
+
+async def test_create_task_with_idempotency_key_is_not_repeated(
+    authenticated_client_one: AsyncClient,
+):
+    """Тест: повтор POST с тем же Idempotency-Key не создает вторую задачу."""
+    headers = {"Idempotency-Key": "create-1"}
+    payload = {"title": "Once"}
+
+    first = await authenticated_client_one.post(
+        "/tasks/", json=payload, headers=headers
+    )
+    second = await authenticated_client_one.post(
+        "/tasks/", json=payload, headers=headers
+    )
+    reused = await authenticated_client_one.post(
+        "/tasks/", json={"title": "Other"}, headers=headers
+    )
+
+    assert second.status_code == status.HTTP_201_CREATED
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert reused.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert len((await authenticated_client_one.get("/tasks/")).json()) == 1
+
+
+async def test_delete_task_with_idempotency_key_replays_success(
+    authenticated_client_one: AsyncClient,
+):
+    """Тест: повтор успешного DELETE возвращает 204, а не 404."""
+    task_id = (
+        await authenticated_client_one.post("/tasks/", json={"title": "Gone"})
+    ).json()["task_id"]
+    headers = {"Idempotency-Key": "delete-1"}
+
+    first = await authenticated_client_one.delete(f"/tasks/{task_id}", headers=headers)
+    second = await authenticated_client_one.delete(f"/tasks/{task_id}", headers=headers)
+    without_key = await authenticated_client_one.delete(f"/tasks/{task_id}")
+
+    assert first.status_code == status.HTTP_204_NO_CONTENT
+    assert second.status_code == status.HTTP_204_NO_CONTENT
+    assert without_key.status_code == status.HTTP_404_NOT_FOUND
+
+
+async def test_update_missing_task_with_idempotency_key_replays_404(
+    authenticated_client_one: AsyncClient, monkeypatch
+):
+    """Тест: повтор PUT, первый раз завершившегося 404, не выполняется заново."""
+    calls = []
+    update_task = TaskService.update_task
+
+    async def counted(self, *args, **kwargs):
+        calls.append(args)
+        return await update_task(self, *args, **kwargs)
+
+    monkeypatch.setattr(TaskService, "update_task", counted)
+    headers = {"Idempotency-Key": "update-missing-1"}
+    url = f"/tasks/{uuid7()}"
+
+    first = await authenticated_client_one.put(
+        url, json={"title": "X"}, headers=headers
+    )
+    second = await authenticated_client_one.put(
+        url, json={"title": "X"}, headers=headers
+    )
+
+    assert first.status_code == status.HTTP_404_NOT_FOUND
+    assert second.status_code == status.HTTP_404_NOT_FOUND
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert len(calls) == 1
+
+
+async def test_statement_timeout_maps_to_504_with_route_timeout(
+    authenticated_client_one: AsyncClient, monkeypatch
+):
+    """Тест: таймаут выражения БД — 504, таймаут маршрута берется из настроек."""
+    timeouts = []
+
+    async def timed_out(self, user_id, fields=None):
+        timeouts.append(statement_timeout._current_timeout())
+        raise StatementTimeoutError(timeouts[-1])
+
+    monkeypatch.setattr(
+        settings, "DB_ROUTE_STATEMENT_TIMEOUT_MS", {"get_all_tasks": 1234.0}
+    )
+    monkeypatch.setattr(TaskService, "get_all_tasks", timed_out)
+
+    response = await authenticated_client_one.get("/tasks/")
+
+    assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
+    assert timeouts == [1.234]
+
+
+async def test_pool_timeout_maps_to_503(
+    authenticated_client_one: AsyncClient, monkeypatch
+):
+    """Тест: нехватка соединений в пуле возвращается как 503 с Retry-After."""
+
+    async def pool_exhausted(self, user_id, fields=None):
+        raise PoolTimeoutError("QueuePool limit reached")
+
+    monkeypatch.setattr(TaskService, "get_all_tasks", pool_exhausted)
+
+    response = await authenticated_client_one.get("/tasks/")
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert "retry-after" in response.headers
@@ -0,0 +1,180 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from app.admission import (
+    AdmissionControl,
+    AdmissionController,
+    AIMDLimit,
+    OverloadedError,
+    build_admission_control,
+)
+from app.middleware import AdmissionControlMiddleware
+
+
+def make_controller(
+    limit: float = 2, queue_size: int = 1, queue_timeout: float = 1.0
+) -> AdmissionController:
+    return AdmissionController(
+        "test",
+        AIMDLimit(limit, min_limit=1, max_limit=10, target_latency=0.1),
+        queue_size=queue_size,
+        queue_timeout=queue_timeout,
+    )
+
+
+def test_aimd_limit_grows_under_load_and_backs_off_on_slow_responses():
+    limit = AIMDLimit(4, min_limit=1, max_limit=10, target_latency=0.1, backoff=0.5)
+
+    for _ in range(4):
+        limit.update(0.01, started_at=0, in_flight=4)
+    grown = limit.limit
+    assert 4.9 < grown < 5
+
+    limit.update(0.5, started_at=0, in_flight=4)
+    assert limit.limit == pytest.approx(grown / 2)
+
+
+def test_aimd_limit_decreases_once_per_generation():
+    limit = AIMDLimit(8, min_limit=1, max_limit=10, target_latency=0.1, backoff=0.5)
+    limit.update(0.01, started_at=0, in_flight=1)
+
+    limit.update(0.5, started_at=0, in_flight=8)
+    limit.update(0.5, started_at=0, in_flight=8)
+
+    assert limit.limit == 4
+
+
+def test_aimd_limit_keeps_steadily_slow_route():
+    limit = AIMDLimit(8, min_limit=1, max_limit=10, target_latency=0.1)
+
+    for _ in range(20):
+        limit.update(0.5, started_at=0, in_flight=8)
+
+    assert limit.limit >= 8
+
+
+def test_aimd_limit_does_not_grow_when_idle():
+    limit = AIMDLimit(10, min_limit=1, max_limit=100, target_latency=0.1)
+
+    limit.update(0.01, started_at=0, in_flight=1)
+
+    assert limit.limit == 10
+
+
+def test_bypass_paths_and_route_classes():
+    controllers = {name: make_controller() for name in ("auth", "reads", "writes")}
+    admission = AdmissionControl(controllers, ["/", "/health", "/metrics"])
+
+    assert admission.controller_for("GET", "/") is None
+    assert admission.controller_for("GET", "/health/ready") is None
+    assert admission.controller_for("GET", "/metrics") is None
+    assert admission.controller_for("POST", "/auth/login") is controllers["auth"]
+    assert admission.controller_for("GET", "/tasks/") is controllers["reads"]
+    assert admission.controller_for("PUT", "/tasks/1") is controllers["writes"]
+    assert admission.controller_for("GET", "/healthz") is controllers["reads"]
+
+
+@pytest.mark.asyncio
+async def test_queued_request_is_admitted_on_release():
+    controller = make_controller(limit=1)
+    await controller.acquire()
+
+    waiter = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+    assert controller.queued == 1
+
+    controller.release(0.01, started_at=0)
+    await waiter
+    assert controller.in_flight == 1
+    assert controller.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_and_queue_timeout_are_rejected():
+    controller = make_controller(limit=1, queue_size=1, queue_timeout=0.01)
+    await controller.acquire()
+    waiter = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(OverloadedError) as full:
+        await controller.acquire()
+    with pytest.raises(OverloadedError) as timeout:
+        await waiter
+
+    assert (full.value.reason, timeout.value.reason) == ("queue_full", "timeout")
+    assert (controller.in_flight, controller.queued) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    controller = make_controller(limit=1)
+    await controller.acquire()
+    waiter = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    controller.release(0.01, started_at=0)
+
+    assert (controller.in_flight, controller.queued) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_middleware_sheds_excess_load_but_lets_health_through():
+    release = asyncio.Event()
+    controller = make_controller(limit=1, queue_size=0)
+    app = FastAPI()
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        admission=AdmissionControl({"reads": controller}, ["/health"]),
+    )
+
+    @app.get("/slow")
+    async def slow():
+        await release.wait()
+        return {"ok": True}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/slow"))
+        while controller.in_flight == 0:
+            await asyncio.sleep(0)
+
+        rejected = await client.get("/slow")
+        health = await client.get("/health")
+        release.set()
+        admitted = await first
+
+    assert rejected.status_code == 503
+    assert rejected.headers["Retry-After"] == "1"
+    assert health.status_code == 200
+    assert admitted.status_code == 200
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_default_settings_admit_moderate_concurrency_to_slow_auth():
+    """Тест: 20 клиентов на маршруте медленнее целевой задержки не получают 503."""
+    app = FastAPI()
+    app.add_middleware(AdmissionControlMiddleware, admission=build_admission_control())
+
+    @app.post("/auth/login")
+    async def login():
+        await asyncio.sleep(0.6)
+        return {"ok": True}
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+
+        async def user():
+            return [(await client.post("/auth/login")).status_code for _ in range(2)]
+
+        statuses = await asyncio.gather(*(user() for _ in range(20)))
+
+    assert [status for pair in statuses for status in pair] == [200] * 40
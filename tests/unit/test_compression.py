@@ -0,0 +1,139 @@
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from httpx import ASGITransport, AsyncClient
+from app.compression import choose_encoding, is_compressible
+from app.config import settings
+from app.middleware import CompressionMiddleware
+
+LARGE = "описание задачи " * 500
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/small")
+    async def small():
+        return PlainTextResponse("ok")
+
+    @app.get("/large")
+    async def large():
+        return PlainTextResponse(LARGE)
+
+    @app.get("/binary")
+    async def binary():
+        return PlainTextResponse(LARGE, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(3):
+                yield LARGE
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/stream-small-first")
+    async def stream_small_first():
+        async def chunks():
+            yield "["
+            for _ in range(3):
+                yield LARGE
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/stream-small")
+    async def stream_small():
+        async def chunks():
+            yield "o"
+            yield "k"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+async def get(path: str, accept_encoding: str = "gzip"):
+    transport = ASGITransport(app=make_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        async with client.stream(
+            "GET", path, headers={"Accept-Encoding": accept_encoding}
+        ) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+            return response, raw
+
+
+def test_choose_encoding_respects_quality_and_server_order():
+    offered = ["zstd", "gzip"]
+
+    assert choose_encoding("gzip, zstd", offered) == "zstd"
+    assert choose_encoding("zstd;q=0.5, gzip", offered) == "gzip"
+    assert choose_encoding("*", offered) == "zstd"
+    assert choose_encoding("identity", offered) is None
+    assert choose_encoding(None, offered) is None
+    assert choose_encoding("gzip;q=0", offered) is None
+
+
+def test_is_compressible():
+    assert is_compressible("application/json")
+    assert is_compressible("application/vnd.columnar+json")
+    assert is_compressible("text/plain; charset=utf-8")
+    assert not is_compressible("image/png")
+    assert not is_compressible(None)
+
+
+@pytest.mark.asyncio
+async def test_large_response_is_gzipped():
+    response, raw = await get("/large")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-length"] == str(len(raw))
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert gzip.decompress(raw).decode() == LARGE
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path, accept_encoding", [("/small", "gzip"), ("/binary", "gzip"), ("/large", "")]
+)
+async def test_response_is_sent_as_is(path, accept_encoding):
+    response, raw = await get(path, accept_encoding)
+
+    assert "content-encoding" not in response.headers
+    assert len(raw) == int(response.headers["content-length"])
+
+
+@pytest.mark.asyncio
+async def test_min_size_is_configurable(monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 1)
+
+    response, raw = await get("/small")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw) == b"ok"
+
+
+@pytest.mark.asyncio
+async def test_streaming_response_is_compressed_chunk_by_chunk():
+    response, raw = await get("/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode() == LARGE * 3
+
+
+@pytest.mark.asyncio
+async def test_stream_with_small_first_chunk_is_compressed():
+    response, raw = await get("/stream-small-first")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert gzip.decompress(raw).decode() == "[" + LARGE * 3
+
+
+@pytest.mark.asyncio
+async def test_small_stream_is_sent_as_is():
+    response, raw = await get("/stream-small")
+
+    assert "content-encoding" not in response.headers
+    assert raw == b"ok"
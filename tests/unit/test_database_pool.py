@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.config import settings
+from app.database import (
+    InstrumentedQueuePool,
+    engine_options,
+    pool_checkout_wait_seconds,
+    pool_overflow_total,
+    pool_timeouts_total,
+    prewarm_pool,
+)
+
+
+@pytest_asyncio.fixture
+async def file_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=2,
+        max_overflow=1,
+        pool_timeout=0.1,
+    )
+    yield engine
+    await engine.dispose()
+
+
+def test_engine_options_skip_memory_sqlite(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    assert "poolclass" not in engine_options(settings)
+
+
+def test_engine_options_configure_statement_caches(monkeypatch):
+    monkeypatch.setattr(settings, "DB_QUERY_CACHE_SIZE", 1000)
+    monkeypatch.setattr(settings, "DB_PREPARED_STATEMENT_CACHE_SIZE", 0)
+
+    postgres = engine_options(settings, "postgresql+asyncpg://db/app")
+    sqlite = engine_options(settings, "sqlite+aiosqlite:///app.db")
+
+    assert postgres["query_cache_size"] == 1000
+    assert postgres["connect_args"] == {"prepared_statement_cache_size": 0}
+    assert "connect_args" not in sqlite
+
+
+def test_engine_options_use_pool_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DATABASE_URL", "postgresql+asyncpg://db/app")
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", True)
+
+    options = engine_options(settings)
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 20
+    assert options["pool_pre_ping"] is True
+
+
+@pytest.mark.asyncio
+async def test_prewarm_pool_opens_connections_up_to_pool_size(file_engine):
+    warmed = await prewarm_pool(file_engine, 5)
+
+    assert warmed == 2
+    assert file_engine.sync_engine.pool.checkedin() == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_reports_wait_overflow_and_timeouts(file_engine):
+    checkouts = pool_checkout_wait_seconds.count
+    overflows = pool_overflow_total.value
+    timeouts = pool_timeouts_total.value
+
+    connections = [await file_engine.connect() for _ in range(3)]
+    with pytest.raises(exc.TimeoutError):
+        await asyncio.wait_for(file_engine.connect().start(), timeout=5)
+    for connection in connections:
+        await connection.close()
+
+    assert pool_checkout_wait_seconds.count == checkouts + 4
+    assert pool_overflow_total.value == overflows + 1
+    assert pool_timeouts_total.value == timeouts + 1
@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+from app.health import ReadinessProber
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def file_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'health.db'}", pool_size=1, max_overflow=0
+    )
+    yield engine
+    await engine.dispose()
+
+
+def make_prober(engine, lag: float = 0.0, timeout: float = 1.0) -> ReadinessProber:
+    return ReadinessProber(
+        engine,
+        loop_lag=lambda: lag,
+        interval=1.0,
+        timeout=timeout,
+        max_pool_saturation=1.0,
+        max_loop_lag=0.5,
+    )
+
+
+async def test_prober_reports_ready_when_all_checks_pass(file_engine):
+    prober = make_prober(file_engine)
+    assert prober.current()[0] is False
+
+    report = await prober.check()
+
+    assert report.status == "ok"
+    assert prober.current() == (True, prober.body)
+    assert b'"database":{"ok":true' in prober.body
+
+
+async def test_saturated_pool_makes_prober_not_ready(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'health.db'}", pool_size=2, max_overflow=0
+    )
+    prober = make_prober(engine, timeout=0.5)
+
+    async with engine.connect() as first, engine.connect() as second:
+        await first.exec_driver_sql("SELECT 1")
+        await second.exec_driver_sql("SELECT 1")
+        report = await prober.check()
+    await prober.stop()
+    await engine.dispose()
+
+    assert report.status == "unavailable"
+    assert report.checks["pool"].ok is False
+    assert report.checks["pool"].detail == "2/2 checked out"
+    # SELECT 1 идет мимо пула и не ждет освобождения соединений.
+    assert report.checks["database"].ok is True
+
+
+async def test_busy_single_connection_pool_stays_ready(file_engine):
+    prober = make_prober(file_engine, timeout=0.5)
+
+    async with file_engine.begin() as conn:
+        await conn.exec_driver_sql("CREATE TABLE t (x INTEGER)")
+        await conn.exec_driver_sql("INSERT INTO t VALUES (1)")
+        report = await prober.check()
+    await prober.stop()
+
+    assert report.status == "ok"
+    assert report.checks["pool"].ok is True
+    assert report.checks["database"].ok is True
+
+
+async def test_database_failure_and_loop_lag_make_prober_not_ready(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/db.sqlite")
+    prober = make_prober(engine, lag=1.0)
+
+    report = await prober.check()
+    await engine.dispose()
+
+    assert report.checks["database"].ok is False
+    assert report.checks["event_loop"].ok is False
+
+
+async def test_stale_result_is_not_ready(file_engine):
+    prober = make_prober(file_engine)
+    await prober.check()
+
+    prober.stale_after = 0
+    await asyncio.sleep(0.01)
+    ready, body = prober.current()
+
+    assert ready is False
+    assert b'"status":"unavailable"' in body
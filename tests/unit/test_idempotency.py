@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from fastapi import Response
+from app.idempotency import IdempotencyKeyReusedError, IdempotencyStore
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_call(calls: list, status_code: int = 201, delay: float = 0):
+    async def call() -> Response:
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return Response(b'{"n": %d}' % len(calls), status_code=status_code)
+
+    return call
+
+
+async def test_repeated_key_replays_first_response():
+    store, calls = IdempotencyStore(ttl=60, max_entries=10), []
+
+    first = await store.execute("key", "fp", make_call(calls))
+    second = await store.execute("key", "fp", make_call(calls))
+
+    assert len(calls) == 1
+    assert (second.status_code, second.body) == (first.status_code, first.body)
+    assert second.headers["Idempotent-Replayed"] == "true"
+
+
+async def test_concurrent_duplicates_wait_for_first_execution():
+    store, calls = IdempotencyStore(ttl=60, max_entries=10), []
+
+    responses = await asyncio.gather(
+        *(store.execute("key", "fp", make_call(calls, delay=0.01)) for _ in range(5))
+    )
+
+    assert len(calls) == 1
+    assert {response.body for response in responses} == {b'{"n": 1}'}
+
+
+async def test_failed_execution_is_not_stored():
+    store, calls = IdempotencyStore(ttl=60, max_entries=10), []
+
+    async def fail() -> Response:
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await store.execute("key", "fp", fail)
+    await store.execute("key", "fp", make_call(calls, status_code=503))
+    response = await store.execute("key", "fp", make_call(calls))
+
+    assert len(calls) == 2
+    assert response.status_code == 201
+    assert len(store) == 1
+
+
+async def test_key_reused_for_different_request_is_rejected():
+    store = IdempotencyStore(ttl=60, max_entries=10)
+    await store.execute("key", "fp", make_call([]))
+
+    with pytest.raises(IdempotencyKeyReusedError):
+        await store.execute("key", "other", make_call([]))
+
+
+async def test_entries_expire_and_are_bounded():
+    calls = []
+    expiring = IdempotencyStore(ttl=0, max_entries=10)
+    await expiring.execute("key", "fp", make_call(calls))
+    await expiring.execute("key", "fp", make_call(calls))
+    bounded = IdempotencyStore(ttl=60, max_entries=2)
+    for key in ("a", "b", "c"):
+        await bounded.execute(key, "fp", make_call([]))
+
+    assert len(calls) == 2
+    assert len(bounded) == 2
@@ -0,0 +1,32 @@
+import asyncio
+import logging
+import time
+import pytest
+from app.diagnostics import LoopLagWatchdog
+from app.diagnostics.watchdog import loop_lag_seconds
+from app.logging_config import set_correlation_id
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_blocking_call_is_reported_with_stack(caplog: pytest.LogCaptureFixture):
+    """Блокирующий вызов на loop логируется со стеком и correlation ID."""
+    watchdog = LoopLagWatchdog(interval=0.01, threshold=0.05)
+    await watchdog.start()
+    observed_before = loop_lag_seconds.count
+
+    async def blocking_handler():
+        set_correlation_id("blocking-request")
+        time.sleep(0.3)
+
+    with caplog.at_level(logging.WARNING):
+        await asyncio.create_task(blocking_handler())
+        await asyncio.sleep(0.05)
+    await watchdog.stop()
+
+    blocked = [r for r in caplog.records if "loop thread stack" in r.getMessage()]
+    assert blocked
+    assert "blocking_handler" in blocked[0].getMessage()
+    assert blocked[0].correlation_id == "blocking-request"
+    assert loop_lag_seconds.count > observed_before
+    assert loop_lag_seconds.quantile(1.0) >= 0.2
@@ -0,0 +1,31 @@
+import pytest
+from app.diagnostics.memory import MemoryProfiler
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def memory_profiler():
+    """Фикстура, создающая профилировщик памяти на три снимка."""
+    profiler = MemoryProfiler(max_snapshots=3)
+    yield profiler
+    profiler.stop()
+
+
+async def test_oldest_snapshots_are_evicted(memory_profiler: MemoryProfiler):
+    """Хранятся только последние max_snapshots снимков."""
+    memory_profiler.start()
+    for name in ("a", "b", "c", "a", "d"):
+        await memory_profiler.take_snapshot(name)
+
+    assert memory_profiler.status().snapshots == ["c", "a", "d"]
+
+
+async def test_restart_clears_snapshots(memory_profiler: MemoryProfiler):
+    """Повторный запуск tracemalloc удаляет снимки прошлого запуска."""
+    memory_profiler.start()
+    await memory_profiler.take_snapshot("before")
+
+    memory_profiler.start(frames=2)
+
+    assert memory_profiler.status().snapshots == []
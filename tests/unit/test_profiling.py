@@ -0,0 +1,67 @@
+import time
+import pytest
+from app.diagnostics import ProfilingConfig, RequestProfiler, sign_correlation_id
+from app.diagnostics.exceptions import ProfilerBusyError
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def request_profiler(tmp_path):
+    """Фикстура, создающая профилировщик с временным каталогом вывода."""
+    return RequestProfiler(output_dir=str(tmp_path), secret="profiling-secret")
+
+
+async def test_signed_request_is_profiled(request_profiler: RequestProfiler):
+    """Запрос с корректной подписью профилируется, с поддельной — нет."""
+    signature = sign_correlation_id("req-1", "profiling-secret")
+    assert not request_profiler.should_profile("req-2", signature)
+    assert not request_profiler.should_profile("req-1", "forged")
+    assert request_profiler.should_profile("req-1", signature)
+
+
+async def test_stale_or_replayed_signature_is_rejected(
+    request_profiler: RequestProfiler,
+):
+    """Просроченная и повторно предъявленная подписи не принимаются."""
+    stale = sign_correlation_id("req-1", "profiling-secret", int(time.time()) - 301)
+    assert not request_profiler.should_profile("req-1", stale)
+
+    signature = sign_correlation_id("req-1", "profiling-secret")
+    assert request_profiler.should_profile("req-1", signature)
+    assert not request_profiler.should_profile("req-1", signature)
+
+
+async def test_sampling_respects_budget(request_profiler: RequestProfiler):
+    """Выборка 1 из N отключается после исчерпания max_profiles."""
+    request_profiler.configure(ProfilingConfig(sample_every=2, max_profiles=2))
+    decisions = [request_profiler.should_profile(f"req-{i}", None) for i in range(6)]
+    assert decisions == [False, True, False, True, False, False]
+    assert not request_profiler.armed
+
+
+async def test_requested_correlation_id_profiled_once(
+    request_profiler: RequestProfiler,
+):
+    """Заказанный correlation ID профилируется ровно один раз."""
+    request_profiler.configure(ProfilingConfig(correlation_ids=["req-42"]))
+    assert request_profiler.should_profile("req-42", None)
+    assert not request_profiler.should_profile("req-42", None)
+
+
+async def test_profile_saved_by_correlation_id(
+    request_profiler: RequestProfiler, tmp_path
+):
+    """Результат сохраняется в файлы, названные по correlation ID."""
+    profile = request_profiler.start()
+    with pytest.raises(ProfilerBusyError):
+        request_profiler.start()
+    sum(range(1000))
+    path = await request_profiler.finish(profile, "../req/1")
+
+    assert path == tmp_path / ".._req_1.prof"
+    assert path.exists()
+    report = (tmp_path / ".._req_1.txt").read_text()
+    assert report.startswith("cProfile records the whole thread")
+    assert "Ordered by: cumulative time" in report
+    assert request_profiler.profiles_written == 1
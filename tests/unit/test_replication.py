@@ -0,0 +1,194 @@
+import time
+import uuid
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from app.database import Base
+from app.auth.models import UserORM
+from app.auth.repository import UserRepository
+from app.middleware import ReadYourWritesMiddleware
+from app.replication import (
+    LAST_WRITE_COOKIE,
+    Replica,
+    ReplicaSet,
+    RoutingSession,
+    primary_reads,
+    read_your_writes,
+    start_client_writes,
+)
+from app.task_manager.models import TaskORM
+from app.task_manager.repository import TaskSQLAlchemyRepository
+from app.task_manager.schemas import TaskCreate
+from app.unit_of_work import SQLAlchemyUnitOfWork
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create_database(path, user_id, task_title=None):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(UserORM.__table__).values(
+                user_id=user_id,
+                email="user@example.com",
+                hashed_password="x",
+                is_active=True,
+            )
+        )
+        if task_title:
+            await conn.execute(
+                insert(TaskORM.__table__).values(
+                    task_id=uuid.uuid4(),
+                    title=task_title,
+                    status="CREATED",
+                    user_id=user_id,
+                )
+            )
+    return engine
+
+
+@pytest_asyncio.fixture
+async def cluster(tmp_path, monkeypatch):
+    monkeypatch.setattr(read_your_writes, "window", 5.0)
+    user_id = uuid.uuid4()
+    primary = await _create_database(tmp_path / "primary.db", user_id)
+    replica_engine = await _create_database(
+        tmp_path / "replica.db", user_id, task_title="From replica"
+    )
+    replicas = ReplicaSet([Replica("replica-0", replica_engine)])
+    session_factory = async_sessionmaker(
+        bind=primary,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        info={"replicas": replicas},
+    )
+    yield session_factory, replicas, user_id
+    await primary.dispose()
+    await replica_engine.dispose()
+
+
+async def test_reads_go_to_replica(cluster):
+    session_factory, _, user_id = cluster
+
+    async with session_factory() as session:
+        tasks = await TaskSQLAlchemyRepository(session).get_all(user_id)
+
+    assert [task.title for task in tasks] == ["From replica"]
+
+
+async def test_user_reads_own_writes_from_primary(cluster):
+    session_factory, _, user_id = cluster
+
+    async with session_factory() as session:
+        async with SQLAlchemyUnitOfWork(session):
+            await TaskSQLAlchemyRepository(session).create(
+                TaskCreate(title="Written"), user_id=user_id
+            )
+    async with session_factory() as session:
+        tasks = await TaskSQLAlchemyRepository(session).get_all(user_id)
+
+    assert [task.title for task in tasks] == ["Written"]
+
+
+async def test_primary_reads_wins_over_nested_replica_reads(cluster):
+    session_factory, _, _ = cluster
+    replica = session_factory.kw["info"]["replicas"].replicas[0].engine
+    async with replica.begin() as conn:
+        await conn.execute(
+            insert(UserORM.__table__).values(
+                user_id=uuid.uuid4(),
+                email="replica-only@example.com",
+                hashed_password="x",
+                is_active=True,
+            )
+        )
+
+    async with session_factory() as session:
+        from_replica = await UserRepository(session).get_by_email(
+            "replica-only@example.com"
+        )
+    async with session_factory() as session:
+        with primary_reads():
+            from_primary = await UserRepository(session).get_by_email(
+                "replica-only@example.com"
+            )
+
+    assert from_replica is not None
+    assert from_primary is None
+
+
+async def test_unhealthy_replica_falls_back_to_primary(cluster):
+    session_factory, replicas, user_id = cluster
+    replicas.replicas[0].healthy = False
+
+    async with session_factory() as session:
+        tasks = await TaskSQLAlchemyRepository(session).get_all(user_id)
+
+    assert tasks == []
+
+
+async def test_health_check_marks_unreachable_replica(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing/db'}")
+    replica = Replica("broken", engine)
+
+    await ReplicaSet([replica]).check(replica)
+
+    assert replica.healthy is False
+    await engine.dispose()
+
+
+async def test_replicas_are_chosen_round_robin():
+    first = Replica("first", create_async_engine("sqlite+aiosqlite:///:memory:"))
+    second = Replica("second", create_async_engine("sqlite+aiosqlite:///:memory:"))
+    replicas = ReplicaSet([first, second])
+
+    assert [replicas.choose().name for _ in range(4)] == [
+        "first",
+        "second",
+        "first",
+        "second",
+    ]
+    second.healthy = False
+    assert {replicas.choose().name for _ in range(3)} == {"first"}
+
+
+async def test_last_write_cookie_keeps_reads_on_primary(cluster):
+    session_factory, _, user_id = cluster
+
+    # Запись была в другом воркере: в памяти этого процесса о ней ничего нет,
+    # но клиент принес время записи в cookie.
+    start_client_writes(str(time.time()))
+    async with session_factory() as session:
+        tasks = await TaskSQLAlchemyRepository(session).get_all(user_id)
+
+    assert tasks == []
+
+
+async def test_read_your_writes_middleware_sets_last_write_cookie(monkeypatch):
+    monkeypatch.setattr(read_your_writes, "window", 5.0)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, read_your_writes=read_your_writes)
+
+    @app.post("/write")
+    async def write():
+        read_your_writes.mark(("cookie-test", uuid.uuid4()))
+
+    @app.get("/read")
+    async def read():
+        return read_your_writes.is_sticky(("cookie-test", uuid.uuid4()))
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        assert (await client.get("/read")).json() is False
+        response = await client.post("/write")
+        assert LAST_WRITE_COOKIE in response.cookies
+        assert (await client.get("/read")).json() is True
+
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        client.cookies.set(LAST_WRITE_COOKIE, str(time.time() - 10))
+        assert (await client.get("/read")).json() is False
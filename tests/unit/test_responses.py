@@ -0,0 +1,61 @@
+import json
+from uuid import uuid4
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from app.responses import columnar, json_response, negotiate
+from app.task_manager.schemas import Task, TaskStatus
+
+
+def make_task(**fields) -> Task:
+    fields = {"title": "Задача", **fields}
+    return Task(
+        task_id=uuid4(), user_id=uuid4(), status=TaskStatus.IN_PROGRESS, **fields
+    )
+
+
+def test_json_response_matches_default_fastapi_encoding():
+    tasks = [make_task(), make_task(description="Описание")]
+
+    response = json_response(tasks, list[Task])
+
+    assert response.media_type == "application/json"
+    assert json.loads(response.body) == json.loads(
+        JSONResponse(jsonable_encoder(tasks)).body
+    )
+
+
+def test_json_response_keeps_status_code():
+    response = json_response(make_task(), Task, status_code=201)
+
+    assert response.status_code == 201
+    assert json.loads(response.body)["status"] == "in_progress"
+
+
+def test_negotiate_prefers_highest_quality_then_server_order():
+    offered = ["application/json", "application/vnd.columnar+json"]
+
+    assert negotiate(None, offered) == "application/json"
+    assert negotiate("text/html, */*;q=0.8", offered) == "application/json"
+    assert (
+        negotiate("application/vnd.columnar+json, application/json;q=0.5", offered)
+        == "application/vnd.columnar+json"
+    )
+    assert negotiate("application/msgpack", offered) == "application/json"
+    assert (
+        negotiate("*/*, application/json;q=0", offered)
+        == "application/vnd.columnar+json"
+    )
+
+
+def test_columnar_moves_common_columns_out_of_rows():
+    first, second = make_task(title="a"), make_task(title="b")
+    second.user_id = first.user_id
+
+    payload = columnar([first, second], ["title", "user_id"], common=["user_id"])
+    single = columnar([first], ["title"], common=["user_id"])
+
+    assert payload.columns == ["title"]
+    assert payload.rows == [("a",), ("b",)]
+    assert payload.common == {"user_id": first.user_id}
+    assert single.rows == [("a",)] and single.common == {}
+    assert columnar([], ["title", "user_id"], common=["user_id"]).common == {}
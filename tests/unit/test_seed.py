@@ -0,0 +1,17 @@
+import pytest
+from app.seed import SeedConfig
+from app.task_manager.schemas import TaskStatus
+
+
+@pytest.mark.parametrize(
+    "weights, message",
+    [
+        ({status: 0.0 for status in TaskStatus}, "positive sum"),
+        ({}, "positive sum"),
+        ({TaskStatus.CREATED: 1.0, TaskStatus.COMPLETED: -0.5}, "non-negative"),
+    ],
+)
+def test_invalid_status_weights_are_rejected(weights, message):
+    """Тест: веса статусов проверяются при создании конфигурации."""
+    with pytest.raises(ValueError, match=message):
+        SeedConfig(users=1, tasks=1, status_weights=weights)
@@ -0,0 +1,43 @@
+from app import server
+from app.config import settings
+
+
+def test_worker_count_uses_configured_value():
+    assert server.worker_count(3) == 3
+
+
+def test_worker_count_defaults_to_available_cores():
+    assert server.worker_count(0) >= 1
+
+
+def test_uvicorn_options_fall_back_to_stdlib_loop_and_parser(monkeypatch):
+    monkeypatch.setattr(server.importlib.util, "find_spec", lambda name: None)
+    monkeypatch.setattr(settings, "SERVER_WORKERS", 2)
+    monkeypatch.setattr(settings, "SERVER_BACKLOG", 4096)
+
+    options = server.uvicorn_options(settings, port=9000)
+
+    assert options["loop"] == "asyncio"
+    assert options["http"] == "h11"
+    assert options["workers"] == 2
+    assert options["port"] == 9000
+    assert options["backlog"] == 4096
+    assert options["timeout_keep_alive"] == settings.SERVER_KEEP_ALIVE_SECONDS
+
+
+def test_uvicorn_options_prefer_uvloop_and_httptools(monkeypatch):
+    monkeypatch.setattr(server.importlib.util, "find_spec", lambda name: object())
+
+    options = server.uvicorn_options(settings, workers=1)
+
+    assert options["loop"] == "uvloop"
+    assert options["http"] == "httptools"
+
+
+def test_after_fork_hook_replaces_inherited_pool():
+    from app import database
+
+    pool = database.engine.sync_engine.pool
+    database._reset_engine_after_fork()
+
+    assert database.engine.sync_engine.pool is not pool
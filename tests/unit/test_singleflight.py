@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from app.singleflight import SingleFlight, singleflight_coalesced_total
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_call(calls: list, release: asyncio.Event, result="rows"):
+    async def call():
+        calls.append(1)
+        await release.wait()
+        return result
+
+    return call
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight, calls, release = SingleFlight("test-share"), [], asyncio.Event()
+    coalesced = singleflight_coalesced_total.labels(name="test-share")
+
+    tasks = [
+        asyncio.create_task(flight.do("user", None, make_call(calls, release)))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == ["rows"] * 5
+    assert len(calls) == 1
+    assert coalesced.value == 4
+    assert await flight.do("user", None, make_call(calls, release)) == "rows"
+    assert len(calls) == 2
+
+
+async def test_different_keys_are_not_coalesced():
+    flight, calls, release = SingleFlight("test-keys"), [], asyncio.Event()
+    release.set()
+
+    await asyncio.gather(
+        flight.do("user", None, make_call(calls, release)),
+        flight.do("user", ("title",), make_call(calls, release)),
+        flight.do("other", None, make_call(calls, release)),
+    )
+
+    assert len(calls) == 3
+
+
+async def test_forget_starts_new_execution_for_later_calls():
+    flight, calls, release = SingleFlight("test-forget"), [], asyncio.Event()
+    first = asyncio.create_task(
+        flight.do("user", None, make_call(calls, release, "old"))
+    )
+    await asyncio.sleep(0)
+
+    flight.forget("user")
+    second = asyncio.create_task(
+        flight.do("user", None, make_call(calls, release, "new"))
+    )
+    await asyncio.sleep(0)
+    release.set()
+
+    assert (await first, await second) == ("old", "new")
+    assert len(calls) == 2
+
+
+async def test_exception_is_shared_with_waiting_calls():
+    flight, release = SingleFlight("test-error"), asyncio.Event()
+
+    async def fail():
+        await release.wait()
+        raise RuntimeError("db down")
+
+    tasks = [asyncio.create_task(flight.do("user", None, fail)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+async def test_cancelled_leader_hands_over_to_waiting_call():
+    flight, calls, release = SingleFlight("test-cancel"), [], asyncio.Event()
+    leader = asyncio.create_task(flight.do("user", None, make_call(calls, release)))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("user", None, make_call(calls, release)))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == "rows"
+    assert leader.cancelled()
+    assert len(calls) == 2
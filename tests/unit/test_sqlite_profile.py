@@ -0,0 +1,134 @@
+import asyncio
+import uuid
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, exc, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.auth.models import UserORM
+from app.config import settings
+from app.database import Base, create_sqlite_engines, engine_options
+from app.replication import Replica, ReplicaSet, RoutingSession
+from app.task_manager.repository import TaskSQLAlchemyRepository
+from app.task_manager.schemas import TaskCreate, TaskUpdate
+from app.unit_of_work import SQLAlchemyUnitOfWork
+
+
+@pytest_asyncio.fixture
+async def sqlite_engines(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SQLITE_OPTIMIZED", True)
+    writer, reader = create_sqlite_engines(f"sqlite+aiosqlite:///{tmp_path / 'db'}")
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield writer, reader
+    await writer.dispose()
+    await reader.dispose()
+
+
+@pytest.fixture
+def session_factory(sqlite_engines):
+    writer, reader = sqlite_engines
+    return async_sessionmaker(
+        bind=writer,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+        info={
+            "replicas": ReplicaSet([Replica("reader", reader)]),
+            "all_reads_to_replicas": True,
+        },
+    )
+
+
+def test_writer_has_single_connection_and_readers_a_pool(monkeypatch):
+    url = "sqlite+aiosqlite:///app.db"
+    monkeypatch.setattr(settings, "SQLITE_OPTIMIZED", True)
+    monkeypatch.setattr(settings, "SQLITE_READ_POOL_SIZE", 8)
+
+    assert engine_options(settings, url)["pool_size"] == 1
+    assert engine_options(settings, url)["max_overflow"] == 0
+    assert engine_options(settings, url, read_only=True)["pool_size"] == 8
+
+    monkeypatch.setattr(settings, "SQLITE_OPTIMIZED", False)
+    assert engine_options(settings, url)["pool_size"] == settings.DB_POOL_SIZE
+
+
+@pytest.mark.asyncio
+async def test_pragmas_are_applied_on_connect(sqlite_engines):
+    writer, reader = sqlite_engines
+
+    async with writer.connect() as conn:
+        journal_mode = await conn.exec_driver_sql("PRAGMA journal_mode")
+        assert journal_mode.scalar() == "wal"
+        busy_timeout = await conn.exec_driver_sql("PRAGMA busy_timeout")
+        assert busy_timeout.scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+    async with reader.connect() as conn:
+        with pytest.raises(exc.OperationalError):
+            await conn.exec_driver_sql("CREATE TABLE forbidden (id INTEGER)")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_writers_are_queued(session_factory, sqlite_engines):
+    writer, _ = sqlite_engines
+    user_id = uuid.uuid4()
+    async with writer.begin() as conn:
+        await conn.execute(
+            insert(UserORM.__table__).values(
+                user_id=user_id, email="u@example.com", hashed_password="x"
+            )
+        )
+
+    async def create(number: int) -> None:
+        async with session_factory() as session:
+            async with SQLAlchemyUnitOfWork(session):
+                await TaskSQLAlchemyRepository(session).create(
+                    TaskCreate(title=f"Task {number}"), user_id=user_id
+                )
+
+    await asyncio.gather(*(create(number) for number in range(30)))
+
+    async with session_factory() as session:
+        tasks = await TaskSQLAlchemyRepository(session).get_all(user_id)
+    assert len(tasks) == 30
+
+
+@pytest.mark.asyncio
+async def test_reads_in_write_transaction_use_writer(session_factory):
+    async with session_factory() as session:
+        session.add(UserORM(email="pending@example.com", hashed_password="x"))
+        await session.flush()
+
+        count = await session.scalar(select(func.count()).select_from(UserORM))
+
+        assert count == 1
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_write_unit_of_work_reads_from_writer(session_factory, sqlite_engines):
+    writer, reader = sqlite_engines
+    user_id = uuid.uuid4()
+    async with writer.begin() as conn:
+        await conn.execute(
+            insert(UserORM.__table__).values(
+                user_id=user_id, email="u@example.com", hashed_password="x"
+            )
+        )
+    async with session_factory() as session:
+        async with SQLAlchemyUnitOfWork(session):
+            task = await TaskSQLAlchemyRepository(session).create(
+                TaskCreate(title="Before"), user_id=user_id
+            )
+    reader_statements = []
+
+    @event.listens_for(reader.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        reader_statements.append(statement)
+
+    async with session_factory() as session:
+        async with SQLAlchemyUnitOfWork(session):
+            repository = TaskSQLAlchemyRepository(session)
+            await repository.update(task.task_id, user_id, TaskUpdate(title="After"))
+            await repository.delete(task.task_id, user_id)
+        assert "writing" not in session.info
+
+    assert reader_statements == []
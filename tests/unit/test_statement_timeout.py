@@ -0,0 +1,201 @@
+import asyncio
+import time
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from app import statement_timeout
+from app.middleware import CLIENT_CLOSED_REQUEST, CancelOnDisconnectMiddleware
+from app.statement_timeout import (
+    StatementTimeoutError,
+    instrument_engine,
+    set_statement_timeout,
+    start_statement_scope,
+    statement_timeouts_total,
+    statements_cancelled_externally_total,
+    statements_cancelled_total,
+)
+
+pytestmark = pytest.mark.asyncio
+
+ENDLESS_QUERY = text(
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT count(*) FROM c"
+)
+
+
+@pytest_asyncio.fixture
+async def engine():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    instrument_engine(engine)
+    yield engine
+    await engine.dispose()
+
+
+async def test_sqlite_statement_is_interrupted_after_timeout(engine):
+    set_statement_timeout(0.05)
+
+    async with engine.connect() as conn:
+        with pytest.raises(StatementTimeoutError) as timeout:
+            await conn.execute(ENDLESS_QUERY)
+        assert timeout.value.timeout == 0.05
+        assert (await conn.execute(text("SELECT 1"))).scalar() == 1
+
+
+async def test_cancelled_scope_interrupts_running_sqlite_statement(engine):
+    async def query():
+        scope = start_statement_scope()
+        scope.timeout = None
+        started.set_result(scope)
+        async with engine.connect() as conn:
+            await conn.execute(ENDLESS_QUERY)
+
+    started = asyncio.get_running_loop().create_future()
+    task = asyncio.create_task(query())
+    scope = await started
+    await asyncio.sleep(0.05)
+    cancelled = statements_cancelled_total.value
+
+    scope.cancel()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Соединение освобождено: следующий запрос не ждет бесконечное выражение.
+    async with engine.connect() as conn:
+        result = await asyncio.wait_for(conn.execute(text("SELECT 1")), 1)
+        assert result.scalar() == 1
+    assert statements_cancelled_total.value == cancelled + 1
+
+
+async def test_postgresql_timeout_is_set_once_per_connection(monkeypatch):
+    sent = []
+
+    def set_sql(timeout_ms):
+        sent.append(timeout_ms)
+        return "SELECT 1"
+
+    # Слушатели PostgreSQL на движке SQLite: SET подменен безобидным запросом.
+    monkeypatch.setattr(statement_timeout, "_set_statement_timeout_sql", set_sql)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    statement_timeout._install_postgresql(engine)
+    set_statement_timeout(1.0)
+
+    try:
+        for _ in range(2):
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                await conn.commit()
+        assert sent == [1000]
+
+        # Откат транзакции без SET кэш не сбрасывает.
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.rollback()
+        assert sent == [1000]
+
+        # Откат транзакции с SET отменяет его: следующее выражение повторит SET.
+        set_statement_timeout(2.0)
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await conn.rollback()
+            await conn.execute(text("SELECT 1"))
+        assert sent == [1000, 2000, 2000]
+    finally:
+        await engine.dispose()
+
+
+class QueryCanceledError(Exception):
+    sqlstate = statement_timeout.PG_QUERY_CANCELED
+
+
+@pytest.mark.parametrize(
+    "duration, cancel, expected",
+    [(0.05, False, "timeout"), (0, False, "external"), (0, True, "cancelled")],
+)
+async def test_postgresql_query_canceled_is_classified(
+    monkeypatch, duration, cancel, expected
+):
+    """Тест: sqlstate 57014 — таймаут, только если дедлайн выражения истек."""
+    monkeypatch.setattr(
+        statement_timeout, "_set_statement_timeout_sql", lambda timeout_ms: "SELECT 1"
+    )
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    statement_timeout._install_postgresql(engine)
+
+    def canceled(cursor, statement, parameters, context=None):
+        time.sleep(duration)
+        raise QueryCanceledError("canceling statement")
+
+    monkeypatch.setattr(engine.sync_engine.dialect, "do_execute", canceled)
+
+    scope = start_statement_scope()
+    scope.timeout = 0.05
+    if cancel:
+        scope.cancel()
+    counters = {
+        "timeout": statement_timeouts_total,
+        "external": statements_cancelled_externally_total,
+        "cancelled": statements_cancelled_total,
+    }
+    before = {name: counter.value for name, counter in counters.items()}
+
+    try:
+        async with engine.connect() as conn:
+            with pytest.raises(Exception) as raised:
+                await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    assert isinstance(raised.value, StatementTimeoutError) == (expected == "timeout")
+    for name, counter in counters.items():
+        assert counter.value == before[name] + (name == expected)
+
+
+async def test_client_disconnect_cancels_handler():
+    handler_cancelled = asyncio.Event()
+    disconnect = asyncio.Event()
+    app = FastAPI()
+    app.add_middleware(CancelOnDisconnectMiddleware)
+
+    @app.get("/slow")
+    async def slow():
+        try:
+            disconnect.set()
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            handler_cancelled.set()
+            raise
+
+    requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+    async def receive():
+        if requests:
+            return requests.pop()
+        await disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/slow",
+        "raw_path": b"/slow",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    await asyncio.wait_for(app(scope, receive, send), 1)
+
+    assert handler_cancelled.is_set()
+    assert sent[0]["status"] == CLIENT_CLOSED_REQUEST
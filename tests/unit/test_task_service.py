@@ -1,3 +1,4 @@
+import asyncio
 import pytest
 from unittest.mock import AsyncMock
 from uuid_extensions import uuid7
@@ -43,7 +44,9 @@ async def test_get_all_tasks(
     """Тест успешного получения всех задач для пользователя."""
     mock_task_repository.get_all.return_value = [sample_task]
     result = await task_service.get_all_tasks(user_id=sample_user_id)
-    mock_task_repository.get_all.assert_called_once_with(user_id=sample_user_id)
+    mock_task_repository.get_all.assert_called_once_with(
+        user_id=sample_user_id, fields=None
+    )
     assert isinstance(result, list)
     assert len(result) == 1
     assert isinstance(result[0], Task)
@@ -60,7 +63,7 @@ async def test_get_task_by_id_success(
         task_id=sample_task.task_id, user_id=sample_user_id
     )
     mock_task_repository.get_by_id.assert_called_once_with(
-        task_id=sample_task.task_id, user_id=sample_user_id
+        task_id=sample_task.task_id, user_id=sample_user_id, fields=None
     )
     assert isinstance(result, Task)
     assert result.title == sample_task.title
@@ -182,3 +185,23 @@ async def test_delete_task_not_found(
     mock_task_repository.delete.side_effect = TaskNotFoundError(non_existent_id)
     with pytest.raises(TaskNotFoundError):
         await task_service.delete_task(task_id=non_existent_id, user_id=sample_user_id)
+
+
+async def test_concurrent_get_all_tasks_share_one_query(
+    mock_task_repository, sample_user_id, sample_task
+):
+    """Одновременные одинаковые запросы списка выполняют один запрос к БД."""
+
+    async def slow_get_all(**kwargs):
+        await asyncio.sleep(0.01)
+        return [sample_task]
+
+    mock_task_repository.get_all.side_effect = slow_get_all
+    services = [TaskService(mock_task_repository) for _ in range(3)]
+
+    results = await asyncio.gather(
+        *(service.get_all_tasks(user_id=sample_user_id) for service in services)
+    )
+
+    assert results == [[sample_task]] * 3
+    mock_task_repository.get_all.assert_called_once()
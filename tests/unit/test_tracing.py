@@ -0,0 +1,94 @@
+import json
+import pytest
+from app import tracing
+from app.tracing import (
+    BatchSpanProcessor,
+    JsonLinesSpanExporter,
+    SpanContext,
+    Tracer,
+    start_span,
+    trace_methods,
+    use_span,
+)
+
+pytestmark = pytest.mark.asyncio
+
+TRACEPARENT = "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01"
+
+
+@pytest.fixture
+def exported_spans(monkeypatch: pytest.MonkeyPatch, tmp_path):
+    """Фикстура, подменяющая глобальный трассировщик записью в файл."""
+    path = tmp_path / "traces.jsonl"
+    processor = BatchSpanProcessor(JsonLinesSpanExporter(str(path), "test"))
+    monkeypatch.setattr(tracing, "tracer", Tracer(processor, sample_ratio=0.0))
+
+    def read():
+        processor.force_flush()
+        lines = path.read_text().splitlines() if path.exists() else []
+        return [
+            span
+            for line in lines
+            for resource in json.loads(line)["resourceSpans"]
+            for scope in resource["scopeSpans"]
+            for span in scope["spans"]
+        ]
+
+    return read
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (TRACEPARENT, ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", True)),
+        (
+            "00-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-00",
+            ("4bf92f3577b34da6a3ce929d0e0e4736", "00f067aa0ba902b7", False),
+        ),
+        ("00-00000000000000000000000000000000-00f067aa0ba902b7-01", None),
+        ("ff-4bf92f3577b34da6a3ce929d0e0e4736-00f067aa0ba902b7-01", None),
+        ("garbage", None),
+        (None, None),
+    ],
+    ids=["sampled", "not_sampled", "zero_trace_id", "bad_version", "garbage", "none"],
+)
+async def test_parse_traceparent(header, expected):
+    """Разбор заголовка traceparent по W3C Trace Context."""
+    context = SpanContext.from_traceparent(header)
+    if expected is None:
+        assert context is None
+    else:
+        assert (context.trace_id, context.span_id, context.sampled) == expected
+
+
+async def test_nested_spans_follow_incoming_trace(exported_spans):
+    """Вложенные спаны наследуют trace_id входящего запроса и выгружаются."""
+
+    @trace_methods
+    class Repository:
+        async def get_all(self):
+            with start_span("SQL SELECT"):
+                return []
+
+    span = tracing.tracer.start_server_span("GET /tasks/", TRACEPARENT)
+    with use_span(span):
+        await Repository().get_all()
+
+    spans = {span["name"]: span for span in exported_spans()}
+    assert set(spans) == {"GET /tasks/", "Repository.get_all", "SQL SELECT"}
+    assert {s["traceId"] for s in spans.values()} == {
+        "4bf92f3577b34da6a3ce929d0e0e4736"
+    }
+    assert spans["GET /tasks/"]["parentSpanId"] == "00f067aa0ba902b7"
+    assert spans["Repository.get_all"]["parentSpanId"] == spans["GET /tasks/"]["spanId"]
+    assert spans["SQL SELECT"]["parentSpanId"] == spans["Repository.get_all"]["spanId"]
+
+
+async def test_unsampled_trace_is_not_exported(exported_spans):
+    """Без входящего traceparent и при нулевой доле спаны не записываются."""
+    span = tracing.tracer.start_server_span("GET /tasks/", None)
+    assert not span.context.sampled
+    with use_span(span):
+        with start_span("child") as child:
+            assert child is None
+    assert exported_spans() == []
@@ -0,0 +1,99 @@
+import pytest
+import pytest_asyncio
+from unittest.mock import AsyncMock, MagicMock
+from uuid_extensions import uuid7
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.auth.models import UserORM
+from app.database import Base
+from app.task_manager import TaskService
+from app.task_manager.models import TaskORM
+from app.task_manager.repository import TaskSQLAlchemyRepository
+from app.task_manager.schemas import TaskCreate, TaskUpdate
+from app.unit_of_work import SQLAlchemyUnitOfWork
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def session():
+    session = MagicMock()
+    session.info = {}
+    session.commit = AsyncMock()
+    session.rollback = AsyncMock()
+    return session
+
+
+async def test_commits_once_for_nested_blocks(session):
+    uow = SQLAlchemyUnitOfWork(session)
+
+    async with uow:
+        async with uow:
+            pass
+        session.commit.assert_not_awaited()
+
+    session.commit.assert_awaited_once()
+    session.rollback.assert_not_awaited()
+
+
+async def test_rolls_back_on_error(session):
+    uow = SQLAlchemyUnitOfWork(session)
+
+    with pytest.raises(ValueError):
+        async with uow:
+            raise ValueError
+
+    session.rollback.assert_awaited_once()
+    session.commit.assert_not_awaited()
+
+
+async def test_read_only_block_uses_autocommit_connections(session):
+    uow = SQLAlchemyUnitOfWork(session)
+
+    async with uow.read_only():
+        assert session.info["autocommit"] is True
+
+    assert "autocommit" not in session.info
+
+
+async def test_read_only_inside_write_block_joins_transaction(session):
+    uow = SQLAlchemyUnitOfWork(session)
+
+    async with uow:
+        async with uow.read_only():
+            assert "autocommit" not in session.info
+
+    session.commit.assert_awaited_once()
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+async def test_service_operation_commits_once(engine):
+    user_id = uuid7()
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(UserORM.__table__).values(
+                user_id=user_id, email="uow@example.com", hashed_password="x"
+            )
+        )
+    commits = []
+    event.listen(engine.sync_engine, "commit", lambda conn: commits.append(conn))
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        service = TaskService(
+            TaskSQLAlchemyRepository(session), SQLAlchemyUnitOfWork(session)
+        )
+        task = await service.create_task(TaskCreate(title="New"), user_id=user_id)
+        await service.update_task(task.task_id, TaskUpdate(title="Renamed"), user_id)
+
+    assert len(commits) == 2
+    async with session_factory() as session:
+        assert await session.scalar(select(TaskORM.title)) == "Renamed"